@@ -0,0 +1,83 @@
+"""Задержка попадания в кэш при чтении блюда из подменю с тысячами блюд.
+
+Сравнивает прежнюю проверку зависимостей (SMEMBERS, SMEMBERS, GET), чтение
+через поколения (MGET, GET) и один вызов Lua-скрипта, которым теперь пользуются
+DishCacheRepository и SubmenuCacheRepository. Данные пишутся в отдельную базу
+Redis (по-умолчанию 15) и удаляются после замера.
+
+Запуск из корня проекта:
+    python -m benchmarks.cache_reads [dishes] [reads]
+"""
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from redis import asyncio as aioredis
+
+from core.configs.env_var import REDIS_HOST, REDIS_PORT
+from core.repositories.cache.sync_repository import SyncCacheRepository
+
+BENCHMARK_DB = 15
+
+
+async def measure(name: str, func: Callable[[], Awaitable], reads: int) -> None:
+    await func()
+    start = time.perf_counter()
+    for _ in range(reads):
+        await func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<32} {elapsed / reads * 10 ** 6:>10.1f} us/read')
+
+
+async def main(dishes: int, reads: int) -> None:
+    redis = aioredis.Redis(host=REDIS_HOST, port=int(REDIS_PORT), db=BENCHMARK_DB, decode_responses=True)
+    await redis.flushdb()
+    cache = SyncCacheRepository(redis=redis)
+    menu_id, submenu_id = uuid4(), uuid4()
+    dish_ids = [uuid4() for _ in range(dishes)]
+    dish_data = json.dumps({'id': str(dish_ids[0]), 'title': 'Dish', 'description': 'Dish', 'price': '100.00'})
+
+    menu_key, submenu_key, dish_key = f'menu_{menu_id}', f'submenu_{submenu_id}', f'dish_{dish_ids[0]}'
+    await redis.sadd(f'deps:{menu_key}', submenu_key)
+    await redis.sadd(f'deps:{submenu_key}', *[f'dish_{dish_id}' for dish_id in dish_ids])
+    await redis.set(dish_key, dish_data)
+
+    parents = cache._get_parents(menu_id, submenu_id)
+    await cache._invalidate([], cache._get_generation_keys(parents))
+    await cache._set_versioned(parents, dish_key, dish_data, cache.item_ttl_sec)
+
+    async def read_dependencies():
+        if submenu_key not in await redis.smembers(f'deps:{menu_key}'):
+            return None
+        if dish_key not in await redis.smembers(f'deps:{submenu_key}'):
+            return None
+        return await redis.get(dish_key)
+
+    async def read_generations():
+        _, submenu_namespace = await cache._get_namespaces(menu_id, submenu_id)
+        return cache._unwrap(await redis.get(cache._get_dish_id(submenu_namespace, dish_ids[0]))).value
+
+    async def read_script():
+        return (await cache._get_versioned(parents, dish_key)).value
+
+    assert await read_dependencies() == await read_generations() == await read_script() == dish_data
+
+    print(f'{dishes} dishes in submenu, {reads} reads')
+    await measure('SMEMBERS + SMEMBERS + GET', read_dependencies, reads)
+    await measure('MGET + GET', read_generations, reads)
+    await measure('EVALSHA', read_script, reads)
+
+    await redis.flushdb()
+    await redis.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+        )
+    )
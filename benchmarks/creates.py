@@ -0,0 +1,91 @@
+"""Пропускная способность создания блюд при параллельных запросах.
+
+Сравнивает прежний путь (проверки подменю, id и названия отдельными запросами,
+затем INSERT и refresh) с одним INSERT ... SELECT ... RETURNING, который
+полагается на ограничения БД. Блюда создаются в отдельном меню настроенной БД,
+которое удаляется после замера.
+
+Запуск из корня проекта:
+    python -m benchmarks.creates [dishes] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select
+
+from core.database.db import SessionLocal, engine
+from core.models.models import Dish, Menu, Submenu
+from core.repositories.crud.dish_repository import DishRepository
+from core.schemas.dish_schemas import DishCreateSchema
+
+
+async def create_with_checks(menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema) -> None:
+    async with SessionLocal() as db:
+        repo = DishRepository(db)
+        db_submenu = await db.execute(select(Submenu.id).filter_by(menu_id=menu_id, id=submenu_id))
+        if db_submenu.first() is None:
+            raise HTTPException(status_code=404, detail=repo.submenu_404_msg)
+        db_dish_by_id = await db.execute(select(Dish.id).filter_by(id=dish_data.id))
+        if db_dish_by_id.first():
+            raise HTTPException(status_code=409, detail=repo.dish_409_id_msg)
+        db_dish_by_title = await db.execute(select(Dish.id).filter_by(submenu_id=submenu_id, title=dish_data.title))
+        if db_dish_by_title.first():
+            raise HTTPException(status_code=409, detail=repo.dish_409_title_msg)
+        db_dish = Dish(submenu_id=submenu_id, **dish_data.model_dump())
+        db.add(db_dish)
+        await db.commit()
+        await db.refresh(db_dish)
+
+
+async def create_with_returning(menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema) -> None:
+    async with SessionLocal() as db:
+        await DishRepository(db).create(menu_id, submenu_id, dish_data)
+
+
+async def measure(
+    name: str,
+    create: Callable[[UUID, UUID, DishCreateSchema], Awaitable[None]],
+    dishes: int,
+    concurrency: int,
+) -> None:
+    menu_id, submenu_id = uuid4(), uuid4()
+    async with SessionLocal() as db:
+        await db.execute(insert(Menu).values(id=menu_id, title=f'Benchmark menu {menu_id}', description=''))
+        await db.execute(insert(Submenu).values(id=submenu_id, menu_id=menu_id, title='Submenu', description=''))
+        await db.commit()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create_dish(dish: int) -> None:
+        async with semaphore:
+            dish_data = DishCreateSchema(id=uuid4(), title=f'Dish {dish}', description='', price=Decimal('1.5'))
+            await create(menu_id, submenu_id, dish_data)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[create_dish(dish) for dish in range(dishes)])
+    elapsed = time.perf_counter() - start
+    print(f'{name:<32} {dishes / elapsed:>10.1f} creates/s')
+
+    async with SessionLocal() as db:
+        await db.execute(delete(Dish).filter_by(submenu_id=submenu_id))
+        await db.execute(delete(Submenu).filter_by(id=submenu_id))
+        await db.execute(delete(Menu).filter_by(id=menu_id))
+        await db.commit()
+
+
+async def main(dishes: int, concurrency: int) -> None:
+    print(f'{dishes} dishes, concurrency {concurrency}')
+    await measure('checks + INSERT + refresh', create_with_checks, dishes, concurrency)
+    await measure('INSERT ... RETURNING', create_with_returning, dishes, concurrency)
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [2000, 10]
+    asyncio.run(main(*args, *defaults[len(args):]))
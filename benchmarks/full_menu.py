@@ -0,0 +1,110 @@
+"""Пропускная способность /api/v1/full_menu при попадании в кеш.
+
+Сравнивает прежний путь (json.loads из кеша, проверка response_model и повторная
+сериализация силами FastAPI) с отдачей готового тела ответа из кеша. Полное меню
+генерируется на menus x submenus x dishes позиций и кладется в отдельную базу
+Redis (по-умолчанию 15), которая очищается после замера.
+
+Запуск из корня проекта:
+    python -m benchmarks.full_menu [menus] [submenus] [dishes] [requests]
+"""
+import asyncio
+import json
+import sys
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi import APIRouter, BackgroundTasks, Depends, FastAPI
+from httpx import AsyncClient
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+
+from core.configs.env_var import REDIS_HOST, REDIS_PORT
+from core.database.redis_db import get_redis
+from core.main import app
+from core.repositories.cache.full_menu_repository import FullMenuCacheRepository
+from core.schemas.full_menu_schema import Dish, Menu, Submenu
+from core.services.full_menu_service import FullMenuService
+
+BENCHMARK_DB = 15
+
+redis = aioredis.Redis(host=REDIS_HOST, port=int(REDIS_PORT), db=BENCHMARK_DB, decode_responses=True)
+full_menu_adapter: TypeAdapter[list[Menu]] = TypeAdapter(list[Menu])
+legacy_router = APIRouter()
+
+
+def get_benchmark_redis() -> aioredis.Redis:
+    return redis
+
+
+@legacy_router.get('/api/v1/full_menu', response_model=list[Menu])
+async def get_legacy_full_menu(full_menu: FullMenuService = Depends()) -> list[Menu]:
+    return json.loads((await full_menu.cache_repository.get_full_menu()).value.split('\n', 1)[1])
+
+
+def generate_full_menu(menus: int, submenus: int, dishes: int) -> list[Menu]:
+    return [
+        Menu(
+            id=uuid4(),
+            title=f'Menu {menu}',
+            description=f'Menu description {menu}',
+            submenus=[
+                Submenu(
+                    id=uuid4(),
+                    title=f'Submenu {submenu}',
+                    description=f'Submenu description {submenu}',
+                    dishes=[
+                        Dish(
+                            id=uuid4(),
+                            title=f'Dish {dish}',
+                            description=f'Dish description {dish}',
+                            price=Decimal(100 + dish) / 100,
+                        )
+                        for dish in range(dishes)
+                    ],
+                )
+                for submenu in range(submenus)
+            ],
+        )
+        for menu in range(menus)
+    ]
+
+
+async def measure(name: str, target: FastAPI, requests: int) -> bytes:
+    async with AsyncClient(app=target, base_url='http://benchmark') as client:
+        response = await client.get('/api/v1/full_menu')
+        assert response.status_code == 200, response.text
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get('/api/v1/full_menu')
+        elapsed = time.perf_counter() - start
+    print(f'{name:<32} {requests / elapsed:>10.1f} req/s {elapsed / requests * 1000:>8.2f} ms/req')
+    return response.content
+
+
+async def main(menus: int, submenus: int, dishes: int, requests: int) -> None:
+    full_menu = generate_full_menu(menus, submenus, dishes)
+    cache = FullMenuCacheRepository(BackgroundTasks(), redis)
+    full_menu_data = cache.serialize_full_menu(full_menu_adapter.dump_json(full_menu).decode())
+    await redis.set('full_menu', cache._wrap(full_menu_data, 3600))
+
+    legacy_app = FastAPI()
+    legacy_app.include_router(legacy_router)
+    app.dependency_overrides[get_redis] = get_benchmark_redis
+    legacy_app.dependency_overrides = app.dependency_overrides
+
+    print(f'{menus * submenus * dishes} dishes, {requests} requests')
+    legacy_body = await measure('json.loads + response_model', legacy_app, requests)
+    body = await measure('pre-serialized Response', app, requests)
+    assert legacy_body == body
+
+    app.dependency_overrides.clear()
+    await redis.flushdb()
+    await redis.close()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [10, 10, 20, 500]
+    asyncio.run(main(*args, *defaults[len(args):]))
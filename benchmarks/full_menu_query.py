@@ -0,0 +1,110 @@
+"""Построение полного меню: selectinload + pydantic против json_agg в Postgres.
+
+Потоковый режим читает меню по одному через серверный курсор и не собирает
+документ целиком, поэтому его пиковая память не зависит от размера каталога.
+
+Каталог на menus x submenus x dishes позиций вставляется в настроенную БД внутри
+транзакции, которая откатывается после замера. Время замеряется отдельным
+прогоном без tracemalloc.
+
+Запуск из корня проекта:
+    python -m benchmarks.full_menu_query [menus] [submenus] [dishes]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from core.database.db import engine
+from core.models.models import Dish, Menu, Submenu
+from core.repositories.crud.full_menu_repository import FullMenuRepository
+from core.schemas.full_menu_schema import Menu as MenuSchema
+
+full_menu_adapter: TypeAdapter[list[MenuSchema]] = TypeAdapter(list[MenuSchema])
+
+
+async def fill_catalog(session: AsyncSession, menus: int, submenus: int, dishes: int) -> None:
+    menu_rows: list[dict] = []
+    submenu_rows: list[dict] = []
+    dish_rows: list[dict] = []
+    for menu in range(menus):
+        menu_id = uuid4()
+        menu_rows.append({'id': menu_id, 'title': f'Benchmark menu {menu}', 'description': f'Menu description {menu}'})
+        for submenu in range(submenus):
+            submenu_id = uuid4()
+            submenu_rows.append(
+                {'id': submenu_id, 'menu_id': menu_id, 'title': f'Submenu {submenu}', 'description': 'Submenu'}
+            )
+            dish_rows.extend(
+                {
+                    'id': uuid4(),
+                    'submenu_id': submenu_id,
+                    'title': f'Dish {dish}',
+                    'description': f'Dish description {dish}',
+                    'price': Decimal(100 + dish) / 100,
+                }
+                for dish in range(dishes)
+            )
+    await session.execute(insert(Menu), menu_rows)
+    await session.execute(insert(Submenu), submenu_rows)
+    for start in range(0, len(dish_rows), 10000):
+        await session.execute(insert(Dish), dish_rows[start:start + 10000])
+
+
+async def get_with_selectinload(session: AsyncSession) -> int:
+    query = await session.execute(select(Menu).options(selectinload(Menu.submenus).selectinload(Submenu.dishes)))
+    full_menu = full_menu_adapter.validate_python(query.scalars().all(), from_attributes=True)
+    session.expunge_all()
+    return len(full_menu_adapter.dump_json(full_menu).decode())
+
+
+async def get_with_json_agg(session: AsyncSession) -> int:
+    return len(await FullMenuRepository(read_db=session).get())
+
+
+async def get_with_stream(session: AsyncSession) -> int:
+    body_size = 2
+    async for menu in FullMenuRepository(read_db=session).stream():
+        body_size += len(menu) + 1
+    return body_size
+
+
+async def measure(name: str, func: Callable[[], Awaitable[int]]) -> None:
+    start = time.perf_counter()
+    body_size = await func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    await func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:<32} {elapsed:>8.2f} s {peak / 2 ** 20:>10.1f} MiB {body_size / 2 ** 20:>8.1f} MiB body')
+
+
+async def main(menus: int, submenus: int, dishes: int) -> None:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection)
+        await fill_catalog(session, menus, submenus, dishes)
+
+        print(f'{menus * submenus * dishes} dishes')
+        await measure('selectinload + pydantic', lambda: get_with_selectinload(session))
+        await measure('json_agg', lambda: get_with_json_agg(session))
+        await measure('json_agg stream', lambda: get_with_stream(session))
+
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    defaults = [10, 10, 1000]
+    asyncio.run(main(*args, *defaults[len(args):]))
@@ -0,0 +1,82 @@
+"""Время разбора и пиковая память при загрузке Menu.xlsx.
+
+Генерирует таблицу на заданное число строк (по-умолчанию 100 000) и сравнивает
+потоковое чтение TableSync с прежним pandas.read_excel + iterrows. Время
+замеряется отдельным прогоном без tracemalloc.
+
+Запуск из корня проекта:
+    python -m benchmarks.table_loading [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from uuid import uuid4
+
+from openpyxl import Workbook
+from redis import asyncio as aioredis
+
+from core.repositories.cache.sync_repository import SyncCacheRepository
+from core.repositories.crud.sync_repository import SyncRepository
+from core.tasks.table import TableSync
+
+
+def generate_table(path: str, rows: int, menus: int = 10, submenus: int = 10) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    dishes = max(rows // (menus * submenus) - 1, 1)
+    for menu in range(menus):
+        sheet.append([str(uuid4()), f'Menu {menu}', f'Menu description {menu}'])
+        for submenu in range(submenus):
+            sheet.append([None, str(uuid4()), f'Submenu {submenu}', f'Submenu description {submenu}'])
+            for dish in range(dishes):
+                sheet.append([None, None, str(uuid4()), f'Dish {dish}', f'Dish description {dish}', 100 + dish / 100])
+    workbook.save(path)
+
+
+def measure(name: str, func: Callable) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:<32} {elapsed:>8.2f} s {peak / 2 ** 20:>10.1f} MiB')
+
+
+def read_rows(table: TableSync) -> None:
+    for row in table._iter_rows():
+        pass
+
+
+def read_with_pandas(path: str) -> None:
+    import pandas as pd
+
+    data = pd.read_excel(path, header=None, dtype=str)
+    for _, row in data.iterrows():
+        pass
+
+
+def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Menu.xlsx')
+        generate_table(path, rows)
+        TableSync.xlsx_path = path
+        cache_repository = SyncCacheRepository(aioredis.Redis())
+        table = TableSync(sync_repository=SyncRepository(db=None), cache_repository=cache_repository)
+
+        print(f'{rows} rows, {os.path.getsize(path) / 2 ** 20:.1f} MiB')
+        measure('unchanged table check', table._get_table_version)
+        measure('openpyxl read_only rows', lambda: read_rows(table))
+        measure('openpyxl read_only tree', table._read_tree)
+        try:
+            measure('pandas read_excel + iterrows', lambda: read_with_pandas(path))
+        except ImportError:
+            print('pandas is not installed, skipping')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -1,13 +1,13 @@
+import asyncio
 import os
 
-import httpx
 from celery import Celery
 from dotenv import load_dotenv
 
+from core.tasks.table import run_table_sync
+
 load_dotenv()
 
-FASTAPI_HOST = os.environ.get('FASTAPI_HOST', 'localhost')
-FASTAPI_PORT = os.environ.get('FASTAPI_PORT', '8000')
 RABBIT_HOST = os.environ.get('RABBIT_HOST', 'localhost')
 RABBIT_PORT = os.environ.get('RABBIT_PORT', '5672')
 
@@ -23,6 +23,4 @@ celery.conf.beat_schedule = {
 
 @celery.task
 def sync_table():
-    with httpx.Client() as client:
-        response = client.post(f'http://{FASTAPI_HOST}:{FASTAPI_PORT}/api/v1/admin/sync_table')
-        return response.text
+    return asyncio.run(run_table_sync())
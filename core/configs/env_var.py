@@ -9,6 +9,42 @@ DB_PASS = os.environ.get('POSTGRES_PASSWORD', '1234')
 DB_NAME = os.environ.get('POSTGRES_DB', 'postgres_db')
 DB_HOST = os.environ.get('POSTGRES_HOST', 'localhost')
 DB_PORT = os.environ.get('POSTGRES_PORT', '5432')
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() == 'true'
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', '100'))
+DB_REPLICA_HOST = os.environ.get('POSTGRES_REPLICA_HOST', '')
+DB_REPLICA_PORT = os.environ.get('POSTGRES_REPLICA_PORT', DB_PORT)
+DB_READ_YOUR_WRITES_SEC = float(os.environ.get('DB_READ_YOUR_WRITES_SEC', '5'))
 
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = os.environ.get('REDIS_PORT', '6379')
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', '50'))
+REDIS_BLOCKING_POOL = os.environ.get('REDIS_BLOCKING_POOL', 'true').lower() == 'true'
+REDIS_POOL_TIMEOUT = float(os.environ.get('REDIS_POOL_TIMEOUT', '5'))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get('REDIS_SOCKET_TIMEOUT', '1'))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.environ.get('REDIS_SOCKET_CONNECT_TIMEOUT', '0.5'))
+REDIS_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('REDIS_BREAKER_FAILURE_THRESHOLD', '3'))
+REDIS_BREAKER_BACKOFF = float(os.environ.get('REDIS_BREAKER_BACKOFF', '0.5'))
+REDIS_BREAKER_MAX_BACKOFF = float(os.environ.get('REDIS_BREAKER_MAX_BACKOFF', '30'))
+
+SYNC_LOCK_TIMEOUT = int(os.environ.get('SYNC_LOCK_TIMEOUT', '300'))
+
+CACHE_WARM_UP_ON_STARTUP = os.environ.get('CACHE_WARM_UP_ON_STARTUP', 'true').lower() == 'true'
+CACHE_WARM_UP_CONCURRENCY = int(os.environ.get('CACHE_WARM_UP_CONCURRENCY', '10'))
+
+LOCAL_CACHE_SIZE = int(os.environ.get('LOCAL_CACHE_SIZE', '0'))
+CACHE_ITEM_TTL = int(os.environ.get('CACHE_ITEM_TTL', '3600'))
+CACHE_LIST_TTL = int(os.environ.get('CACHE_LIST_TTL', '1800'))
+CACHE_FULL_MENU_TTL = int(os.environ.get('CACHE_FULL_MENU_TTL', '900'))
+CACHE_STALE_TTL = int(os.environ.get('CACHE_STALE_TTL', '300'))
+
+LOCAL_CACHE_TTL = float(os.environ.get('LOCAL_CACHE_TTL', '5'))
+
+FULL_MENU_STREAMING = os.environ.get('FULL_MENU_STREAMING', 'false').lower() == 'true'
+FULL_MENU_GZIP_LEVEL = int(os.environ.get('FULL_MENU_GZIP_LEVEL', '6'))
+FULL_MENU_BROTLI_QUALITY = int(os.environ.get('FULL_MENU_BROTLI_QUALITY', '5'))
+
+HTTP_CACHE_CONTROL = os.environ.get('HTTP_CACHE_CONTROL', 'no-cache')
@@ -0,0 +1,69 @@
+import time
+from collections.abc import Iterable
+
+
+class CircuitBreaker:
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+    def __init__(self, failure_threshold: int, backoff_sec: float, max_backoff_sec: float):
+        self.failure_threshold = failure_threshold
+        self.base_backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.state = self.closed
+        self.failures = 0
+        self.opened = 0
+        self.backoff_sec = backoff_sec
+        self.retry_at = 0.0
+        self.missed: set[str] = set()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == self.closed
+
+    def allow_request(self) -> bool:
+        if self.state == self.open and time.monotonic() >= self.retry_at:
+            self.state = self.half_open
+            return True
+        return self.state == self.closed
+
+    def record_success(self) -> None:
+        if self.state == self.closed:
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        if self.state == self.half_open:
+            self.backoff_sec = min(self.backoff_sec * 2, self.max_backoff_sec)
+            self._open()
+        elif self.state == self.closed:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened += 1
+                self._open()
+
+    def close(self) -> None:
+        self.state = self.closed
+        self.failures = 0
+        self.backoff_sec = self.base_backoff_sec
+
+    def record_missed(self, entities: Iterable[str]) -> None:
+        self.missed.update(entities)
+
+    def take_missed(self) -> set[str]:
+        missed, self.missed = self.missed, set()
+        return missed
+
+    def get_stats(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened': self.opened,
+            'backoff_sec': self.backoff_sec,
+            'retry_in_sec': round(max(self.retry_at - time.monotonic(), 0.0), 3) if self.state == self.open else 0.0,
+            'missed_invalidations': len(self.missed),
+        }
+
+    def _open(self) -> None:
+        self.state = self.open
+        self.retry_at = time.monotonic() + self.backoff_sec
@@ -1,15 +1,155 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from collections.abc import AsyncIterator
+
+from fastapi import Depends
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncScalarResult,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from core.configs.env_var import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from core.configs.env_var import (
+    DB_HOST,
+    DB_MAX_OVERFLOW,
+    DB_NAME,
+    DB_PASS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PORT,
+    DB_REPLICA_HOST,
+    DB_REPLICA_PORT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_USER,
+)
+from core.database.pool_stats import PoolStats
+from core.database.redis_db import circuit_breaker, get_redis
+from core.metrics.registry import FAST_BUCKETS, registry
 
 SQLALCHEMY_DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+SQLALCHEMY_REPLICA_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}'
+RECENT_WRITE_KEY = 'db:recent_write'
+
+db_query_duration = registry.histogram(
+    'db_query_duration_seconds', 'Время выполнения SQL-запросов', ('engine', 'statement'), FAST_BUCKETS
+)
+db_query_errors = registry.counter('db_query_errors_total', 'SQL-запросы, завершившиеся ошибкой', ('engine',))
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.add_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.add_checkout(time.perf_counter() - start)
+        return connection
+
+    def get_stats(self) -> dict:
+        return {
+            'size': self.size(),
+            'max_overflow': self._max_overflow,
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': max(self.overflow(), 0),
+            **self.stats.as_dict(),
+        }
+
+
+def add_query_metrics(engine: AsyncEngine, name: str) -> None:
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        context.query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def finish_query(conn, cursor, statement, parameters, context, executemany):
+        statement_type = statement.lstrip().split(None, 1)[0].upper()
+        db_query_duration.observe(time.perf_counter() - context.query_started, engine=name, statement=statement_type)
+
+    @event.listens_for(engine.sync_engine, 'handle_error')
+    def fail_query(exception_context):
+        db_query_errors.inc(engine=name)
+
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+def create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={'prepared_statement_cache_size': DB_STATEMENT_CACHE_SIZE},
+    )
+    add_query_metrics(engine, name)
+    return engine
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, 'primary')
+replica_engine = create_engine(SQLALCHEMY_REPLICA_URL, 'replica') if DB_REPLICA_HOST else engine
 SessionLocal = sessionmaker(engine, class_=AsyncSession, autoflush=False, autocommit=False, expire_on_commit=False)
+ReplicaSessionLocal = sessionmaker(
+    replica_engine, class_=AsyncSession, autoflush=False, autocommit=False, expire_on_commit=False
+)
 Base = declarative_base()
 
 
+class ReadSession:
+    def __init__(self, redis: aioredis.Redis, session: AsyncSession | None = None):
+        self.redis = redis
+        self.session = session
+
+    async def _is_recently_written(self) -> bool:
+        if not circuit_breaker.is_closed:
+            return True
+        try:
+            return bool(await self.redis.exists(RECENT_WRITE_KEY))
+        except RedisError:
+            circuit_breaker.record_failure()
+            return True
+
+    async def _get_session(self) -> AsyncSession:
+        if self.session is None:
+            use_replica = replica_engine is not engine and not await self._is_recently_written()
+            self.session = ReplicaSessionLocal() if use_replica else SessionLocal()
+        return self.session
+
+    async def execute(self, *args, **kwargs) -> Result:
+        session = await self._get_session()
+        return await session.execute(*args, **kwargs)
+
+    async def stream_scalars(self, *args, **kwargs) -> AsyncScalarResult:
+        session = await self._get_session()
+        return await session.stream_scalars(*args, **kwargs)
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+
 async def get_db() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
+
+
+async def get_read_db(redis: aioredis.Redis = Depends(get_redis)) -> AsyncIterator[ReadSession]:
+    read_session = ReadSession(redis)
+    try:
+        yield read_session
+    finally:
+        await read_session.close()
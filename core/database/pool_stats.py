@@ -0,0 +1,21 @@
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sec = 0.0
+        self.max_wait_sec = 0.0
+
+    def add_checkout(self, wait_sec: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += timed_out
+        self.wait_sec += wait_sec
+        self.max_wait_sec = max(self.max_wait_sec, wait_sec)
+
+    def as_dict(self) -> dict:
+        return {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_sec_total': round(self.wait_sec, 6),
+            'wait_sec_avg': round(self.wait_sec / self.checkouts, 6) if self.checkouts else 0.0,
+            'wait_sec_max': round(self.max_wait_sec, 6),
+        }
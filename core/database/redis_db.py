@@ -1,13 +1,79 @@
-from redis import asyncio as aioredis
+import time
 
-from core.configs.env_var import REDIS_HOST, REDIS_PORT
+from redis import asyncio as aioredis
+from redis.asyncio.connection import AbstractConnection, Connection
+from redis.exceptions import ConnectionError
 
-pool = aioredis.ConnectionPool(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    decode_responses=True,
-    db=0,
+from core.configs.env_var import (
+    REDIS_BLOCKING_POOL,
+    REDIS_BREAKER_BACKOFF,
+    REDIS_BREAKER_FAILURE_THRESHOLD,
+    REDIS_BREAKER_MAX_BACKOFF,
+    REDIS_HOST,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_PORT,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
 )
+from core.database.circuit_breaker import CircuitBreaker
+from core.database.pool_stats import PoolStats
+
+
+class InstrumentedPoolMixin(aioredis.ConnectionPool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.in_use: set[AbstractConnection] = set()
+
+    async def get_connection(self, command_name, *keys, **options) -> Connection:
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except ConnectionError:
+            self.stats.add_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.add_checkout(time.perf_counter() - start)
+        self.in_use.add(connection)
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        self.in_use.discard(connection)
+        await super().release(connection)
+
+    def get_stats(self) -> dict:
+        return {
+            'max_connections': self.max_connections,
+            'blocking': isinstance(self, aioredis.BlockingConnectionPool),
+            'in_use': len(self.in_use),
+            **self.stats.as_dict(),
+        }
+
+
+class InstrumentedConnectionPool(InstrumentedPoolMixin, aioredis.ConnectionPool):
+    ...
+
+
+class InstrumentedBlockingConnectionPool(InstrumentedPoolMixin, aioredis.BlockingConnectionPool):
+    ...
+
+
+pool_options = {
+    'host': REDIS_HOST,
+    'port': REDIS_PORT,
+    'decode_responses': True,
+    'db': 0,
+    'max_connections': REDIS_MAX_CONNECTIONS,
+    'socket_timeout': REDIS_SOCKET_TIMEOUT,
+    'socket_connect_timeout': REDIS_SOCKET_CONNECT_TIMEOUT,
+}
+pool: InstrumentedPoolMixin
+if REDIS_BLOCKING_POOL:
+    pool = InstrumentedBlockingConnectionPool(timeout=REDIS_POOL_TIMEOUT, **pool_options)
+else:
+    pool = InstrumentedConnectionPool(**pool_options)
+
+circuit_breaker = CircuitBreaker(REDIS_BREAKER_FAILURE_THRESHOLD, REDIS_BREAKER_BACKOFF, REDIS_BREAKER_MAX_BACKOFF)
 
 
 def get_redis():
@@ -1,6 +1,14 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
+from core.configs.env_var import CACHE_WARM_UP_ON_STARTUP
+from core.database.redis_db import get_redis
+from core.metrics.middleware import MetricsMiddleware
+from core.repositories.cache.local_cache import listen_invalidations, local_cache
 from core.routers import (
     admin_router,
     dish_router,
@@ -8,8 +16,26 @@ from core.routers import (
     menu_router,
     submenu_router,
 )
+from core.tasks.warm_up import get_cache_warm_up
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = asyncio.create_task(listen_invalidations(get_redis())) if local_cache.enabled else None
+    if CACHE_WARM_UP_ON_STARTUP:
+        try:
+            await get_cache_warm_up(get_redis()).warm_up()
+        except Exception:
+            logger.exception('Cache warm-up on startup failed')
+    yield
+    if listener is not None:
+        listener.cancel()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(full_menu_router.router, prefix='/api/v1')
 app.include_router(menu_router.router, prefix='/api/v1')
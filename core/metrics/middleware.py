@@ -0,0 +1,51 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics.registry import registry
+
+http_requests_in_flight = registry.gauge(
+    'http_requests_in_flight', 'Запросы, которые обрабатываются сейчас', ('method', 'route')
+)
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds',
+    'Время обработки запроса до отправки последнего байта',
+    ('method', 'route', 'status'),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        method, route = scope['method'], self._get_route(scope)
+        status = '500'
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+
+        http_requests_in_flight.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route, status=status)
+            http_requests_in_flight.dec(method=method, route=route)
+
+    def _get_route(self, scope: Scope) -> str:
+        partial = None
+        for route in scope['app'].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or 'unmatched'
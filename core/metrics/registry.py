@@ -0,0 +1,128 @@
+import bisect
+import math
+from typing import TypeVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Metric:
+    type = 'untyped'
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def _get_key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._get_key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        return [
+            f'{self.name}{format_labels(self.labels, key)} {format_value(value)}' for key, value in self.values.items()
+        ]
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._get_key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(
+        self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+        self.observations: dict[tuple[str, ...], list[int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._get_key(labels)
+        if key not in self.observations:
+            self.observations[key] = [0] * len(self.buckets)
+        self.observations[key][bisect.bisect_left(self.buckets, value)] += 1
+        self.values[key] = self.values.get(key, 0.0) + value
+
+    def get_count(self, **labels: str) -> int:
+        return sum(self.observations.get(self._get_key(labels), []))
+
+    def render(self) -> list[str]:
+        lines = []
+        bucket_labels = (*self.labels, 'le')
+        for key, counts in self.observations.items():
+            total = 0
+            for bucket, count in zip(self.buckets, counts):
+                total += count
+                lines.append(f'{self.name}_bucket{format_labels(bucket_labels, (*key, format_value(bucket)))} {total}')
+            lines.append(f'{self.name}_sum{format_labels(self.labels, key)} {format_value(self.values[key])}')
+            lines.append(f'{self.name}_count{format_labels(self.labels, key)} {total}')
+        return lines
+
+
+MetricT = TypeVar('MetricT', bound=Metric)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, description, labels))
+
+    def histogram(
+        self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -1,11 +1,25 @@
+import hashlib
+from decimal import Decimal
 from uuid import uuid4
 
-from sqlalchemy import DECIMAL, Column, ForeignKey, Index, String
+from sqlalchemy import DECIMAL, Column, Computed, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from core.database.db import Base
 
+FINGERPRINT_SEPARATOR = '\x1f'
+
+
+def fingerprint_column(*columns: str) -> Column:
+    expression = " || E'\\x1f' || ".join(f"coalesce({column}::text, '')" for column in columns)
+    return Column(String, Computed(f'md5({expression})', persisted=True))
+
+
+def get_fingerprint(*values: str | Decimal | None) -> str:
+    texts = ['' if value is None else format(value, 'f') if isinstance(value, Decimal) else value for value in values]
+    return hashlib.md5(FINGERPRINT_SEPARATOR.join(texts).encode()).hexdigest()
+
 
 class Menu(Base):
     __tablename__ = 'menus'
@@ -13,6 +27,10 @@ class Menu(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     title = Column(String, unique=True, index=True, nullable=False)
     description = Column(String)
+    fingerprint = fingerprint_column('title', 'description')
+    version = Column(Integer, server_default='1', nullable=False)
+    submenus_count = Column(Integer, server_default='0', nullable=False)
+    dishes_count = Column(Integer, server_default='0', nullable=False)
 
     submenus = relationship('Submenu', back_populates='menu', cascade='all, delete')
 
@@ -23,6 +41,9 @@ class Submenu(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     title = Column(String, index=True, nullable=False)
     description = Column(String)
+    fingerprint = fingerprint_column('title', 'description')
+    version = Column(Integer, server_default='1', nullable=False)
+    dishes_count = Column(Integer, server_default='0', nullable=False)
     menu_id = Column(UUID(as_uuid=True), ForeignKey('menus.id'), nullable=False, index=True)
 
     menu = relationship('Menu', back_populates='submenus')
@@ -36,6 +57,8 @@ class Dish(Base):
     title = Column(String, index=True, nullable=False)
     description = Column(String)
     price = Column(DECIMAL)
+    fingerprint = fingerprint_column('title', 'description', 'price')
+    version = Column(Integer, server_default='1', nullable=False)
     submenu_id = Column(UUID(as_uuid=True), ForeignKey('submenus.id'), nullable=False, index=True)
 
     submenu = relationship('Submenu', back_populates='dishes')
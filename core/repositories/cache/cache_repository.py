@@ -1,58 +1,436 @@
+import hashlib
 import json
-from uuid import UUID
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import NamedTuple
+from uuid import UUID, uuid4
 
 import redis
-from fastapi.encoders import jsonable_encoder
+from fastapi import BackgroundTasks
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
+from core.configs.env_var import (
+    CACHE_FULL_MENU_TTL,
+    CACHE_ITEM_TTL,
+    CACHE_LIST_TTL,
+    CACHE_STALE_TTL,
+    DB_READ_YOUR_WRITES_SEC,
+)
+from core.database.db import RECENT_WRITE_KEY
+from core.database.redis_db import circuit_breaker
+from core.metrics.registry import FAST_BUCKETS, registry
 from core.models.models import Base
+from core.repositories.cache.compression import CONTENT_ENCODINGS
+from core.repositories.cache.local_cache import INVALIDATION_CHANNEL, local_cache
+
+VERSIONED_KEY_SCRIPT = """
+local key = ARGV[1] .. ':' .. (redis.call('GET', KEYS[1]) or '0')
+for i = 2, #KEYS do
+    key = key .. ':' .. ARGV[i] .. ':' .. (redis.call('GET', KEYS[i]) or '0')
+end
+key = key .. ':' .. ARGV[#KEYS + 1]
+"""
+GET_VERSIONED_SCRIPT = VERSIONED_KEY_SCRIPT + """
+return redis.call('GET', key)
+"""
+SET_VERSIONED_SCRIPT = VERSIONED_KEY_SCRIPT + """
+return redis.call('SET', key, ARGV[#KEYS + 2], 'EX', ARGV[#KEYS + 3])
+"""
+SET_PAGE_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('SADD', KEYS[2], KEYS[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+for i = 3, #ARGV, 2 do
+    local pages = redis.call('HGET', KEYS[3], ARGV[i] .. ':pages')
+    if not pages then
+        pages = KEYS[1]
+    elseif not string.find(' ' .. pages .. ' ', ' ' .. KEYS[1] .. ' ', 1, true) then
+        pages = pages .. ' ' .. KEYS[1]
+    end
+    redis.call('HSET', KEYS[3], ARGV[i], ARGV[i + 1], ARGV[i] .. ':pages', pages)
+end
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+"""
+INVALIDATE_PAGES_SCRIPT = """
+local pages = {}
+if ARGV[1] ~= '' and (ARGV[2] == '' or redis.call('HGET', KEYS[2], ARGV[1]) == ARGV[2]) then
+    local item_pages = redis.call('HGET', KEYS[2], ARGV[1] .. ':pages')
+    if item_pages then
+        for page in string.gmatch(item_pages, '%S+') do
+            table.insert(pages, page)
+            redis.call('SREM', KEYS[1], page)
+        end
+        redis.call('HDEL', KEYS[2], ARGV[1] .. ':pages')
+    end
+else
+    pages = redis.call('SMEMBERS', KEYS[1])
+    redis.call('DEL', KEYS[1], KEYS[2])
+end
+for _, page in ipairs(pages) do
+    redis.call('DEL', page)
+end
+return #pages
+"""
+RELEASE_FILL_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+cache_requests = registry.counter(
+    'cache_requests_total', 'Обращения к кешу по методам: hit, stale, miss, ok, error, skipped', ('method', 'result')
+)
+cache_request_duration = registry.histogram(
+    'cache_request_duration_seconds', 'Время обращения к кешу по методам', ('method',), FAST_BUCKETS
+)
+
+
+def get_cache_result(method: str, result) -> str:
+    if not method.startswith('get_'):
+        return 'ok'
+    if result is None:
+        return 'miss'
+    return 'stale' if isinstance(result, CacheEntry) and result.is_stale else 'hit'
+
+
+PageInvalidation = tuple[str, UUID | str | None, str | None]
+
+
+class CacheEntry(NamedTuple):
+    value: str
+    is_stale: bool
+
+
+class CompressedCacheEntry(NamedTuple):
+    value: bytes
+    is_stale: bool
+
+
+def handle_redis_exceptions(func=None, *, invalidates: Callable[..., list[str]] | None = None):
+    def decorator(func):
+        async def wrapper(self, *args, **kwargs):
+            if not circuit_breaker.allow_request():
+                if invalidates is not None:
+                    circuit_breaker.record_missed(invalidates(self, *args, **kwargs))
+                cache_requests.inc(method=func.__name__, result='skipped')
+                return None
+            is_probe = circuit_breaker.state == circuit_breaker.half_open
+            start = time.perf_counter()
+            try:
+                if is_probe:
+                    await self._recover()
+                result = await func(self, *args, **kwargs)
+            except (redis.exceptions.TimeoutError, redis.exceptions.ConnectionError):
+                if invalidates is not None:
+                    circuit_breaker.record_missed(invalidates(self, *args, **kwargs))
+                circuit_breaker.record_failure()
+                cache_requests.inc(method=func.__name__, result='error')
+                return None
+            except BaseException:
+                if is_probe and not circuit_breaker.is_closed:
+                    if invalidates is not None:
+                        circuit_breaker.record_missed(invalidates(self, *args, **kwargs))
+                    circuit_breaker.record_failure()
+                    cache_requests.inc(method=func.__name__, result='error')
+                raise
+            finally:
+                cache_request_duration.observe(time.perf_counter() - start, method=func.__name__)
+            circuit_breaker.record_success()
+            cache_requests.inc(method=func.__name__, result=get_cache_result(func.__name__, result))
+            return result
+
+        return wrapper
+
+    return decorator if func is None else decorator(func)
 
 
 class CacheRepository:
-    _was_redis_disconnect = True
+    redis: aioredis.Redis
+    background_tasks: BackgroundTasks
 
     def __init__(self):
         self.all_menus_tag = 'menus'
         self.all_submenus_tag = 'submenus'
         self.all_dishes_tag = 'dishes'
         self.full_menu_tag = 'full_menu'
+        self.full_menu_stream_tag = 'full_menu:stream'
 
         self.menu_tag = 'menu'
         self.submenu_tag = 'submenu'
         self.dish_tag = 'dish'
-        self.dependency_tag = 'deps'
+        self.generation_tag = 'gen'
+        self.page_tag = 'page'
+        self.pages_tag = 'pages'
+        self.page_index_tag = 'index'
+        self.fill_lock_tag = 'fill'
 
-        self.ttl_sec = 3600
+        self.item_ttl_sec = CACHE_ITEM_TTL
+        self.list_ttl_sec = CACHE_LIST_TTL
+        self.full_menu_ttl_sec = CACHE_FULL_MENU_TTL
+        self.stale_ttl_sec = CACHE_STALE_TTL
+        self.early_refresh_beta = 1.0
+        self.format_version = 1
+        self.etag_size = 8
+        self.generation_ttl_sec = 2 * (max(self.item_ttl_sec, self.list_ttl_sec) + self.stale_ttl_sec)
+        self.fill_started: float | None = None
+        self.read_your_writes_ms = max(int(DB_READ_YOUR_WRITES_SEC * 1000), 1)
+        self.fill_lock_ms = 2000
 
-    @staticmethod
-    async def _delete_cache_keys(redis_instance, *args: str) -> None:
-        await redis_instance.delete(*args)
+        self._get_versioned_script = self.redis.register_script(GET_VERSIONED_SCRIPT)
+        self._set_versioned_script = self.redis.register_script(SET_VERSIONED_SCRIPT)
+        self._set_page_script = self.redis.register_script(SET_PAGE_SCRIPT)
+        self._invalidate_pages_script = self.redis.register_script(INVALIDATE_PAGES_SCRIPT)
+        self._release_fill_lock_script = self.redis.register_script(RELEASE_FILL_LOCK_SCRIPT)
 
-    @staticmethod
-    async def _srem_cache_keys(redis_instance, name: str, value: str) -> None:
-        await redis_instance.srem(name, value)
+    @handle_redis_exceptions
+    async def acquire_fill_lock(self, key: str, token: str) -> bool:
+        return bool(await self.redis.set(f'{self.fill_lock_tag}:{key}', token, px=self.fill_lock_ms, nx=True))
 
-    def _serialize_data(self, item_data: Base | list[Base]) -> str:
-        json_compatible_item_data = jsonable_encoder(item_data)
-        serialized_item_data = json.dumps(json_compatible_item_data)
-        return serialized_item_data
+    @handle_redis_exceptions
+    async def release_fill_lock(self, key: str, token: str) -> None:
+        await self._release_fill_lock_script([f'{self.fill_lock_tag}:{key}'], [token])
 
-    def _get_all_submenus_id(self, menu_id: UUID | str) -> str:
-        return f'{menu_id}:{self.all_submenus_tag}'
+    async def _schedule_invalidation(
+        self,
+        keys: list[str],
+        generations: list[str] | None = None,
+        updated: list[str] | None = None,
+        pages: Sequence[PageInvalidation] | None = None,
+    ) -> None:
+        await self._mark_recent_write()
+        self.background_tasks.add_task(self._invalidate, keys, generations, updated, pages)
 
-    def _get_all_dishes_id(self, menu_id: UUID | str, submenu_id: UUID | str) -> str:
-        return f'{menu_id}:{submenu_id}:{self.all_dishes_tag}'
+    async def _mark_recent_write(self) -> None:
+        await self.redis.set(RECENT_WRITE_KEY, 1, px=self.read_your_writes_ms)
 
+    async def _invalidate(
+        self,
+        keys: list[str],
+        generations: list[str] | None = None,
+        updated: list[str] | None = None,
+        pages: Sequence[PageInvalidation] | None = None,
+    ) -> None:
+        keys = self._with_full_menu_variants(keys)
+        local_keys = [self._get_local_id(key) for key in [*keys, *(updated or [])]]
+        parents = [generation_id.removeprefix(f'{self.generation_tag}:') for generation_id in generations or []]
+        parents.extend({list_id.rsplit(':', 1)[-1] for list_id, _, _ in pages or []})
+        local_cache.invalidate(local_keys, parents)
+        if circuit_breaker.is_closed:
+            try:
+                await self._invalidate_redis(keys, generations or [], pages or [], local_keys, parents)
+                circuit_breaker.record_success()
+                return
+            except (redis.exceptions.TimeoutError, redis.exceptions.ConnectionError):
+                circuit_breaker.record_failure()
+        invalidated = [*keys, *(updated or []), *(generations or []), *(list_id for list_id, _, _ in pages or [])]
+        circuit_breaker.record_missed(self._get_invalidated_parents(invalidated))
 
-def handle_redis_exceptions(func):
-    async def wrapper(self, *args, **kwargs):
+    async def _invalidate_redis(
+        self,
+        keys: list[str],
+        generations: list[str],
+        pages: Sequence[PageInvalidation],
+        local_keys: list[str],
+        parents: list[str],
+    ) -> None:
         try:
-            if CacheRepository._was_redis_disconnect:
-                await self.redis.flushdb()
-            result = await func(self, *args, **kwargs)
-            CacheRepository._was_redis_disconnect = False
-            return result
-        except (redis.exceptions.TimeoutError, redis.exceptions.ConnectionError):
-            CacheRepository._was_redis_disconnect = True
+            await self._get_invalidation_pipeline(keys, generations, pages, local_keys, parents).execute()
+        except redis.exceptions.NoScriptError:
+            await self.redis.script_load(INVALIDATE_PAGES_SCRIPT)
+            await self._get_invalidation_pipeline(keys, generations, pages, local_keys, parents).execute()
+
+    def _get_invalidation_pipeline(
+        self,
+        keys: list[str],
+        generations: list[str],
+        pages: Sequence[PageInvalidation],
+        local_keys: list[str],
+        parents: list[str],
+    ) -> Pipeline:
+        pipe = self.redis.pipeline(transaction=False)
+        if keys:
+            pipe.delete(*keys)
+        for generation_id in generations:
+            pipe.set(generation_id, uuid4().hex, self.generation_ttl_sec)
+        for list_id, item_id, title in pages:
+            pipe.evalsha(
+                self._invalidate_pages_script.sha,
+                2,
+                f'{list_id}:{self.pages_tag}',
+                f'{list_id}:{self.page_index_tag}',
+                str(item_id or ''),
+                title or '',
+            )
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps({'keys': local_keys, 'parents': parents}))
+        return pipe
+
+    async def _recover(self) -> None:
+        local_cache.clear()
+        while missed := circuit_breaker.take_missed():
+            keys = self._with_full_menu_variants([self.all_menus_tag, self.full_menu_tag])
+            keys.extend(parent for parent in missed if parent.startswith(f'{self.menu_tag}_'))
+            generations = [self._get_generation_id(parent) for parent in missed]
+            try:
+                await self._invalidate_redis(keys, generations, [(self.all_menus_tag, None, None)], keys, list(missed))
+            except BaseException:
+                circuit_breaker.record_missed(missed)
+                raise
+        circuit_breaker.close()
+
+    def _get_invalidated_parents(self, keys: list[str]) -> set[str]:
+        prefixes = (f'{self.menu_tag}_', f'{self.submenu_tag}_')
+        return {part for key in keys for part in key.split(':') if part.startswith(prefixes)}
+
+    def start_fill(self) -> None:
+        self.fill_started = time.perf_counter()
+
+    def _wrap(self, serialized_data: str, ttl_sec: int) -> str:
+        fill_ms = 0 if self.fill_started is None else int((time.perf_counter() - self.fill_started) * 1000)
+        return f'{int((time.time() + ttl_sec) * 1000)} {fill_ms} {self.format_version}\n{serialized_data}'
+
+    def _is_stale(self, header: str) -> bool | None:
+        try:
+            soft_expiry_ms, fill_ms, format_version = map(int, header.split())
+        except ValueError:
+            return None
+        if format_version != self.format_version:
             return None
+        early_ms = -fill_ms * self.early_refresh_beta * math.log(1 - random.random())
+        return time.time() * 1000 + early_ms >= soft_expiry_ms
+
+    def _unwrap(self, cached_data: str) -> CacheEntry | None:
+        header, _, value = cached_data.partition('\n')
+        is_stale = self._is_stale(header)
+        return None if is_stale is None else CacheEntry(value, is_stale)
+
+    def _unwrap_compressed(self, cached_data: bytes) -> CompressedCacheEntry | None:
+        header, _, value = cached_data.partition(b'\n')
+        is_stale = self._is_stale(header.decode())
+        return None if is_stale is None else CompressedCacheEntry(value, is_stale)
+
+    async def _get_cached(self, local_id: str, get_cache: Callable[[], Awaitable[str | None]]) -> CacheEntry | None:
+        cached_data = local_cache.get(local_id)
+        if cached_data is not None:
+            return self._unwrap(cached_data)
+        cached_data = await get_cache()
+        cached_entry = None if cached_data is None else self._unwrap(cached_data)
+        if cached_entry is not None:
+            local_cache.set(local_id, cached_data)
+        return cached_entry
+
+    async def _get(self, key: str) -> CacheEntry | None:
+        return await self._get_cached(self._get_local_id(key), lambda: self.redis.get(key))
+
+    async def _set_serialized(self, key: str, serialized_item_data: str, ttl_sec: int) -> None:
+        cached_data = self._wrap(serialized_item_data, ttl_sec)
+        await self.redis.set(key, cached_data, ttl_sec + self.stale_ttl_sec)
+        local_cache.set(self._get_local_id(key), cached_data)
+
+    def _get_generation_keys(self, parents: list[str]) -> list[str]:
+        return [self._get_generation_id(parent) for parent in parents]
+
+    async def _get_versioned(self, parents: list[str], name: str) -> CacheEntry | None:
+        return await self._get_cached(
+            ':'.join([*parents, name]),
+            lambda: self._get_versioned_script(self._get_generation_keys(parents), [*parents, name]),
+        )
+
+    async def _set_versioned(self, parents: list[str], name: str, serialized_item_data: str, ttl_sec: int) -> None:
+        cached_data = self._wrap(serialized_item_data, ttl_sec)
+        await self._set_versioned_script(
+            self._get_generation_keys(parents), [*parents, name, cached_data, ttl_sec + self.stale_ttl_sec]
+        )
+        local_cache.set(':'.join([*parents, name]), cached_data)
+
+    def _serialize_data(self, item_data: Base | list[Base], adapter: TypeAdapter) -> str:
+        return adapter.dump_json(adapter.validate_python(item_data, from_attributes=True)).decode()
+
+    def _serialize_item(self, item_data: Base, adapter: TypeAdapter) -> str:
+        return f'{item_data.version}\n{self._serialize_data(item_data, adapter)}'
+
+    def _serialize_list(self, items_data: list[Base], adapter: TypeAdapter) -> str:
+        return self._add_etag(self._serialize_data(items_data, adapter))
+
+    def _serialize_page(self, items_data: list[Base], next_cursor: str | None, adapter: TypeAdapter) -> str:
+        return self._add_etag(f'{next_cursor or ""}\n{self._serialize_data(items_data, adapter)}')
+
+    def _create_etag_hash(self) -> hashlib.blake2b:
+        return hashlib.blake2b(digest_size=self.etag_size)
+
+    def _add_etag(self, serialized_data: str) -> str:
+        etag_hash = self._create_etag_hash()
+        etag_hash.update(serialized_data.encode())
+        return f'{etag_hash.hexdigest()}\n{serialized_data}'
+
+    def _get_page_name(self, limit: int, after: str | None) -> str:
+        return f'{self.page_tag}_{limit}_{after or ""}'
+
+    async def _get_page(self, parents: list[str], list_name: str, limit: int, after: str | None) -> CacheEntry | None:
+        page_name = f'{list_name}:{self._get_page_name(limit, after)}'
+        if parents:
+            return await self._get_versioned(parents, page_name)
+        return await self._get_cached(page_name, lambda: self.redis.get(page_name))
+
+    async def _set_page(
+        self, parents: list[str], list_id: str, limit: int, after: str | None, page: str, items_data: list[Base]
+    ) -> None:
+        page_name = self._get_page_name(limit, after)
+        index = [value for item in items_data for value in (str(item.id), item.title)]
+        cached_data = self._wrap(page, self.list_ttl_sec)
+        await self._set_page_script(
+            [f'{list_id}:{page_name}', f'{list_id}:{self.pages_tag}', f'{list_id}:{self.page_index_tag}'],
+            [cached_data, self.list_ttl_sec + self.stale_ttl_sec, *index],
+        )
+        local_cache.set(':'.join([*parents, list_id.rsplit(':', 1)[-1], page_name]), cached_data)
+
+    def _get_full_menu_variant_id(self, encoding: str) -> str:
+        return f'{self.full_menu_tag}_{encoding}'
+
+    def _with_full_menu_variants(self, keys: list[str]) -> list[str]:
+        if self.full_menu_tag not in keys:
+            return keys
+        return [*keys, self.full_menu_stream_tag, *map(self._get_full_menu_variant_id, CONTENT_ENCODINGS)]
+
+    def _get_menu_id(self, menu_id: UUID | str) -> str:
+        return f'{self.menu_tag}_{menu_id}'
+
+    def _get_generation_id(self, entity_id: str) -> str:
+        return f'{self.generation_tag}:{entity_id}'
+
+    def _get_local_id(self, key: str) -> str:
+        return ':'.join(key.split(':')[::2])
+
+    def _get_parents(self, menu_id: UUID | str, submenu_id: UUID | str | None = None) -> list[str]:
+        if submenu_id is None:
+            return [self._get_menu_id(menu_id)]
+        return [self._get_menu_id(menu_id), f'{self.submenu_tag}_{submenu_id}']
+
+    async def _get_namespaces(self, menu_id: UUID | str, submenu_id: UUID | str | None = None) -> list[str]:
+        menu_id = self._get_menu_id(menu_id)
+        if submenu_id is None:
+            menu_generation = await self.redis.get(self._get_generation_id(menu_id))
+            return [f'{menu_id}:{menu_generation or 0}']
+        submenu_id = f'{self.submenu_tag}_{submenu_id}'
+        menu_generation, submenu_generation = await self.redis.mget(
+            self._get_generation_id(menu_id), self._get_generation_id(submenu_id)
+        )
+        menu_namespace = f'{menu_id}:{menu_generation or 0}'
+        return [menu_namespace, f'{menu_namespace}:{submenu_id}:{submenu_generation or 0}']
+
+    def _get_all_submenus_id(self, menu_namespace: str) -> str:
+        return f'{menu_namespace}:{self.all_submenus_tag}'
+
+    def _get_submenu_id(self, menu_namespace: str, submenu_id: UUID | str) -> str:
+        return f'{menu_namespace}:{self.submenu_tag}_{submenu_id}'
+
+    def _get_all_dishes_id(self, submenu_namespace: str) -> str:
+        return f'{submenu_namespace}:{self.all_dishes_tag}'
 
-    return wrapper
+    def _get_dish_id(self, submenu_namespace: str, dish_id: UUID | str) -> str:
+        return f'{submenu_namespace}:{self.dish_tag}_{dish_id}'
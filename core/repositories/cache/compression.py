@@ -0,0 +1,49 @@
+import zlib
+
+from core.configs.env_var import FULL_MENU_BROTLI_QUALITY, FULL_MENU_GZIP_LEVEL
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CONTENT_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class Compressor:
+    def __init__(self, encoding: str):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=FULL_MENU_BROTLI_QUALITY)
+            self._compress, self._flush = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(FULL_MENU_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress, self._flush = compressor.compress, compressor.flush
+        self._chunks: list[bytes] = []
+
+    def update(self, data: bytes) -> None:
+        self._chunks.append(self._compress(data))
+
+    def finish(self) -> bytes:
+        self._chunks.append(self._flush())
+        return b''.join(self._chunks)
+
+
+def get_content_encoding(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in CONTENT_ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
@@ -1,15 +1,20 @@
-import json
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
+from pydantic import TypeAdapter
 from redis import asyncio as aioredis
 
 from core.database.redis_db import get_redis
 from core.models.models import Dish
 from core.repositories.cache.cache_repository import (
+    CacheEntry,
     CacheRepository,
     handle_redis_exceptions,
 )
+from core.schemas.dish_schemas import DishOutSchema
+
+dish_adapter: TypeAdapter[DishOutSchema] = TypeAdapter(DishOutSchema)
+dishes_adapter: TypeAdapter[list[DishOutSchema]] = TypeAdapter(list[DishOutSchema])
 
 
 class DishCacheRepository(CacheRepository):
@@ -19,81 +24,123 @@ class DishCacheRepository(CacheRepository):
         super().__init__()
 
     @handle_redis_exceptions
-    async def get_dish(self, menu_id: UUID | str, submenu_id: UUID | str, dish_id: UUID | str) -> dict | None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        dish_id = f'{self.dish_tag}_{dish_id}'
-        if submenu_id not in await self.redis.smembers(f'{self.dependency_tag}:{menu_id}'):
-            return None
-        if dish_id not in await self.redis.smembers(f'{self.dependency_tag}:{submenu_id}'):
-            return None
-        dish_cache = await self.redis.get(dish_id)
-        if dish_cache is None:
-            return None
-        return json.loads(dish_cache)
+    async def get_dish(self, menu_id: UUID | str, submenu_id: UUID | str, dish_id: UUID | str) -> CacheEntry | None:
+        return await self._get_versioned(self._get_parents(menu_id, submenu_id), f'{self.dish_tag}_{dish_id}')
 
     @handle_redis_exceptions
-    async def set_dish(self, dish_id: UUID | str, dish_data: Dish) -> None:
-        dish_id = f'{self.dish_tag}_{dish_id}'
-        await self.redis.set(dish_id, self._serialize_data(dish_data), self.ttl_sec)
+    async def set_dish(self, menu_id: UUID | str, submenu_id: UUID | str, dish_id: UUID | str, dish: str) -> None:
+        await self._set_versioned(
+            self._get_parents(menu_id, submenu_id), f'{self.dish_tag}_{dish_id}', dish, self.item_ttl_sec
+        )
 
     @handle_redis_exceptions
-    async def get_all_dishes(self, menu_id: UUID | str, submenu_id: UUID | str) -> list[dict] | None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        if submenu_id not in await self.redis.smembers(f'{self.dependency_tag}:{menu_id}'):
-            return None
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-        all_dishes_cache = await self.redis.get(all_dishes_id)
-        if all_dishes_cache is None:
-            return None
-        return json.loads(all_dishes_cache)
+    async def get_all_dishes(self, menu_id: UUID | str, submenu_id: UUID | str) -> CacheEntry | None:
+        return await self._get_versioned(self._get_parents(menu_id, submenu_id), self.all_dishes_tag)
 
     @handle_redis_exceptions
-    async def set_all_dishes(self, menu_id: UUID | str, submenu_id: UUID | str, dish_data: Dish) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-        await self.redis.set(all_dishes_id, self._serialize_data(dish_data), self.ttl_sec)
+    async def set_all_dishes(self, menu_id: UUID | str, submenu_id: UUID | str, dishes: str) -> None:
+        await self._set_versioned(
+            self._get_parents(menu_id, submenu_id), self.all_dishes_tag, dishes, self.list_ttl_sec
+        )
 
-    @handle_redis_exceptions
-    async def create_dish(self, menu_id: UUID | str, db_dish: Dish) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{db_dish.submenu_id}'
-        dish_id = f'{self.dish_tag}_{db_dish.id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-        to_delete = [all_dishes_id, submenu_id, all_submenus_id, menu_id, self.all_menus_tag, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.sadd(f'{self.dependency_tag}:{submenu_id}', dish_id)
-        await self.redis.set(dish_id, self._serialize_data(db_dish), self.ttl_sec)
+    def serialize_dish(self, dish_data: Dish) -> str:
+        return self._serialize_item(dish_data, dish_adapter)
+
+    def serialize_dishes(self, dishes_data: list[Dish]) -> str:
+        return self._serialize_list(dishes_data, dishes_adapter)
+
+    def serialize_dishes_page(self, dishes_data: list[Dish], next_cursor: str | None) -> str:
+        return self._serialize_page(dishes_data, next_cursor, dishes_adapter)
 
     @handle_redis_exceptions
-    async def update_dish(self, menu_id: UUID | str, db_dish: Dish) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{db_dish.submenu_id}'
-        dish_id = f'{self.dish_tag}_{db_dish.id}'
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-        to_delete = [all_dishes_id, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.set(dish_id, self._serialize_data(db_dish), self.ttl_sec)
+    async def get_dishes_page(
+        self, menu_id: UUID | str, submenu_id: UUID | str, limit: int, after: str | None
+    ) -> CacheEntry | None:
+        return await self._get_page(self._get_parents(menu_id, submenu_id), self.all_dishes_tag, limit, after)
 
     @handle_redis_exceptions
+    async def set_dishes_page(
+        self,
+        menu_id: UUID | str,
+        submenu_id: UUID | str,
+        limit: int,
+        after: str | None,
+        page: str,
+        dishes_data: list[Dish],
+    ) -> None:
+        _, submenu_namespace = await self._get_namespaces(menu_id, submenu_id)
+        all_dishes_id = self._get_all_dishes_id(submenu_namespace)
+        await self._set_page(self._get_parents(menu_id, submenu_id), all_dishes_id, limit, after, page, dishes_data)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, menu_id, db_dish, dish: self._get_parents(menu_id, db_dish.submenu_id)
+    )
+    async def create_dish(self, menu_id: UUID | str, db_dish: Dish, dish: str) -> None:
+        menu_namespace, submenu_namespace = await self._get_namespaces(menu_id, db_dish.submenu_id)
+        to_delete = [
+            self._get_all_dishes_id(submenu_namespace),
+            self._get_submenu_id(menu_namespace, db_dish.submenu_id),
+            self._get_all_submenus_id(menu_namespace),
+            self._get_menu_id(menu_id),
+            self.all_menus_tag,
+            self.full_menu_tag,
+        ]
+        pages = [
+            (self._get_all_dishes_id(submenu_namespace), None, None),
+            (self._get_all_submenus_id(menu_namespace), db_dish.submenu_id, None),
+            (self.all_menus_tag, menu_id, None),
+        ]
+        await self._schedule_invalidation(to_delete, pages=pages)
+        await self._set_serialized(self._get_dish_id(submenu_namespace, db_dish.id), dish, self.item_ttl_sec)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, menu_id, db_dish, dish: self._get_parents(menu_id, db_dish.submenu_id)
+    )
+    async def update_dish(self, menu_id: UUID | str, db_dish: Dish, dish: str) -> None:
+        _, submenu_namespace = await self._get_namespaces(menu_id, db_dish.submenu_id)
+        dish_id = self._get_dish_id(submenu_namespace, db_dish.id)
+        to_delete = [self._get_all_dishes_id(submenu_namespace), self.full_menu_tag]
+        pages = [(self._get_all_dishes_id(submenu_namespace), db_dish.id, db_dish.title)]
+        await self._schedule_invalidation(to_delete, updated=[dish_id], pages=pages)
+        await self._set_serialized(dish_id, dish, self.item_ttl_sec)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, menu_id, submenu_id, dish_id: self._get_parents(menu_id, submenu_id)
+    )
     async def delete_dish(self, menu_id: UUID | str, submenu_id: UUID | str, dish_id: UUID | str) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        dish_id = f'{self.dish_tag}_{dish_id}'
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        self.background_tasks.add_task(self._srem_cache_keys, self.redis,
-                                       f'{self.dependency_tag}:{submenu_id}', dish_id)
+        menu_namespace, submenu_namespace = await self._get_namespaces(menu_id, submenu_id)
         to_delete = [
-            dish_id,
-            all_dishes_id,
-            submenu_id,
-            all_submenus_id,
-            menu_id,
+            self._get_dish_id(submenu_namespace, dish_id),
+            self._get_all_dishes_id(submenu_namespace),
+            self._get_submenu_id(menu_namespace, submenu_id),
+            self._get_all_submenus_id(menu_namespace),
+            self._get_menu_id(menu_id),
             self.all_menus_tag,
             self.full_menu_tag,
         ]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
+        pages = [
+            (self._get_all_dishes_id(submenu_namespace), dish_id, None),
+            (self._get_all_submenus_id(menu_namespace), submenu_id, None),
+            (self.all_menus_tag, menu_id, None),
+        ]
+        await self._schedule_invalidation(to_delete, pages=pages)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, menu_id, submenu_id, counts_changed: self._get_parents(menu_id, submenu_id)
+    )
+    async def invalidate_dishes(self, menu_id: UUID | str, submenu_id: UUID | str, counts_changed: bool) -> None:
+        to_delete = [self.full_menu_tag]
+        pages = []
+        if counts_changed:
+            menu_namespace, = await self._get_namespaces(menu_id)
+            to_delete.extend(
+                [
+                    self._get_submenu_id(menu_namespace, submenu_id),
+                    self._get_all_submenus_id(menu_namespace),
+                    self._get_menu_id(menu_id),
+                    self.all_menus_tag,
+                ]
+            )
+            pages = [(self._get_all_submenus_id(menu_namespace), submenu_id, None), (self.all_menus_tag, menu_id, None)]
+        generation_id = self._get_generation_id(f'{self.submenu_tag}_{submenu_id}')
+        await self._schedule_invalidation(to_delete, [generation_id], pages=pages)
@@ -1,14 +1,34 @@
-import json
-
 from fastapi import BackgroundTasks, Depends
 from redis import asyncio as aioredis
+from redis.client import NEVER_DECODE
 
 from core.database.redis_db import get_redis
 from core.repositories.cache.cache_repository import (
+    CacheEntry,
     CacheRepository,
+    CompressedCacheEntry,
     handle_redis_exceptions,
 )
-from core.schemas.full_menu_schema import Menu as MenuSchema
+from core.repositories.cache.compression import CONTENT_ENCODINGS, Compressor
+from core.repositories.cache.local_cache import local_cache
+
+APPEND_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('APPEND', KEYS[1], ARGV[1])
+end
+return 0
+"""
+FINISH_STREAM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('SETRANGE', KEYS[1], ARGV[2], ARGV[3])
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    for i = 3, #KEYS do
+        redis.call('SET', KEYS[i], ARGV[i + 1], 'EX', ARGV[1])
+    end
+    return redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+return 0
+"""
 
 
 class FullMenuCacheRepository(CacheRepository):
@@ -16,14 +36,77 @@ class FullMenuCacheRepository(CacheRepository):
         self.redis = redis
         self.background_tasks = background_tasks
         super().__init__()
+        self._append_if_exists_script = self.redis.register_script(APPEND_IF_EXISTS_SCRIPT)
+        self._finish_stream_script = self.redis.register_script(FINISH_STREAM_SCRIPT)
+        self.stream_etag_offset = 0
+        self.stream_etag_hash = self._create_etag_hash()
+        self.stream_compressors: dict[str, Compressor] = {}
+
+    @handle_redis_exceptions
+    async def get_full_menu(self) -> CacheEntry | None:
+        return await self._get(self.full_menu_tag)
+
+    @handle_redis_exceptions
+    async def get_compressed_full_menu(self, encoding: str) -> CompressedCacheEntry | None:
+        variant_id = self._get_full_menu_variant_id(encoding)
+        cached_data = local_cache.get(variant_id)
+        if cached_data is not None:
+            return self._unwrap_compressed(cached_data)
+        cached_data = await self.redis.execute_command('GET', variant_id, **{NEVER_DECODE: True})
+        cached_entry = None if cached_data is None else self._unwrap_compressed(cached_data)
+        if cached_entry is not None:
+            local_cache.set(variant_id, cached_data)
+        return cached_entry
+
+    @handle_redis_exceptions
+    async def set_full_menu(self, full_menu_data: str) -> None:
+        etag, full_menu = full_menu_data.split('\n', 1)
+        cached_data: dict[str, str | bytes] = {self.full_menu_tag: self._wrap(full_menu_data, self.full_menu_ttl_sec)}
+        for encoding in CONTENT_ENCODINGS:
+            compressor = Compressor(encoding)
+            compressor.update(full_menu.encode())
+            cached_data[self._get_full_menu_variant_id(encoding)] = self._wrap_compressed(etag, compressor.finish())
+        pipe = self.redis.pipeline(transaction=False)
+        for key, data in cached_data.items():
+            pipe.set(key, data, self.full_menu_ttl_sec + self.stale_ttl_sec)
+        await pipe.execute()
+        for key, data in cached_data.items():
+            local_cache.set(key, data)
+
+    def serialize_full_menu(self, full_menu_data: str) -> str:
+        return self._add_etag(full_menu_data)
+
+    def _wrap_compressed(self, etag: str, compressed_data: bytes) -> bytes:
+        return self._wrap(f'{etag}\n', self.full_menu_ttl_sec).encode() + compressed_data
+
+    @handle_redis_exceptions
+    async def start_full_menu_stream(self) -> bool:
+        cached_data = self._wrap('0' * self.etag_size * 2 + '\n', self.full_menu_ttl_sec)
+        self.stream_etag_offset = cached_data.index('\n') + 1
+        self.stream_compressors = {encoding: Compressor(encoding) for encoding in CONTENT_ENCODINGS}
+        ttl_sec = self.full_menu_ttl_sec + self.stale_ttl_sec
+        return bool(await self.redis.set(self.full_menu_stream_tag, cached_data, ttl_sec, nx=True))
+
+    @handle_redis_exceptions
+    async def append_full_menu_stream(self, full_menu_chunk: str) -> bool:
+        data = full_menu_chunk.encode()
+        self.stream_etag_hash.update(data)
+        for compressor in self.stream_compressors.values():
+            compressor.update(data)
+        return bool(await self._append_if_exists_script([self.full_menu_stream_tag], [full_menu_chunk]))
 
     @handle_redis_exceptions
-    async def get_full_menu(self) -> list[dict] | None:
-        full_menu_cache = await self.redis.get(self.full_menu_tag)
-        if full_menu_cache is None:
-            return None
-        return json.loads(full_menu_cache)
+    async def finish_full_menu_stream(self) -> None:
+        etag = self.stream_etag_hash.hexdigest()
+        variants = {
+            self._get_full_menu_variant_id(encoding): self._wrap_compressed(etag, compressor.finish())
+            for encoding, compressor in self.stream_compressors.items()
+        }
+        await self._finish_stream_script(
+            [self.full_menu_stream_tag, self.full_menu_tag, *variants],
+            [self.full_menu_ttl_sec + self.stale_ttl_sec, self.stream_etag_offset, etag, *variants.values()],
+        )
 
     @handle_redis_exceptions
-    async def set_full_menu(self, full_menu_data: list[MenuSchema]) -> None:
-        await self.redis.set(self.full_menu_tag, self._serialize_data(full_menu_data), self.ttl_sec)
+    async def discard_full_menu_stream(self) -> None:
+        await self.redis.delete(self.full_menu_stream_tag)
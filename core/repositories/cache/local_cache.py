@@ -0,0 +1,73 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis
+from redis import asyncio as aioredis
+
+from core.configs.env_var import LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL
+
+INVALIDATION_CHANNEL = 'cache:invalidate'
+
+
+class LocalCache:
+    def __init__(self, max_size: int, ttl_sec: float):
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> Any | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._items[key] = (time.monotonic() + self.ttl_sec, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, keys: list[str], parents: list[str] | None = None) -> None:
+        for key in keys:
+            self._items.pop(key, None)
+        if parents:
+            parent_ids = set(parents)
+            for key in [key for key in self._items if not parent_ids.isdisjoint(key.split(':')[:-1])]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+local_cache = LocalCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL)
+
+
+async def listen_invalidations(redis_client: aioredis.Redis, retry_sec: float = 1) -> None:
+    while True:
+        try:
+            pubsub = redis_client.pubsub()
+            async with pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                local_cache.clear()
+                while True:
+                    message = await pubsub.get_message(timeout=retry_sec)
+                    if message is not None and message['type'] == 'message':
+                        invalidation = json.loads(message['data'])
+                        local_cache.invalidate(invalidation['keys'], invalidation['parents'])
+        except (redis.exceptions.TimeoutError, redis.exceptions.ConnectionError):
+            local_cache.clear()
+            await asyncio.sleep(retry_sec)
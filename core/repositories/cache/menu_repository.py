@@ -1,15 +1,20 @@
-import json
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
+from pydantic import TypeAdapter
 from redis import asyncio as aioredis
 
 from core.database.redis_db import get_redis
 from core.models.models import Menu
 from core.repositories.cache.cache_repository import (
+    CacheEntry,
     CacheRepository,
     handle_redis_exceptions,
 )
+from core.schemas.menu_schemas import MenuOutSchema
+
+menu_adapter: TypeAdapter[MenuOutSchema] = TypeAdapter(MenuOutSchema)
+menus_adapter: TypeAdapter[list[MenuOutSchema]] = TypeAdapter(list[MenuOutSchema])
 
 
 class MenuCacheRepository(CacheRepository):
@@ -19,57 +24,56 @@ class MenuCacheRepository(CacheRepository):
         super().__init__()
 
     @handle_redis_exceptions
-    async def get_menu(self, menu_id: UUID | str) -> dict | None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        menu_cache = await self.redis.get(menu_id)
-        if menu_cache is None:
-            return None
-        return json.loads(menu_cache)
+    async def get_menu(self, menu_id: UUID | str) -> CacheEntry | None:
+        return await self._get(self._get_menu_id(menu_id))
 
     @handle_redis_exceptions
-    async def set_menu(self, menu_id: UUID | str, menu_data: Menu) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        await self.redis.set(menu_id, self._serialize_data(menu_data), self.ttl_sec)
+    async def set_menu(self, menu_id: UUID | str, menu: str) -> None:
+        await self._set_serialized(self._get_menu_id(menu_id), menu, self.item_ttl_sec)
 
     @handle_redis_exceptions
-    async def get_all_menus(self) -> list[dict] | None:
-        all_menus_cache = await self.redis.get(self.all_menus_tag)
-        if all_menus_cache is None:
-            return None
-        return json.loads(all_menus_cache)
+    async def get_all_menus(self) -> CacheEntry | None:
+        return await self._get(self.all_menus_tag)
 
     @handle_redis_exceptions
-    async def set_all_menus(self, menus_data: list[Menu]) -> None:
-        await self.redis.set(self.all_menus_tag, self._serialize_data(menus_data), self.ttl_sec)
+    async def set_all_menus(self, menus: str) -> None:
+        await self._set_serialized(self.all_menus_tag, menus, self.list_ttl_sec)
+
+    def serialize_menu(self, menu_data: Menu) -> str:
+        return self._serialize_item(menu_data, menu_adapter)
+
+    def serialize_menus(self, menus_data: list[Menu]) -> str:
+        return self._serialize_list(menus_data, menus_adapter)
+
+    def serialize_menus_page(self, menus_data: list[Menu], next_cursor: str | None) -> str:
+        return self._serialize_page(menus_data, next_cursor, menus_adapter)
 
     @handle_redis_exceptions
-    async def create_menu(self, db_menu: Menu) -> None:
-        menu_id = f'{self.menu_tag}_{db_menu.id}'
-        to_delete = [self.all_menus_tag, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.set(menu_id, self._serialize_data(db_menu), self.ttl_sec)
+    async def get_menus_page(self, limit: int, after: str | None) -> CacheEntry | None:
+        return await self._get_page([], self.all_menus_tag, limit, after)
 
     @handle_redis_exceptions
-    async def update_menu(self, db_menu: Menu) -> None:
-        menu_id = f'{self.menu_tag}_{db_menu.id}'
+    async def set_menus_page(self, limit: int, after: str | None, page: str, menus_data: list[Menu]) -> None:
+        await self._set_page([], self.all_menus_tag, limit, after, page, menus_data)
+
+    @handle_redis_exceptions(invalidates=lambda self, db_menu, menu: self._get_parents(db_menu.id))
+    async def create_menu(self, db_menu: Menu, menu: str) -> None:
         to_delete = [self.all_menus_tag, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.set(menu_id, self._serialize_data(db_menu), self.ttl_sec)
+        pages = [(self.all_menus_tag, None, None)]
+        await self._schedule_invalidation(to_delete, pages=pages)
+        await self._set_serialized(self._get_menu_id(db_menu.id), menu, self.item_ttl_sec)
 
-    @handle_redis_exceptions
+    @handle_redis_exceptions(invalidates=lambda self, db_menu, menu: self._get_parents(db_menu.id))
+    async def update_menu(self, db_menu: Menu, menu: str) -> None:
+        menu_id = self._get_menu_id(db_menu.id)
+        to_delete = [self.all_menus_tag, self.full_menu_tag]
+        pages = [(self.all_menus_tag, db_menu.id, db_menu.title)]
+        await self._schedule_invalidation(to_delete, updated=[menu_id], pages=pages)
+        await self._set_serialized(menu_id, menu, self.item_ttl_sec)
+
+    @handle_redis_exceptions(invalidates=lambda self, menu_id: self._get_parents(menu_id))
     async def delete_menu(self, menu_id: UUID | str) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        to_delete = [
-            self.all_menus_tag,
-            menu_id,
-            all_submenus_id,
-            f'{self.dependency_tag}:{menu_id}',
-            self.full_menu_tag,
-        ]
-        for submenu_id in await self.redis.smembers(f'{self.dependency_tag}:{menu_id}'):
-            for dish_id in await self.redis.smembers(f'{self.dependency_tag}:{submenu_id}'):
-                to_delete.append(dish_id)
-            all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
-            to_delete.extend([all_dishes_id, submenu_id, f'{self.dependency_tag}:{submenu_id}'])
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
+        pages = [(self.all_menus_tag, menu_id, None)]
+        menu_id = self._get_menu_id(menu_id)
+        to_delete = [self.all_menus_tag, menu_id, self.full_menu_tag]
+        await self._schedule_invalidation(to_delete, [self._get_generation_id(menu_id)], pages=pages)
@@ -1,15 +1,20 @@
-import json
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
+from pydantic import TypeAdapter
 from redis import asyncio as aioredis
 
 from core.database.redis_db import get_redis
 from core.models.models import Submenu
 from core.repositories.cache.cache_repository import (
+    CacheEntry,
     CacheRepository,
     handle_redis_exceptions,
 )
+from core.schemas.submenu_schemas import SubmenuOutSchema
+
+submenu_adapter: TypeAdapter[SubmenuOutSchema] = TypeAdapter(SubmenuOutSchema)
+submenus_adapter: TypeAdapter[list[SubmenuOutSchema]] = TypeAdapter(list[SubmenuOutSchema])
 
 
 class SubmenuCacheRepository(CacheRepository):
@@ -19,72 +24,93 @@ class SubmenuCacheRepository(CacheRepository):
         super().__init__()
 
     @handle_redis_exceptions
-    async def get_submenu(self, menu_id: UUID | str, submenu_id: UUID | str) -> dict | None:
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        if submenu_id not in await self.redis.smembers(f'{self.dependency_tag}:{menu_id}'):
-            return None
-        submenu_cache = await self.redis.get(submenu_id)
-        if submenu_cache is None:
-            return None
-        return json.loads(submenu_cache)
+    async def get_submenu(self, menu_id: UUID | str, submenu_id: UUID | str) -> CacheEntry | None:
+        return await self._get_versioned(self._get_parents(menu_id), f'{self.submenu_tag}_{submenu_id}')
 
     @handle_redis_exceptions
-    async def set_submenu(self, submenu_id: UUID | str, submenu_data: Submenu) -> None:
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        await self.redis.set(submenu_id, self._serialize_data(submenu_data), self.ttl_sec)
+    async def set_submenu(self, menu_id: UUID | str, submenu_id: UUID | str, submenu: str) -> None:
+        await self._set_versioned(
+            self._get_parents(menu_id), f'{self.submenu_tag}_{submenu_id}', submenu, self.item_ttl_sec
+        )
 
     @handle_redis_exceptions
-    async def get_all_submenus(self, menu_id: UUID | str) -> list[dict] | None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        all_submenus_cache = await self.redis.get(all_submenus_id)
-        if all_submenus_cache is None:
-            return None
-        return json.loads(all_submenus_cache)
+    async def get_all_submenus(self, menu_id: UUID | str) -> CacheEntry | None:
+        return await self._get_versioned(self._get_parents(menu_id), self.all_submenus_tag)
 
     @handle_redis_exceptions
-    async def set_all_submenus(self, menu_id: UUID | str, submenus_data: list[Submenu]) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        await self.redis.set(all_submenus_id, self._serialize_data(submenus_data), self.ttl_sec)
+    async def set_all_submenus(self, menu_id: UUID | str, submenus: str) -> None:
+        await self._set_versioned(self._get_parents(menu_id), self.all_submenus_tag, submenus, self.list_ttl_sec)
 
-    @handle_redis_exceptions
-    async def create_submenu(self, db_submenu: Submenu) -> None:
-        menu_id = f'{self.menu_tag}_{db_submenu.menu_id}'
-        submenu_id = f'{self.submenu_tag}_{db_submenu.id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        to_delete = [all_submenus_id, menu_id, self.all_menus_tag, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.sadd(f'{self.dependency_tag}:{menu_id}', submenu_id)
-        await self.redis.set(submenu_id, self._serialize_data(db_submenu), self.ttl_sec)
+    def serialize_submenu(self, submenu_data: Submenu) -> str:
+        return self._serialize_item(submenu_data, submenu_adapter)
+
+    def serialize_submenus(self, submenus_data: list[Submenu]) -> str:
+        return self._serialize_list(submenus_data, submenus_adapter)
+
+    def serialize_submenus_page(self, submenus_data: list[Submenu], next_cursor: str | None) -> str:
+        return self._serialize_page(submenus_data, next_cursor, submenus_adapter)
 
     @handle_redis_exceptions
-    async def update_submenu(self, db_submenu: Submenu) -> None:
-        menu_id = f'{self.menu_tag}_{db_submenu.menu_id}'
-        submenu_id = f'{self.submenu_tag}_{db_submenu.id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        to_delete = [all_submenus_id, self.full_menu_tag]
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
-        await self.redis.set(submenu_id, self._serialize_data(db_submenu), self.ttl_sec)
+    async def get_submenus_page(self, menu_id: UUID | str, limit: int, after: str | None) -> CacheEntry | None:
+        return await self._get_page(self._get_parents(menu_id), self.all_submenus_tag, limit, after)
 
     @handle_redis_exceptions
+    async def set_submenus_page(
+        self, menu_id: UUID | str, limit: int, after: str | None, page: str, submenus_data: list[Submenu]
+    ) -> None:
+        menu_namespace, = await self._get_namespaces(menu_id)
+        all_submenus_id = self._get_all_submenus_id(menu_namespace)
+        await self._set_page(self._get_parents(menu_id), all_submenus_id, limit, after, page, submenus_data)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, db_submenu, submenu: self._get_parents(db_submenu.menu_id, db_submenu.id)
+    )
+    async def create_submenu(self, db_submenu: Submenu, submenu: str) -> None:
+        menu_namespace, = await self._get_namespaces(db_submenu.menu_id)
+        to_delete = [
+            self._get_all_submenus_id(menu_namespace),
+            self._get_menu_id(db_submenu.menu_id),
+            self.all_menus_tag,
+            self.full_menu_tag,
+        ]
+        pages = [
+            (self._get_all_submenus_id(menu_namespace), None, None),
+            (self.all_menus_tag, db_submenu.menu_id, None),
+        ]
+        await self._schedule_invalidation(to_delete, pages=pages)
+        await self._set_serialized(self._get_submenu_id(menu_namespace, db_submenu.id), submenu, self.item_ttl_sec)
+
+    @handle_redis_exceptions(
+        invalidates=lambda self, db_submenu, submenu: self._get_parents(db_submenu.menu_id, db_submenu.id)
+    )
+    async def update_submenu(self, db_submenu: Submenu, submenu: str) -> None:
+        menu_namespace, = await self._get_namespaces(db_submenu.menu_id)
+        submenu_id = self._get_submenu_id(menu_namespace, db_submenu.id)
+        to_delete = [self._get_all_submenus_id(menu_namespace), self.full_menu_tag]
+        pages = [(self._get_all_submenus_id(menu_namespace), db_submenu.id, db_submenu.title)]
+        await self._schedule_invalidation(to_delete, updated=[submenu_id], pages=pages)
+        await self._set_serialized(submenu_id, submenu, self.item_ttl_sec)
+
+    @handle_redis_exceptions(invalidates=lambda self, menu_id, submenu_id: self._get_parents(menu_id, submenu_id))
     async def delete_submenu(self, menu_id: UUID | str, submenu_id: UUID | str) -> None:
-        menu_id = f'{self.menu_tag}_{menu_id}'
-        submenu_id = f'{self.submenu_tag}_{submenu_id}'
-        all_submenus_id = self._get_all_submenus_id(menu_id)
-        all_dishes_id = self._get_all_dishes_id(menu_id, submenu_id)
+        menu_namespace, = await self._get_namespaces(menu_id)
         to_delete = [
-            menu_id,
+            self._get_menu_id(menu_id),
             self.all_menus_tag,
-            submenu_id,
-            all_submenus_id,
-            f'{self.dependency_tag}:{submenu_id}',
-            all_dishes_id,
+            self._get_submenu_id(menu_namespace, submenu_id),
+            self._get_all_submenus_id(menu_namespace),
             self.full_menu_tag,
         ]
-        for dish_id in await self.redis.smembers(f'{self.dependency_tag}:{submenu_id}'):
-            to_delete.append(dish_id)
-        self.background_tasks.add_task(self._srem_cache_keys, self.redis,
-                                       f'{self.dependency_tag}:{menu_id}', submenu_id)
-        self.background_tasks.add_task(self._delete_cache_keys, self.redis, *to_delete)
+        pages = [(self._get_all_submenus_id(menu_namespace), submenu_id, None), (self.all_menus_tag, menu_id, None)]
+        generation_id = self._get_generation_id(f'{self.submenu_tag}_{submenu_id}')
+        await self._schedule_invalidation(to_delete, [generation_id], pages=pages)
+
+    @handle_redis_exceptions(invalidates=lambda self, menu_id, counts_changed: self._get_parents(menu_id))
+    async def invalidate_submenus(self, menu_id: UUID | str, counts_changed: bool) -> None:
+        to_delete = [self.full_menu_tag]
+        pages = []
+        if counts_changed:
+            to_delete.extend([self._get_menu_id(menu_id), self.all_menus_tag])
+            pages = [(self.all_menus_tag, menu_id, None)]
+        generation_id = self._get_generation_id(self._get_menu_id(menu_id))
+        await self._schedule_invalidation(to_delete, [generation_id], pages=pages)
@@ -0,0 +1,111 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import Depends
+from redis import asyncio as aioredis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError
+
+from core.configs.env_var import SYNC_LOCK_TIMEOUT
+from core.database.redis_db import get_redis
+from core.repositories.cache.cache_repository import (
+    CacheRepository,
+    handle_redis_exceptions,
+)
+
+
+class SyncCacheRepository(CacheRepository):
+    def __init__(self, redis: aioredis.Redis = Depends(get_redis)):
+        self.redis = redis
+        super().__init__()
+        self.sync_lock_tag = 'sync:lock'
+        self.sync_version_tag = 'sync:table_version'
+        self.lock_renew_sec = SYNC_LOCK_TIMEOUT / 3
+
+    @handle_redis_exceptions
+    async def acquire_lock(self) -> Lock | None:
+        lock = self.redis.lock(self.sync_lock_tag, timeout=SYNC_LOCK_TIMEOUT)
+        if await lock.acquire(blocking=False):
+            return lock
+        return None
+
+    @handle_redis_exceptions
+    async def renew_lock(self, lock: Lock) -> bool:
+        try:
+            await lock.reacquire()
+        except LockError:
+            return False
+        return True
+
+    async def keep_lock(self, lock: Lock) -> None:
+        while True:
+            await asyncio.sleep(self.lock_renew_sec)
+            if not await self.renew_lock(lock):
+                return
+
+    @handle_redis_exceptions
+    async def release_lock(self, lock: Lock) -> None:
+        try:
+            await lock.release()
+        except LockError:
+            pass
+
+    @handle_redis_exceptions
+    async def get_table_version(self) -> str | None:
+        return await self.redis.get(self.sync_version_tag)
+
+    @handle_redis_exceptions
+    async def set_table_version(self, table_version: str) -> None:
+        await self.redis.set(self.sync_version_tag, table_version)
+
+    def _get_synced_parents(
+        self,
+        menus: set[UUID],
+        submenus: set[tuple[UUID, UUID]],
+        dishes: set[tuple[UUID, UUID, UUID]],
+        deleted_menus: set[UUID],
+        deleted_submenus: set[UUID],
+    ) -> list[str]:
+        parents = [self._get_menu_id(menu_id) for menu_id in menus]
+        parents.extend(f'{self.submenu_tag}_{submenu_id}' for _, submenu_id in submenus)
+        parents.extend(f'{self.submenu_tag}_{submenu_id}' for _, submenu_id, _ in dishes)
+        return parents
+
+    @handle_redis_exceptions(invalidates=_get_synced_parents)
+    async def sync_tree(
+        self,
+        menus: set[UUID],
+        submenus: set[tuple[UUID, UUID]],
+        dishes: set[tuple[UUID, UUID, UUID]],
+        deleted_menus: set[UUID],
+        deleted_submenus: set[UUID],
+    ) -> None:
+        if not (menus or submenus or dishes):
+            return
+        menu_ids = [self._get_menu_id(menu_id) for menu_id in menus]
+        submenu_ids = [f'{self.submenu_tag}_{submenu_id}' for _, submenu_id in submenus]
+        generations = await self.redis.mget(*[self._get_generation_id(id) for id in menu_ids + submenu_ids])
+        namespaces: dict[str | tuple[UUID, UUID], str] = {}
+        for menu_key, generation in zip(menu_ids, generations):
+            namespaces[menu_key] = f'{menu_key}:{generation or 0}'
+        for ids, submenu_key, generation in zip(submenus, submenu_ids, generations[len(menu_ids):]):
+            namespaces[ids] = f'{namespaces[self._get_menu_id(ids[0])]}:{submenu_key}:{generation or 0}'
+
+        to_delete = [self.all_menus_tag, self.full_menu_tag, *menu_ids]
+        lists = {self.all_menus_tag}
+        for menu_id, submenu_id in submenus:
+            menu_namespace = namespaces[self._get_menu_id(menu_id)]
+            to_delete.extend(
+                [self._get_all_submenus_id(menu_namespace), self._get_submenu_id(menu_namespace, submenu_id)]
+            )
+            lists.add(self._get_all_submenus_id(menu_namespace))
+        for menu_id, submenu_id, dish_id in dishes:
+            submenu_namespace = namespaces[(menu_id, submenu_id)]
+            to_delete.extend(
+                [self._get_all_dishes_id(submenu_namespace), self._get_dish_id(submenu_namespace, dish_id)]
+            )
+            lists.add(self._get_all_dishes_id(submenu_namespace))
+        generation_ids = [self._get_generation_id(self._get_menu_id(menu_id)) for menu_id in deleted_menus]
+        generation_ids.extend(self._get_generation_id(f'{self.submenu_tag}_{id}') for id in deleted_submenus)
+        await self._mark_recent_write()
+        await self._invalidate(to_delete, generation_ids, pages=[(list_id, None, None) for list_id in lists])
@@ -1,4 +1,21 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import Column, column, insert, literal, select, tuple_, update, values
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert, Select, Update, Values
+
+from core.database.db import Base, ReadSession
+
+
 class CrudRepository:
+    db: AsyncSession
+    read_db: ReadSession
+
     def __init__(self):
         self.menu_404_msg = 'menu not found'
         self.menu_409_title_msg = 'Another menu with this title already exists.'
@@ -14,3 +31,107 @@ class CrudRepository:
         self.dish_409_title_msg = 'Another dish with this title already exists in the submenu.'
         self.dish_409_id_msg = 'Another dish with this id already exists.'
         self.dish_200_deleted_msg = 'The dish has been deleted'
+
+        self.cursor_422_msg = 'invalid cursor'
+        self.version_412_msg = 'The resource has been modified since it was read.'
+        self.page_size = 50
+
+        self.constraint_errors = {
+            'menus_pkey': (409, self.menu_409_id_msg),
+            'ix_menus_title': (409, self.menu_409_title_msg),
+            'submenus_pkey': (409, self.submenu_409_id_msg),
+            'ix_submenus_menu_id_title': (409, self.submenu_409_title_msg),
+            'submenus_menu_id_fkey': (404, self.menu_404_msg),
+            'dishes_pkey': (409, self.dish_409_id_msg),
+            'ix_dishes_submenu_id_title': (409, self.dish_409_title_msg),
+            'dishes_submenu_id_fkey': (404, self.submenu_404_msg),
+        }
+
+    @staticmethod
+    def _insert_into_parent(model: type[Base], values: dict, parent: Select) -> Insert:
+        columns = [literal(value, model.__table__.c[name].type) for name, value in values.items()]
+        return insert(model).from_select(list(values), select(*columns).where(parent.exists())).returning(model)
+
+    @staticmethod
+    def _values(model: type[Base], rows: list[dict]) -> Values:
+        names = list(rows[0])
+        return values(*[column(name, model.__table__.c[name].type) for name in names], name='data').data(
+            [tuple(row[name] for name in names) for row in rows]
+        )
+
+    def _insert_many_into_parent(self, model: type[Base], rows: list[dict], parent: Select) -> Insert:
+        data = self._values(model, [{**row, 'id': row.get('id') or uuid4()} for row in rows])
+        return insert(model).from_select(list(data.c.keys()), select(data).where(parent.exists())).returning(model)
+
+    def _update_many(self, model: type[Base], rows: list[dict], *criteria) -> Update:
+        data = self._values(model, rows)
+        return (
+            update(model)
+            .where(model.id == data.c.id, *criteria)
+            .values({**{name: data.c[name] for name in data.c.keys() if name != 'id'}, 'version': model.version + 1})
+            .returning(model)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _write(self, query: Insert | Update) -> Row | None:
+        db_rows = await self._write_all(query)
+        return db_rows[0] if db_rows else None
+
+    async def _write_all(self, query: Insert | Update) -> list[Row]:
+        try:
+            result = await self.db.execute(query)
+            db_rows = result.all()
+            await self.db.commit()
+        except IntegrityError as error:
+            await self.db.rollback()
+            constraint = getattr(error.orig.__cause__, 'constraint_name', None)
+            if constraint not in self.constraint_errors:
+                raise
+            status_code, detail = self.constraint_errors[constraint]
+            raise HTTPException(status_code=status_code, detail=detail)
+        return db_rows
+
+    def _encode_cursor(self, title: str, id: UUID) -> str:
+        return urlsafe_b64encode(json.dumps([title, str(id)]).encode()).decode().rstrip('=')
+
+    def _decode_cursor(self, cursor: str) -> tuple[str, UUID]:
+        try:
+            title, id = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            return str(title), UUID(id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=422, detail=self.cursor_422_msg)
+
+    async def _get_page(
+        self, query: Select, title: Column, id: Column, limit: int, after: str | None
+    ) -> tuple[list[Row], str | None]:
+        if after is not None:
+            query = query.where(tuple_(title, id) > tuple_(*self._decode_cursor(after)))
+        result = await self.read_db.execute(query.order_by(title, id).limit(limit + 1))
+        rows = result.all()
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], self._encode_cursor(rows[limit - 1].title, rows[limit - 1].id)
+
+    def _get_version(self, if_match: str | None) -> int | None:
+        if if_match is None or if_match.strip() == '*':
+            return None
+        etag = if_match.strip()
+        if not (etag.startswith('"') and etag.endswith('"') and etag[1:-1].isdigit()):
+            raise HTTPException(status_code=412, detail=self.version_412_msg)
+        return int(etag[1:-1])
+
+    async def _update(
+        self, model: type[Base], criteria: list, values: dict, if_match: str | None, not_found_msg: str
+    ) -> Row:
+        version = self._get_version(if_match)
+        query = update(model).where(*criteria).values(**values, version=model.version + 1).returning(model)
+        if version is not None:
+            query = query.where(model.version == version)
+        db_row = await self._write(query.execution_options(synchronize_session=False))
+        if db_row is not None:
+            return db_row
+        if version is not None:
+            query = await self.db.execute(select(model.id).where(*criteria))
+            if query.first():
+                raise HTTPException(status_code=412, detail=self.version_412_msg)
+        raise HTTPException(status_code=404, detail=not_found_msg)
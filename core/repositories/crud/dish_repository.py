@@ -1,37 +1,49 @@
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import select, update
+from sqlalchemy import delete, select
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
-from core.database.db import get_db
+from core.database.db import ReadSession, get_db, get_read_db
 from core.models.models import Dish, Submenu
 from core.repositories.crud.crud_repository import CrudRepository
-from core.repositories.crud.submenu_repository import SubmenuRepository
-from core.schemas.dish_schemas import DishCreateSchema, DishUpdateSchema
+from core.schemas.dish_schemas import (
+    DishBatchUpdateSchema,
+    DishCreateSchema,
+    DishUpdateSchema,
+)
 
 
 class DishRepository(CrudRepository):
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_db), read_db: ReadSession = Depends(get_read_db)):
         super().__init__()
         self.db = db
+        self.read_db = read_db
         self.model = Dish
 
-        self.submenu_repo = SubmenuRepository(self.db)
-
-    async def _get_dish_query(self, menu_id: UUID, **kwargs) -> Result:
-        return await self.db.execute(
-            select(Dish.id, Dish.title, Dish.description, Dish.price, Dish.submenu_id)
+    def _select_dishes(self, menu_id: UUID, **kwargs) -> Select:
+        return (
+            select(Dish.id, Dish.title, Dish.description, Dish.price, Dish.submenu_id, Dish.version)
             .filter_by(**kwargs)
             .join(Submenu, Submenu.menu_id == menu_id)
             .group_by(Dish.id)
         )
 
+    async def _get_dish_query(self, menu_id: UUID, **kwargs) -> Result:
+        return await self.read_db.execute(self._select_dishes(menu_id, **kwargs))
+
     async def get_all(self, menu_id: UUID, submenu_id: UUID) -> list[Dish]:
         query = await self._get_dish_query(menu_id=menu_id, submenu_id=submenu_id)
         return query.all()
 
+    async def get_page(
+        self, menu_id: UUID, submenu_id: UUID, limit: int, after: str | None
+    ) -> tuple[list[Dish], str | None]:
+        query = self._select_dishes(menu_id, submenu_id=submenu_id)
+        return await self._get_page(query, Dish.title, Dish.id, limit, after)
+
     async def get(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> Dish:
         query = await self._get_dish_query(menu_id=menu_id, submenu_id=submenu_id, id=dish_id)
         db_dish = query.first()
@@ -40,51 +52,59 @@ class DishRepository(CrudRepository):
         return db_dish
 
     async def create(self, menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema) -> Dish:
-        db_submenu = await self.submenu_repo._get_submenu_query(menu_id=menu_id, id=submenu_id)
-        if db_submenu is None:
+        values = {'submenu_id': submenu_id, **dish_data.model_dump(exclude_none=True)}
+        db_submenu = select(Submenu.id).filter_by(id=submenu_id, menu_id=menu_id)
+        db_dish = await self._write(self._insert_into_parent(Dish, values, db_submenu))
+        if db_dish is None:
             raise HTTPException(status_code=404, detail=self.submenu_404_msg)
-        dish_query_by_id = await self.db.execute(select(Dish.id).filter_by(id=dish_data.id))
-        db_dish_by_id = dish_query_by_id.first()
-        if db_dish_by_id:
-            raise HTTPException(status_code=409, detail=self.dish_409_id_msg)
-        query = await self._get_dish_query(menu_id=menu_id, submenu_id=submenu_id, title=dish_data.title)
-        db_dish_by_title = query.first()
-        if db_dish_by_title:
-            raise HTTPException(status_code=409, detail=self.dish_409_title_msg)
-        db_dish = Dish(submenu_id=submenu_id, **dish_data.model_dump())
-        self.db.add(db_dish)
-        await self.db.commit()
-        await self.db.refresh(db_dish)
         return db_dish
 
-    async def update(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish_data: DishUpdateSchema) -> Dish:
-        query = await self._get_dish_query(menu_id=menu_id, submenu_id=submenu_id, id=dish_id)
-        db_dish = query.first()
-        if db_dish is None:
-            raise HTTPException(status_code=404, detail=self.dish_404_msg)
-        query_by_title = await self._get_dish_query(menu_id=menu_id, submenu_id=submenu_id, title=dish_data.title)
-        db_dish_by_title = query_by_title.first()
-        if db_dish_by_title and str(db_dish_by_title.id) != str(dish_id):
-            raise HTTPException(status_code=409, detail=self.dish_409_title_msg)
-        update_query = await self.db.execute(
-            update(Dish).where(Dish.id == dish_id).values(dish_data.model_dump(exclude_unset=True)).returning(Dish)
-        )
-        await self.db.commit()
-        return update_query.first()
+    async def update(
+        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish_data: DishUpdateSchema, if_match: str | None = None
+    ) -> Dish:
+        criteria = [
+            Dish.id == dish_id,
+            Dish.submenu_id == submenu_id,
+            select(Submenu.id).filter_by(id=submenu_id, menu_id=menu_id).exists(),
+        ]
+        values = dish_data.model_dump(exclude_unset=True)
+        return await self._update(Dish, criteria, values, if_match, self.dish_404_msg)
 
     async def delete(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> dict:
-        query = await self.db.execute(
-            select(Dish)
-            .filter_by(submenu_id=submenu_id, id=dish_id)
-            .outerjoin(Submenu, Submenu.menu_id == menu_id)
-            .group_by(Dish.id)
-        )
-        db_dish = query.scalar()
-        if db_dish:
-            await self.db.delete(db_dish)
-            await self.db.commit()
+        await self.delete_many(menu_id, submenu_id, [dish_id])
         return {'status': True, 'message': self.dish_200_deleted_msg}
 
-    async def get_all_ids(self, submenu_id: UUID) -> list[UUID]:
-        query = await self.db.execute(select(Dish.id).filter_by(submenu_id=submenu_id))
-        return query.scalars().all()
+    async def create_many(self, menu_id: UUID, submenu_id: UUID, dishes_data: list[DishCreateSchema]) -> list[Dish]:
+        if not dishes_data:
+            return []
+        rows = [{'submenu_id': submenu_id, **dish_data.model_dump()} for dish_data in dishes_data]
+        db_submenu = select(Submenu.id).filter_by(id=submenu_id, menu_id=menu_id)
+        db_dishes = await self._write_all(self._insert_many_into_parent(Dish, rows, db_submenu))
+        if not db_dishes:
+            raise HTTPException(status_code=404, detail=self.submenu_404_msg)
+        db_dishes_by_title = {db_dish.title: db_dish for db_dish in db_dishes}
+        return [db_dishes_by_title[dish_data.title] for dish_data in dishes_data]
+
+    async def update_many(
+        self, menu_id: UUID, submenu_id: UUID, dishes_data: list[DishBatchUpdateSchema]
+    ) -> list[Dish]:
+        if not dishes_data:
+            return []
+        rows = [dish_data.model_dump() for dish_data in dishes_data]
+        db_submenu = select(Submenu.id).filter_by(id=submenu_id, menu_id=menu_id)
+        return await self._write_all(self._update_many(Dish, rows, Dish.submenu_id == submenu_id, db_submenu.exists()))
+
+    async def delete_many(self, menu_id: UUID, submenu_id: UUID, dish_ids: list[UUID]) -> list[UUID]:
+        query = await self.db.execute(
+            delete(Dish)
+            .where(
+                Dish.id.in_(dish_ids),
+                Dish.submenu_id == submenu_id,
+                select(Submenu.id).filter_by(id=submenu_id, menu_id=menu_id).exists(),
+            )
+            .returning(Dish.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = query.scalars().all()
+        await self.db.commit()
+        return deleted_ids
@@ -1,18 +1,66 @@
+from collections.abc import AsyncIterator
+
 from fastapi import Depends
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Text, cast, func, literal_column, select
 
-from core.database.db import get_db
-from core.models.models import Menu, Submenu
+from core.database.db import ReadSession, get_read_db
+from core.models.models import Dish, Menu, Submenu
 from core.repositories.crud.crud_repository import CrudRepository
-from core.schemas.full_menu_schema import Menu as MenuSchema
+
+
+def json_agg_or_empty(item):
+    return func.coalesce(func.json_agg(item), literal_column("'[]'::json"))
 
 
 class FullMenuRepository(CrudRepository):
-    def __init__(self, db: AsyncSession = Depends(get_db)):
-        self.db = db
+    def __init__(self, read_db: ReadSession = Depends(get_read_db)):
+        self.read_db = read_db
+        self.stream_batch_size = 10
+
+    def _get_menu_object(self):
+        dishes = (
+            select(
+                json_agg_or_empty(
+                    func.json_build_object(
+                        'type', 'DISH',
+                        'id', Dish.id,
+                        'title', Dish.title,
+                        'description', Dish.description,
+                        'price', cast(func.round(Dish.price, 2), Text),
+                    )
+                )
+            )
+            .where(Dish.submenu_id == Submenu.id)
+            .scalar_subquery()
+        )
+        submenus = (
+            select(
+                json_agg_or_empty(
+                    func.json_build_object(
+                        'type', 'SUBMENU',
+                        'id', Submenu.id,
+                        'title', Submenu.title,
+                        'description', Submenu.description,
+                        'dishes', dishes,
+                    )
+                )
+            )
+            .where(Submenu.menu_id == Menu.id)
+            .scalar_subquery()
+        )
+        return func.json_build_object(
+            'type', 'MENU',
+            'id', Menu.id,
+            'title', Menu.title,
+            'description', Menu.description,
+            'submenus', submenus,
+        )
+
+    async def get(self) -> str:
+        query = await self.read_db.execute(select(cast(json_agg_or_empty(self._get_menu_object()), Text)))
+        return query.scalar()
 
-    async def get(self) -> list[MenuSchema]:
-        query = await self.db.execute(select(Menu).options(selectinload(Menu.submenus).selectinload(Submenu.dishes)))
-        return query.scalars().all()
+    async def stream(self) -> AsyncIterator[str]:
+        query = select(cast(self._get_menu_object(), Text)).execution_options(yield_per=self.stream_batch_size)
+        async for menu in await self.read_db.stream_scalars(query):
+            yield menu
@@ -1,42 +1,43 @@
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import distinct, func, select, update
+from sqlalchemy import delete, insert, select
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
-from core.database.db import get_db
+from core.database.db import ReadSession, get_db, get_read_db
 from core.models.models import Dish, Menu, Submenu
 from core.repositories.crud.crud_repository import CrudRepository
 from core.schemas.menu_schemas import MenuCreateSchema, MenuUpdateSchema
 
 
 class MenuRepository(CrudRepository):
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_db), read_db: ReadSession = Depends(get_read_db)):
         super().__init__()
         self.db = db
+        self.read_db = read_db
         self.model = Menu
 
+    def _select_menus(self, **kwargs) -> Select:
+        return select(
+            Menu.id, Menu.title, Menu.description, Menu.submenus_count, Menu.dishes_count, Menu.version
+        ).filter_by(**kwargs)
+
     async def _get_menu_query(self, **kwargs) -> Result:
-        query = await self.db.execute(
-            select(
-                Menu.id,
-                Menu.title,
-                Menu.description,
-                func.count(distinct(Submenu.id)).label('submenus_count'),
-                func.count(distinct(Dish.id)).label('dishes_count'),
-            )
-            .filter_by(**kwargs)
-            .outerjoin(Submenu, Menu.id == Submenu.menu_id)
-            .outerjoin(Dish, Submenu.id == Dish.submenu_id)
-            .group_by(Menu.id)
-        )
-        return query
+        return await self.read_db.execute(self._select_menus(**kwargs))
 
     async def get_all(self) -> list[Menu]:
         query = await self._get_menu_query()
         return query.all()
 
+    async def get_all_ids(self) -> list[UUID]:
+        query = await self.read_db.execute(select(Menu.id))
+        return query.scalars().all()
+
+    async def get_page(self, limit: int, after: str | None) -> tuple[list[Menu], str | None]:
+        return await self._get_page(self._select_menus(), Menu.title, Menu.id, limit, after)
+
     async def get(self, id: UUID) -> Menu:
         query = await self._get_menu_query(id=id)
         db_menu = query.first()
@@ -45,42 +46,19 @@ class MenuRepository(CrudRepository):
         return db_menu
 
     async def create(self, menu_data: MenuCreateSchema) -> Menu:
-        query_by_id = await self.db.execute(select(Menu.id).filter_by(id=menu_data.id))
-        if query_by_id.first():
-            raise HTTPException(status_code=409, detail=self.menu_409_id_msg)
-        query = await self._get_menu_query(title=menu_data.title)
-        db_menu_by_title = query.first()
-        if db_menu_by_title:
-            raise HTTPException(status_code=409, detail=self.menu_409_title_msg)
-        db_menu = Menu(**menu_data.model_dump())
-        self.db.add(db_menu)
-        await self.db.commit()
-        await self.db.refresh(db_menu)
-        return db_menu
+        db_menus = await self._write_all(insert(Menu).values(menu_data.model_dump(exclude_none=True)).returning(Menu))
+        return db_menus[0]
 
-    async def update(self, id: UUID, menu_data: MenuUpdateSchema) -> Menu:
-        query = await self._get_menu_query(id=id)
-        db_menu = query.first()
-        if db_menu is None:
-            raise HTTPException(status_code=404, detail=self.menu_404_msg)
-        query_by_title = await self._get_menu_query(title=menu_data.title)
-        db_menu_by_title = query_by_title.first()
-        if db_menu_by_title and str(db_menu_by_title.id) != str(id):
-            raise HTTPException(status_code=409, detail=self.menu_409_title_msg)
-        updated_menu = await self.db.execute(
-            update(Menu).where(Menu.id == id).values(menu_data.model_dump(exclude_unset=True)).returning(Menu)
-        )
-        await self.db.commit()
-        return updated_menu.first()
+    async def update(self, id: UUID, menu_data: MenuUpdateSchema, if_match: str | None = None) -> Menu:
+        values = menu_data.model_dump(exclude_unset=True)
+        return await self._update(Menu, [Menu.id == id], values, if_match, self.menu_404_msg)
 
     async def delete(self, id: UUID) -> dict:
-        query = await self.db.execute(select(Menu).filter_by(id=id))
-        db_menu = query.scalar()
-        if db_menu:
-            await self.db.delete(db_menu)
-            await self.db.commit()
+        db_submenus = select(Submenu.id).filter_by(menu_id=id)
+        await self.db.execute(
+            delete(Dish).where(Dish.submenu_id.in_(db_submenus)).execution_options(synchronize_session=False)
+        )
+        await self.db.execute(delete(Submenu).filter_by(menu_id=id).execution_options(synchronize_session=False))
+        await self.db.execute(delete(Menu).filter_by(id=id).execution_options(synchronize_session=False))
+        await self.db.commit()
         return {'status': True, 'message': self.menu_200_deleted_msg}
-
-    async def get_all_ids(self) -> list[UUID]:
-        query = await self.db.execute(select(Menu.id))
-        return query.scalars().all()
@@ -1,43 +1,48 @@
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import distinct, func, select, update
-from sqlalchemy.engine import Result
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Result, Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
-from core.database.db import get_db
-from core.models.models import Dish, Submenu
+from core.database.db import ReadSession, get_db, get_read_db
+from core.models.models import Dish, Menu, Submenu
 from core.repositories.crud.crud_repository import CrudRepository
-from core.repositories.crud.menu_repository import MenuRepository
-from core.schemas.submenu_schemas import SubmenuCreateSchema, SubmenuUpdateSchema
+from core.schemas.submenu_schemas import (
+    SubmenuBatchUpdateSchema,
+    SubmenuCreateSchema,
+    SubmenuUpdateSchema,
+)
 
 
 class SubmenuRepository(CrudRepository):
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_db), read_db: ReadSession = Depends(get_read_db)):
         super().__init__()
         self.db = db
+        self.read_db = read_db
         self.model = Submenu
-        self.menu_repo = MenuRepository(self.db)
+
+    def _select_submenus(self, **kwargs) -> Select:
+        return select(
+            Submenu.id, Submenu.title, Submenu.description, Submenu.menu_id, Submenu.dishes_count, Submenu.version
+        ).filter_by(**kwargs)
 
     async def _get_submenu_query(self, **kwargs) -> Result:
-        query = await self.db.execute(
-            select(
-                Submenu.id,
-                Submenu.title,
-                Submenu.description,
-                Submenu.menu_id,
-                func.count(distinct(Dish.id)).label('dishes_count'),
-            )
-            .filter_by(**kwargs)
-            .outerjoin(Dish, Submenu.id == Dish.submenu_id)
-            .group_by(Submenu.id)
-        )
-        return query
+        return await self.read_db.execute(self._select_submenus(**kwargs))
 
     async def get_all(self, menu_id: UUID) -> list[Submenu]:
         query = await self._get_submenu_query(menu_id=menu_id)
         return query.all()
 
+    async def get_all_ids(self) -> list[Row]:
+        query = await self.read_db.execute(select(Submenu.menu_id, Submenu.id))
+        return query.all()
+
+    async def get_page(self, menu_id: UUID, limit: int, after: str | None) -> tuple[list[Submenu], str | None]:
+        query = self._select_submenus(menu_id=menu_id)
+        return await self._get_page(query, Submenu.title, Submenu.id, limit, after)
+
     async def get(self, menu_id: UUID, submenu_id: UUID) -> Submenu:
         query = await self._get_submenu_query(menu_id=menu_id, id=submenu_id)
         db_submenu = query.first()
@@ -46,51 +51,52 @@ class SubmenuRepository(CrudRepository):
         return db_submenu
 
     async def create(self, menu_id: UUID, submenu_data: SubmenuCreateSchema) -> Submenu:
-        menu_query = await self.menu_repo._get_menu_query(id=menu_id)
-        if menu_query.first() is None:
+        values = {'menu_id': menu_id, **submenu_data.model_dump(exclude_none=True)}
+        db_menu = select(Menu.id).filter_by(id=menu_id)
+        db_submenu = await self._write(self._insert_into_parent(Submenu, values, db_menu))
+        if db_submenu is None:
             raise HTTPException(status_code=404, detail=self.menu_404_msg)
-        query_by_id = await self.db.execute(
-            select(
-                Submenu.id,
-            ).filter_by(id=submenu_data.id)
-        )
-        if query_by_id.first():
-            raise HTTPException(status_code=409, detail=self.submenu_409_id_msg)
-        query_by_title = await self._get_submenu_query(menu_id=menu_id, title=submenu_data.title)
-        if query_by_title.first():
-            raise HTTPException(status_code=409, detail=self.submenu_409_title_msg)
-        db_submenu = Submenu(menu_id=menu_id, **submenu_data.model_dump())
-        self.db.add(db_submenu)
-        await self.db.commit()
-        await self.db.refresh(db_submenu)
         return db_submenu
 
-    async def update(self, menu_id: UUID, submenu_id: UUID, submenu_data: SubmenuUpdateSchema) -> Submenu:
-        query = await self._get_submenu_query(menu_id=menu_id, id=submenu_id)
-        db_submenu = query.first()
-        if db_submenu is None:
-            raise HTTPException(status_code=404, detail=self.submenu_404_msg)
-        query_by_title = await self._get_submenu_query(menu_id=menu_id, title=submenu_data.title)
-        db_submenu_by_title = query_by_title.first()
-        if db_submenu_by_title and str(db_submenu_by_title.id) != str(submenu_id):
-            raise HTTPException(status_code=409, detail=self.submenu_409_title_msg)
-        updated_submenu = await self.db.execute(
-            update(Submenu)
-            .where(Submenu.id == submenu_id)
-            .values(submenu_data.model_dump(exclude_unset=True))
-            .returning(Submenu)
-        )
-        await self.db.commit()
-        return updated_submenu.first()
+    async def update(
+        self, menu_id: UUID, submenu_id: UUID, submenu_data: SubmenuUpdateSchema, if_match: str | None = None
+    ) -> Submenu:
+        criteria = [Submenu.id == submenu_id, Submenu.menu_id == menu_id]
+        values = submenu_data.model_dump(exclude_unset=True)
+        return await self._update(Submenu, criteria, values, if_match, self.submenu_404_msg)
 
     async def delete(self, menu_id: UUID, submenu_id: UUID) -> dict:
-        query = await self.db.execute(select(Submenu).filter_by(id=submenu_id, menu_id=menu_id))
-        db_submenu = query.scalar()
-        if db_submenu:
-            await self.db.delete(db_submenu)
-            await self.db.commit()
+        await self.delete_many(menu_id, [submenu_id])
         return {'status': True, 'message': self.submenu_200_deleted_msg}
 
-    async def get_all_ids(self, menu_id: UUID) -> list[UUID]:
-        query = await self.db.execute(select(Submenu.id).filter_by(menu_id=menu_id))
-        return query.scalars().all()
+    async def create_many(self, menu_id: UUID, submenus_data: list[SubmenuCreateSchema]) -> list[Submenu]:
+        if not submenus_data:
+            return []
+        rows = [{'menu_id': menu_id, **submenu_data.model_dump()} for submenu_data in submenus_data]
+        db_menu = select(Menu.id).filter_by(id=menu_id)
+        db_submenus = await self._write_all(self._insert_many_into_parent(Submenu, rows, db_menu))
+        if not db_submenus:
+            raise HTTPException(status_code=404, detail=self.menu_404_msg)
+        db_submenus_by_title = {db_submenu.title: db_submenu for db_submenu in db_submenus}
+        return [db_submenus_by_title[submenu_data.title] for submenu_data in submenus_data]
+
+    async def update_many(self, menu_id: UUID, submenus_data: list[SubmenuBatchUpdateSchema]) -> list[Submenu]:
+        if not submenus_data:
+            return []
+        rows = [submenu_data.model_dump() for submenu_data in submenus_data]
+        return await self._write_all(self._update_many(Submenu, rows, Submenu.menu_id == menu_id))
+
+    async def delete_many(self, menu_id: UUID, submenu_ids: list[UUID]) -> list[UUID]:
+        db_submenus = select(Submenu.id).where(Submenu.id.in_(submenu_ids), Submenu.menu_id == menu_id)
+        await self.db.execute(
+            delete(Dish).where(Dish.submenu_id.in_(db_submenus)).execution_options(synchronize_session=False)
+        )
+        query = await self.db.execute(
+            delete(Submenu)
+            .where(Submenu.id.in_(submenu_ids), Submenu.menu_id == menu_id)
+            .returning(Submenu.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = query.scalars().all()
+        await self.db.commit()
+        return deleted_ids
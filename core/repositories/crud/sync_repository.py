@@ -0,0 +1,81 @@
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.db import Base, get_db
+from core.models.models import Dish, Menu, Submenu
+from core.repositories.crud.crud_repository import CrudRepository
+
+
+class SyncRepository(CrudRepository):
+    def __init__(self, db: AsyncSession = Depends(get_db)):
+        super().__init__()
+        self.db = db
+        self.chunk_size = 1000
+
+    async def get_tree(self) -> tuple[dict[UUID, dict], dict[UUID, dict], dict[UUID, dict]]:
+        menus_query = await self.db.execute(select(Menu.id, Menu.fingerprint))
+        submenus_query = await self.db.execute(select(Submenu.id, Submenu.fingerprint, Submenu.menu_id))
+        dishes_query = await self.db.execute(select(Dish.id, Dish.fingerprint, Dish.submenu_id))
+        return (
+            {row.id: row._asdict() for row in menus_query},
+            {row.id: row._asdict() for row in submenus_query},
+            {row.id: row._asdict() for row in dishes_query},
+        )
+
+    def _chunks(self, rows: list) -> list[list]:
+        return [rows[i:i + self.chunk_size] for i in range(0, len(rows), self.chunk_size)]
+
+    async def _insert_rows(self, model: type[Base], rows: list[dict]) -> None:
+        for chunk in self._chunks(rows):
+            insert_query = insert(model).values(chunk)
+            insert_query = insert_query.on_conflict_do_update(
+                index_elements=[model.id],
+                set_={
+                    **{name: insert_query.excluded[name] for name in chunk[0] if name != 'id'},
+                    'version': model.version + 1,
+                },
+            )
+            await self.db.execute(insert_query)
+
+    async def _update_rows(self, model: type[Base], rows: list[dict]) -> None:
+        for chunk in self._chunks(rows):
+            data = self._values(model, chunk)
+            await self.db.execute(
+                update(model)
+                .where(model.id == data.c.id)
+                .values({**{name: data.c[name] for name in chunk[0] if name != 'id'}, 'version': model.version + 1})
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _delete_rows(self, model: type[Base], ids: list[UUID]) -> None:
+        if not ids:
+            return
+        await self.db.execute(
+            delete(model)
+            .where(model.id == any_(bindparam('ids', ids, type_=ARRAY(PG_UUID(as_uuid=True)))))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def apply(
+        self,
+        menus: tuple[list[dict], list[dict], list[UUID]],
+        submenus: tuple[list[dict], list[dict], list[UUID]],
+        dishes: tuple[list[dict], list[dict], list[UUID]],
+    ) -> None:
+        try:
+            await self._delete_rows(Dish, dishes[2])
+            await self._delete_rows(Submenu, submenus[2])
+            await self._delete_rows(Menu, menus[2])
+            for model, (to_insert, to_update, _) in ((Menu, menus), (Submenu, submenus), (Dish, dishes)):
+                await self._insert_rows(model, to_insert)
+                await self._update_rows(model, to_update)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
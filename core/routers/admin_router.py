@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from core.database.db import engine, replica_engine
+from core.database.redis_db import circuit_breaker, pool
+from core.metrics.registry import CONTENT_TYPE, registry
 from core.schemas.response_schemas import (
+    CacheWarmUp200,
     Dish404,
     DishId409,
     DishTitle409,
     Menu404,
     MenuId409,
     MenuTitle409,
+    PoolsStats200,
     Submenu404,
     SubmenuId409,
     SubmenuTitle409,
+    SyncTableLocked200,
     SyncTableNoNeed200,
     SyncTableSuccess200,
 )
 from core.tasks.table import TableSync
+from core.tasks.warm_up import CacheWarmUp, get_cache_warm_up
 
 router = APIRouter(prefix='/admin', tags=['Админка'])
 
@@ -22,7 +29,7 @@ router = APIRouter(prefix='/admin', tags=['Админка'])
     '/sync_table',
     response_model=dict,
     responses={
-        200: {'model': SyncTableSuccess200 | SyncTableNoNeed200},
+        200: {'model': SyncTableSuccess200 | SyncTableNoNeed200 | SyncTableLocked200},
         409: {'model': MenuTitle409 | MenuId409 | SubmenuTitle409 | SubmenuId409 | DishTitle409 | DishId409},
         404: {'model': Menu404 | Submenu404 | Dish404},
     },
@@ -31,3 +38,39 @@ router = APIRouter(prefix='/admin', tags=['Админка'])
 async def sync_table_db(table: TableSync = Depends()) -> dict:
     """Обновить базу данных из админки"""
     return await table.sync_table()
+
+
+@router.get(
+    '/pools',
+    response_model=dict,
+    responses={200: {'model': PoolsStats200}},
+    summary='Состояние пулов соединений',
+)
+async def get_pools_stats() -> dict:
+    """Получить состояние пулов соединений БД, реплики и Redis и предохранителя Redis: занятые соединения, ожидание"""
+    stats = {'db': engine.pool.get_stats(), 'redis': pool.get_stats(), 'circuit_breaker': circuit_breaker.get_stats()}
+    if replica_engine is not engine:
+        stats['replica'] = replica_engine.pool.get_stats()
+    return stats
+
+
+@router.get(
+    '/metrics',
+    response_class=Response,
+    responses={200: {'content': {CONTENT_TYPE: {}}}},
+    summary='Метрики в формате Prometheus',
+)
+async def get_metrics() -> Response:
+    """Получить гистограммы времени ответа ручек и SQL-запросов, счётчики попаданий в кеш и запросов в обработке"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+@router.post(
+    '/warm_up_cache',
+    response_model=dict,
+    responses={200: {'model': CacheWarmUp200}},
+    summary='Прогреть кеш',
+)
+async def warm_up_cache(cache_warm_up: CacheWarmUp = Depends(get_cache_warm_up)) -> dict:
+    """Построить недостающие записи кеша: полное меню, список меню, списки подменю и блюд; вернуть время прогрева"""
+    return await cache_warm_up.warm_up()
@@ -1,15 +1,22 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
 
 from core.models.models import Dish
-from core.schemas.dish_schemas import DishCreateSchema, DishOutSchema, DishUpdateSchema
+from core.schemas.dish_schemas import (
+    DishBatchResultSchema,
+    DishBatchUpdateSchema,
+    DishCreateSchema,
+    DishOutSchema,
+    DishUpdateSchema,
+)
 from core.schemas.response_schemas import (
     Dish404,
     DishDel200,
     DishId409,
     DishTitle409,
     Submenu404,
+    Version412,
 )
 from core.services.dish_service import DishService
 
@@ -17,9 +24,25 @@ router = APIRouter(prefix='/dishes', tags=['Блюда'])
 
 
 @router.get('', response_model=list[DishOutSchema], summary='Получить список блюд')
-async def get_dishes(menu_id: UUID, submenu_id: UUID, dish: DishService = Depends()) -> list[Dish]:
-    """Получить список всех блюд в подменю."""
-    return await dish.get_all(menu_id=menu_id, submenu_id=submenu_id)
+async def get_dishes(
+    menu_id: UUID,
+    submenu_id: UUID,
+    limit: int | None = Query(None, ge=1, le=100),
+    after: str | None = None,
+    if_none_match: str | None = Header(None),
+    dish: DishService = Depends(),
+) -> list[Dish] | Response:
+    """Получить список всех блюд в подменю.
+
+    С параметрами `limit` и `after` возвращает страницу, отсортированную по названию;
+    курсор следующей страницы передается в заголовке `X-Next-Cursor`.
+    Ответ помечается заголовком `ETag`; если он совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    if limit is None and after is None:
+        return await dish.get_all(menu_id=menu_id, submenu_id=submenu_id, if_none_match=if_none_match)
+    return await dish.get_page(
+        menu_id=menu_id, submenu_id=submenu_id, limit=limit, after=after, if_none_match=if_none_match
+    )
 
 
 @router.get(
@@ -28,9 +51,19 @@ async def get_dishes(menu_id: UUID, submenu_id: UUID, dish: DishService = Depend
     responses={404: {'model': Dish404}},
     summary='Получить информацию о блюде',
 )
-async def get_dish(menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish: DishService = Depends()) -> Dish:
-    """Получить информацию о конкретном блюде в подменю."""
-    return await dish.get(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+async def get_dish(
+    menu_id: UUID,
+    submenu_id: UUID,
+    dish_id: UUID,
+    if_none_match: str | None = Header(None),
+    dish: DishService = Depends(),
+) -> Response:
+    """Получить информацию о конкретном блюде в подменю.
+
+    Текущая версия блюда передается в заголовке `ETag`.
+    Если она совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    return await dish.get(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, if_none_match=if_none_match)
 
 
 @router.post(
@@ -42,7 +75,7 @@ async def get_dish(menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish: DishSer
 )
 async def create_dish(
     menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema, dish: DishService = Depends()
-) -> Dish:
+) -> Response:
     """Создать новое блюдо в подменю."""
     return await dish.create(menu_id=menu_id, submenu_id=submenu_id, dish_data=dish_data)
 
@@ -50,7 +83,7 @@ async def create_dish(
 @router.patch(
     '/{dish_id}',
     response_model=DishOutSchema,
-    responses={404: {'model': Dish404}, 409: {'model': DishTitle409}},
+    responses={404: {'model': Dish404}, 409: {'model': DishTitle409}, 412: {'model': Version412}},
     summary='Обновить информацию о блюде',
 )
 async def update_dish(
@@ -58,13 +91,76 @@ async def update_dish(
     submenu_id: UUID,
     dish_id: UUID,
     dish_data: DishUpdateSchema,
+    if_match: str | None = Header(None),
     dish: DishService = Depends(),
-) -> Dish:
-    """Обновить информацию о блюде в подменю."""
-    return await dish.update(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, dish_data=dish_data)
+) -> Response:
+    """Обновить информацию о блюде в подменю.
+
+    С заголовком `If-Match` блюдо обновляется, только если его версия совпадает
+    с переданным `ETag`, иначе возвращается 412.
+    """
+    return await dish.update(
+        menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, dish_data=dish_data, if_match=if_match
+    )
 
 
 @router.delete('/{dish_id}', response_model=dict, responses={200: {'model': DishDel200}}, summary='Удалить блюдо')
 async def delete_dish(menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish: DishService = Depends()) -> dict:
     """Удалить блюдо из подменю."""
     return await dish.delete(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
+
+
+@router.post(
+    ':batch',
+    response_model=list[DishBatchResultSchema],
+    response_model_exclude_none=True,
+    status_code=201,
+    responses={404: {'model': Submenu404}, 409: {'model': DishTitle409 | DishId409}},
+    summary='Создать несколько блюд',
+)
+async def create_dishes(
+    menu_id: UUID,
+    submenu_id: UUID,
+    dishes_data: list[DishCreateSchema] = Body(max_length=1000),
+    dish: DishService = Depends(),
+) -> list[dict]:
+    """Создать несколько блюд в подменю одним запросом.
+
+    Все блюда создаются в одной транзакции: при конфликте id или названия
+    не создается ни одно из них.
+    """
+    return await dish.create_many(menu_id=menu_id, submenu_id=submenu_id, dishes_data=dishes_data)
+
+
+@router.patch(
+    ':batch',
+    response_model=list[DishBatchResultSchema],
+    response_model_exclude_none=True,
+    responses={409: {'model': DishTitle409}},
+    summary='Обновить несколько блюд',
+)
+async def update_dishes(
+    menu_id: UUID,
+    submenu_id: UUID,
+    dishes_data: list[DishBatchUpdateSchema] = Body(max_length=1000),
+    dish: DishService = Depends(),
+) -> list[dict]:
+    """Обновить несколько блюд в подменю одним запросом.
+
+    Для каждого блюда возвращается свой статус; ненайденные блюда
+    получают статус 404 и не мешают обновлению остальных.
+    """
+    return await dish.update_many(menu_id=menu_id, submenu_id=submenu_id, dishes_data=dishes_data)
+
+
+@router.delete(
+    ':batch',
+    response_model=list[DishBatchResultSchema],
+    response_model_exclude_none=True,
+    summary='Удалить несколько блюд',
+)
+async def delete_dishes(
+    menu_id: UUID, submenu_id: UUID, dish_ids: list[UUID] = Body(max_length=1000), dish: DishService = Depends()
+) -> list[dict]:
+    """Удалить несколько блюд из подменю одним запросом."""
+    return await dish.delete_many(menu_id=menu_id, submenu_id=submenu_id, dish_ids=dish_ids)
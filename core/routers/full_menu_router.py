@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 
 from core.schemas.full_menu_schema import Menu
 from core.services.full_menu_service import FullMenuService
@@ -7,6 +7,14 @@ router = APIRouter(prefix='/full_menu', tags=['Полное меню'])
 
 
 @router.get('', response_model=list[Menu], summary='Получить полное меню')
-async def get_full_menu(full_menu: FullMenuService = Depends()) -> list[Menu]:
-    """Получить список всех меню с подменю и блюдами"""
-    return await full_menu.get()
+async def get_full_menu(
+    if_none_match: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+    full_menu: FullMenuService = Depends(),
+) -> Response:
+    """Получить список всех меню с подменю и блюдами.
+
+    Ответ помечается заголовком `ETag`; если он совпадает с `If-None-Match`, возвращается 304 без тела.
+    Если клиент принимает сжатие (`Accept-Encoding`), отдаются заранее сжатые байты из кеша.
+    """
+    return await full_menu.get(if_none_match=if_none_match, accept_encoding=accept_encoding)
@@ -1,19 +1,37 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
 
 from core.models.models import Menu
 from core.schemas.menu_schemas import MenuCreateSchema, MenuOutSchema, MenuUpdateSchema
-from core.schemas.response_schemas import Menu404, MenuDel200, MenuId409, MenuTitle409
+from core.schemas.response_schemas import (
+    Menu404,
+    MenuDel200,
+    MenuId409,
+    MenuTitle409,
+    Version412,
+)
 from core.services.menu_service import MenuService
 
 router = APIRouter(prefix='/menus', tags=['Меню'])
 
 
 @router.get('', response_model=list[MenuOutSchema], summary='Получить список меню')
-async def get_menus(menu: MenuService = Depends()) -> list[Menu]:
-    """Получить список всех меню."""
-    return await menu.get_all()
+async def get_menus(
+    limit: int | None = Query(None, ge=1, le=100),
+    after: str | None = None,
+    if_none_match: str | None = Header(None),
+    menu: MenuService = Depends(),
+) -> list[Menu] | Response:
+    """Получить список всех меню.
+
+    С параметрами `limit` и `after` возвращает страницу, отсортированную по названию;
+    курсор следующей страницы передается в заголовке `X-Next-Cursor`.
+    Ответ помечается заголовком `ETag`; если он совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    if limit is None and after is None:
+        return await menu.get_all(if_none_match=if_none_match)
+    return await menu.get_page(limit=limit, after=after, if_none_match=if_none_match)
 
 
 @router.get(
@@ -22,9 +40,13 @@ async def get_menus(menu: MenuService = Depends()) -> list[Menu]:
     responses={404: {'model': Menu404}},
     summary='Получить информацию о меню',
 )
-async def get_menu(menu_id: UUID, menu: MenuService = Depends()) -> Menu:
-    """Получить информацию о конкретном меню."""
-    return await menu.get(id=menu_id)
+async def get_menu(menu_id: UUID, if_none_match: str | None = Header(None), menu: MenuService = Depends()) -> Response:
+    """Получить информацию о конкретном меню.
+
+    Текущая версия меню передается в заголовке `ETag`.
+    Если она совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    return await menu.get(id=menu_id, if_none_match=if_none_match)
 
 
 @router.post(
@@ -34,7 +56,7 @@ async def get_menu(menu_id: UUID, menu: MenuService = Depends()) -> Menu:
     responses={409: {'model': MenuTitle409 | MenuId409}},
     summary='Создать меню',
 )
-async def create_menu(menu_data: MenuCreateSchema, menu: MenuService = Depends()) -> Menu:
+async def create_menu(menu_data: MenuCreateSchema, menu: MenuService = Depends()) -> Response:
     """Создать новое меню."""
     return await menu.create(menu_data=menu_data)
 
@@ -42,12 +64,21 @@ async def create_menu(menu_data: MenuCreateSchema, menu: MenuService = Depends()
 @router.patch(
     '/{menu_id}',
     response_model=MenuOutSchema,
-    responses={404: {'model': Menu404}, 409: {'model': MenuTitle409}},
+    responses={404: {'model': Menu404}, 409: {'model': MenuTitle409}, 412: {'model': Version412}},
     summary='Обновить меню',
 )
-async def update_menu(menu_id: UUID, menu_data: MenuUpdateSchema, menu: MenuService = Depends()) -> Menu:
-    """Обновить информацию о меню."""
-    return await menu.update(id=menu_id, menu_data=menu_data)
+async def update_menu(
+    menu_id: UUID,
+    menu_data: MenuUpdateSchema,
+    if_match: str | None = Header(None),
+    menu: MenuService = Depends(),
+) -> Response:
+    """Обновить информацию о меню.
+
+    С заголовком `If-Match` меню обновляется, только если его версия совпадает
+    с переданным `ETag`, иначе возвращается 412.
+    """
+    return await menu.update(id=menu_id, menu_data=menu_data, if_match=if_match)
 
 
 @router.delete('/{menu_id}', response_model=dict, responses={200: {'model': MenuDel200}}, summary='Удалить меню')
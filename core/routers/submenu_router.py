@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
 
 from core.models.models import Submenu
 from core.schemas.response_schemas import (
@@ -9,8 +9,11 @@ from core.schemas.response_schemas import (
     SubmenuDel200,
     SubmenuId409,
     SubmenuTitle409,
+    Version412,
 )
 from core.schemas.submenu_schemas import (
+    SubmenuBatchResultSchema,
+    SubmenuBatchUpdateSchema,
     SubmenuCreateSchema,
     SubmenuOutSchema,
     SubmenuUpdateSchema,
@@ -21,10 +24,22 @@ router = APIRouter(prefix='/submenus', tags=['Подменю'])
 
 
 @router.get('', response_model=list[SubmenuOutSchema], summary='Получить список подменю')
-async def get_submenus(menu_id: UUID, submenu: SubmenuService = Depends()) -> list[Submenu]:
-    """Получить список всех подменю в меню."""
+async def get_submenus(
+    menu_id: UUID,
+    limit: int | None = Query(None, ge=1, le=100),
+    after: str | None = None,
+    if_none_match: str | None = Header(None),
+    submenu: SubmenuService = Depends(),
+) -> list[Submenu] | Response:
+    """Получить список всех подменю в меню.
 
-    return await submenu.get_all(menu_id=menu_id)
+    С параметрами `limit` и `after` возвращает страницу, отсортированную по названию;
+    курсор следующей страницы передается в заголовке `X-Next-Cursor`.
+    Ответ помечается заголовком `ETag`; если он совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    if limit is None and after is None:
+        return await submenu.get_all(menu_id=menu_id, if_none_match=if_none_match)
+    return await submenu.get_page(menu_id=menu_id, limit=limit, after=after, if_none_match=if_none_match)
 
 
 @router.get(
@@ -33,9 +48,18 @@ async def get_submenus(menu_id: UUID, submenu: SubmenuService = Depends()) -> li
     responses={404: {'model': Submenu404}},
     summary='Получить информацию о подменю',
 )
-async def get_submenu(menu_id: UUID, submenu_id: UUID, submenu: SubmenuService = Depends()) -> Submenu:
-    """Получить информацию о конкретном подменю в меню."""
-    return await submenu.get(menu_id=menu_id, submenu_id=submenu_id)
+async def get_submenu(
+    menu_id: UUID,
+    submenu_id: UUID,
+    if_none_match: str | None = Header(None),
+    submenu: SubmenuService = Depends(),
+) -> Response:
+    """Получить информацию о конкретном подменю в меню.
+
+    Текущая версия подменю передается в заголовке `ETag`.
+    Если она совпадает с `If-None-Match`, возвращается 304 без тела.
+    """
+    return await submenu.get(menu_id=menu_id, submenu_id=submenu_id, if_none_match=if_none_match)
 
 
 @router.post(
@@ -47,7 +71,7 @@ async def get_submenu(menu_id: UUID, submenu_id: UUID, submenu: SubmenuService =
 )
 async def create_submenu(
     menu_id: UUID, submenu_data: SubmenuCreateSchema, submenu: SubmenuService = Depends()
-) -> Submenu:
+) -> Response:
     """Создать новое подменю в меню."""
     return await submenu.create(menu_id=menu_id, submenu_data=submenu_data)
 
@@ -55,14 +79,22 @@ async def create_submenu(
 @router.patch(
     '/{submenu_id}',
     response_model=SubmenuOutSchema,
-    responses={404: {'model': Submenu404}, 409: {'model': SubmenuTitle409}},
+    responses={404: {'model': Submenu404}, 409: {'model': SubmenuTitle409}, 412: {'model': Version412}},
     summary='Обновить информацию о подменю',
 )
 async def update_submenu(
-    menu_id: UUID, submenu_id: UUID, submenu_data: SubmenuUpdateSchema, submenu: SubmenuService = Depends()
-) -> Submenu:
-    """Обновить информацию о подменю в меню."""
-    return await submenu.update(menu_id=menu_id, submenu_id=submenu_id, submenu_data=submenu_data)
+    menu_id: UUID,
+    submenu_id: UUID,
+    submenu_data: SubmenuUpdateSchema,
+    if_match: str | None = Header(None),
+    submenu: SubmenuService = Depends(),
+) -> Response:
+    """Обновить информацию о подменю в меню.
+
+    С заголовком `If-Match` подменю обновляется, только если его версия совпадает
+    с переданным `ETag`, иначе возвращается 412.
+    """
+    return await submenu.update(menu_id=menu_id, submenu_id=submenu_id, submenu_data=submenu_data, if_match=if_match)
 
 
 @router.delete(
@@ -71,3 +103,57 @@ async def update_submenu(
 async def delete_submenu(menu_id: UUID, submenu_id: UUID, submenu: SubmenuService = Depends()) -> dict:
     """Удалить подменю из меню."""
     return await submenu.delete(menu_id=menu_id, submenu_id=submenu_id)
+
+
+@router.post(
+    ':batch',
+    response_model=list[SubmenuBatchResultSchema],
+    response_model_exclude_none=True,
+    status_code=201,
+    responses={404: {'model': Menu404}, 409: {'model': SubmenuTitle409 | SubmenuId409}},
+    summary='Создать несколько подменю',
+)
+async def create_submenus(
+    menu_id: UUID,
+    submenus_data: list[SubmenuCreateSchema] = Body(max_length=1000),
+    submenu: SubmenuService = Depends(),
+) -> list[dict]:
+    """Создать несколько подменю в меню одним запросом.
+
+    Все подменю создаются в одной транзакции: при конфликте id или названия
+    не создается ни одно из них.
+    """
+    return await submenu.create_many(menu_id=menu_id, submenus_data=submenus_data)
+
+
+@router.patch(
+    ':batch',
+    response_model=list[SubmenuBatchResultSchema],
+    response_model_exclude_none=True,
+    responses={409: {'model': SubmenuTitle409}},
+    summary='Обновить несколько подменю',
+)
+async def update_submenus(
+    menu_id: UUID,
+    submenus_data: list[SubmenuBatchUpdateSchema] = Body(max_length=1000),
+    submenu: SubmenuService = Depends(),
+) -> list[dict]:
+    """Обновить несколько подменю в меню одним запросом.
+
+    Для каждого подменю возвращается свой статус; ненайденные подменю
+    получают статус 404 и не мешают обновлению остальных.
+    """
+    return await submenu.update_many(menu_id=menu_id, submenus_data=submenus_data)
+
+
+@router.delete(
+    ':batch',
+    response_model=list[SubmenuBatchResultSchema],
+    response_model_exclude_none=True,
+    summary='Удалить несколько подменю',
+)
+async def delete_submenus(
+    menu_id: UUID, submenu_ids: list[UUID] = Body(max_length=1000), submenu: SubmenuService = Depends()
+) -> list[dict]:
+    """Удалить несколько подменю вместе с их блюдами одним запросом."""
+    return await submenu.delete_many(menu_id=menu_id, submenu_ids=submenu_ids)
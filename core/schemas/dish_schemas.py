@@ -27,3 +27,14 @@ class DishOutSchema(DishBaseSchema):
         return Decimal(value).quantize(Decimal('.01'))
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DishBatchUpdateSchema(DishUpdateSchema):
+    id: UUID
+
+
+class DishBatchResultSchema(BaseModel):
+    id: UUID
+    status_code: int
+    data: DishOutSchema | None = None
+    detail: str | None = None
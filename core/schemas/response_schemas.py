@@ -54,6 +54,10 @@ class DishDel200(BaseModel):
     message: str = crud_repo.dish_200_deleted_msg
 
 
+class Version412(BaseModel):
+    message: str = crud_repo.version_412_msg
+
+
 class SyncTableSuccess200(BaseModel):
     status: bool = True
     message: str = 'success'
@@ -62,3 +66,52 @@ class SyncTableSuccess200(BaseModel):
 class SyncTableNoNeed200(BaseModel):
     status: bool = False
     message: str = 'no need to sync'
+
+
+class SyncTableLocked200(BaseModel):
+    status: bool = False
+    message: str = 'sync is already running'
+
+
+class CacheWarmUp200(BaseModel):
+    entries: int
+    elapsed_sec: float
+    max_entry_sec: float
+
+
+class PoolCheckoutStats(BaseModel):
+    checkouts: int
+    timeouts: int
+    wait_sec_total: float
+    wait_sec_avg: float
+    wait_sec_max: float
+
+
+class DbPoolStats(PoolCheckoutStats):
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
+class RedisPoolStats(PoolCheckoutStats):
+    max_connections: int
+    blocking: bool
+    in_use: int
+
+
+class CircuitBreakerStats(BaseModel):
+    state: str
+    failures: int
+    opened: int
+    backoff_sec: float
+    retry_in_sec: float
+    missed_invalidations: int
+
+
+class PoolsStats200(BaseModel):
+    db: DbPoolStats
+    replica: DbPoolStats | None = None
+    redis: RedisPoolStats
+    circuit_breaker: CircuitBreakerStats
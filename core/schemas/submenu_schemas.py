@@ -22,3 +22,14 @@ class SubmenuOutSchema(SubmenuBaseSchema):
     dishes_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SubmenuBatchUpdateSchema(SubmenuUpdateSchema):
+    id: UUID
+
+
+class SubmenuBatchResultSchema(BaseModel):
+    id: UUID
+    status_code: int
+    data: SubmenuOutSchema | None = None
+    detail: str | None = None
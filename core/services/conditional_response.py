@@ -0,0 +1,24 @@
+from fastapi import Response
+
+from core.configs.env_var import HTTP_CACHE_CONTROL
+
+
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+def get_conditional_response(
+    body: str | bytes,
+    etag: str,
+    if_none_match: str | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    headers = {**(headers or {}), 'ETag': f'"{etag}"', 'Cache-Control': HTTP_CACHE_CONTROL}
+    if is_not_modified(if_none_match, headers['ETag']):
+        return Response(status_code=304, headers=headers)
+    return Response(body, status_code=status_code, media_type='application/json', headers=headers)
@@ -1,11 +1,16 @@
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Response
 
-from core.models.models import Dish
 from core.repositories.cache.dish_repository import DishCacheRepository
 from core.repositories.crud.dish_repository import DishRepository
-from core.schemas.dish_schemas import DishCreateSchema, DishUpdateSchema
+from core.schemas.dish_schemas import (
+    DishBatchUpdateSchema,
+    DishCreateSchema,
+    DishUpdateSchema,
+)
+from core.services.conditional_response import get_conditional_response
+from core.services.single_flight import single_flight
 
 
 class DishService:
@@ -13,38 +18,117 @@ class DishService:
         self.dish_repository = dish_repository
         self.cache_repository = cache_repository
 
-    async def get_all(self, menu_id: UUID, submenu_id: UUID) -> list[Dish]:
-        cached_dishes = await self.cache_repository.get_all_dishes(menu_id, submenu_id)
-        if cached_dishes:
-            return cached_dishes
+    async def get_all(self, menu_id: UUID, submenu_id: UUID, if_none_match: str | None = None) -> Response:
+        dishes = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.all_dishes_tag}:{menu_id}:{submenu_id}',
+            lambda: self.cache_repository.get_all_dishes(menu_id, submenu_id),
+            lambda: self._fill_all(menu_id, submenu_id),
+        )
+        etag, body = dishes.split('\n', 1)
+        return get_conditional_response(body, etag, if_none_match)
+
+    async def _fill_all(self, menu_id: UUID, submenu_id: UUID) -> str:
         db_dishes = await self.dish_repository.get_all(menu_id=menu_id, submenu_id=submenu_id)
-        await self.cache_repository.set_all_dishes(menu_id, submenu_id, db_dishes)
-        return db_dishes
+        dishes = self.cache_repository.serialize_dishes(db_dishes)
+        await self.cache_repository.set_all_dishes(menu_id, submenu_id, dishes)
+        return dishes
+
+    async def get_page(
+        self, menu_id: UUID, submenu_id: UUID, limit: int | None, after: str | None, if_none_match: str | None = None
+    ) -> Response:
+        page_size = limit or self.dish_repository.page_size
+        page = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.all_dishes_tag}:{menu_id}:{submenu_id}:{page_size}:{after or ""}',
+            lambda: self.cache_repository.get_dishes_page(menu_id, submenu_id, page_size, after),
+            lambda: self._fill_page(menu_id, submenu_id, page_size, after),
+        )
+        etag, next_cursor, body = page.split('\n', 2)
+        headers = {'X-Next-Cursor': next_cursor} if next_cursor else None
+        return get_conditional_response(body, etag, if_none_match, headers=headers)
+
+    async def _fill_page(self, menu_id: UUID, submenu_id: UUID, limit: int, after: str | None) -> str:
+        db_dishes, next_cursor = await self.dish_repository.get_page(
+            menu_id=menu_id, submenu_id=submenu_id, limit=limit, after=after
+        )
+        page = self.cache_repository.serialize_dishes_page(db_dishes, next_cursor)
+        await self.cache_repository.set_dishes_page(menu_id, submenu_id, limit, after, page, db_dishes)
+        return page
 
-    async def get(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> Dish:
-        cached_dish = await self.cache_repository.get_dish(menu_id, submenu_id, dish_id)
-        if cached_dish:
-            return cached_dish
+    @staticmethod
+    def _get_response(dish: str, status_code: int = 200, if_none_match: str | None = None) -> Response:
+        version, body = dish.split('\n', 1)
+        return get_conditional_response(body, version, if_none_match, status_code=status_code)
+
+    async def get(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, if_none_match: str | None = None) -> Response:
+        dish = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.dish_tag}:{menu_id}:{submenu_id}:{dish_id}',
+            lambda: self.cache_repository.get_dish(menu_id, submenu_id, dish_id),
+            lambda: self._fill(menu_id, submenu_id, dish_id),
+        )
+        return self._get_response(dish, if_none_match=if_none_match)
+
+    async def _fill(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> str:
         db_dish = await self.dish_repository.get(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
-        await self.cache_repository.set_dish(db_dish.id, db_dish)
-        return db_dish
+        dish = self.cache_repository.serialize_dish(db_dish)
+        await self.cache_repository.set_dish(menu_id, submenu_id, db_dish.id, dish)
+        return dish
 
-    async def create(self, menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema) -> Dish:
+    async def create(self, menu_id: UUID, submenu_id: UUID, dish_data: DishCreateSchema) -> Response:
         db_dish = await self.dish_repository.create(menu_id=menu_id, submenu_id=submenu_id, dish_data=dish_data)
-        await self.cache_repository.create_dish(menu_id, db_dish)
-        return db_dish
+        dish = self.cache_repository.serialize_dish(db_dish)
+        await self.cache_repository.create_dish(menu_id, db_dish, dish)
+        return self._get_response(dish, status_code=201)
 
-    async def update(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, dish_data: DishUpdateSchema) -> Dish:
+    async def update(
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        dish_id: UUID,
+        dish_data: DishUpdateSchema,
+        if_match: str | None = None,
+    ) -> Response:
         db_dish = await self.dish_repository.update(
-            menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, dish_data=dish_data
+            menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id, dish_data=dish_data, if_match=if_match
         )
-        await self.cache_repository.update_dish(menu_id, db_dish)
-        return db_dish
+        dish = self.cache_repository.serialize_dish(db_dish)
+        await self.cache_repository.update_dish(menu_id, db_dish, dish)
+        return self._get_response(dish)
 
     async def delete(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> dict:
         deleted = await self.dish_repository.delete(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
         await self.cache_repository.delete_dish(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id)
         return deleted
 
-    async def get_all_ids(self, submenu_id: UUID) -> list[UUID]:
-        return await self.dish_repository.get_all_ids(submenu_id)
+    async def create_many(self, menu_id: UUID, submenu_id: UUID, dishes_data: list[DishCreateSchema]) -> list[dict]:
+        db_dishes = await self.dish_repository.create_many(menu_id, submenu_id, dishes_data)
+        if db_dishes:
+            await self.cache_repository.invalidate_dishes(menu_id, submenu_id, counts_changed=True)
+        return [{'id': db_dish.id, 'status_code': 201, 'data': db_dish} for db_dish in db_dishes]
+
+    async def update_many(
+        self, menu_id: UUID, submenu_id: UUID, dishes_data: list[DishBatchUpdateSchema]
+    ) -> list[dict]:
+        db_dishes = await self.dish_repository.update_many(menu_id, submenu_id, dishes_data)
+        if db_dishes:
+            await self.cache_repository.invalidate_dishes(menu_id, submenu_id, counts_changed=False)
+        db_dishes_by_id = {db_dish.id: db_dish for db_dish in db_dishes}
+        return [
+            {'id': dish_data.id, 'status_code': 200, 'data': db_dishes_by_id[dish_data.id]}
+            if dish_data.id in db_dishes_by_id
+            else {'id': dish_data.id, 'status_code': 404, 'detail': self.dish_repository.dish_404_msg}
+            for dish_data in dishes_data
+        ]
+
+    async def delete_many(self, menu_id: UUID, submenu_id: UUID, dish_ids: list[UUID]) -> list[dict]:
+        deleted_ids = set(await self.dish_repository.delete_many(menu_id, submenu_id, dish_ids))
+        if deleted_ids:
+            await self.cache_repository.invalidate_dishes(menu_id, submenu_id, counts_changed=True)
+        return [
+            {'id': dish_id, 'status_code': 200, 'detail': self.dish_repository.dish_200_deleted_msg}
+            if dish_id in deleted_ids
+            else {'id': dish_id, 'status_code': 404, 'detail': self.dish_repository.dish_404_msg}
+            for dish_id in dish_ids
+        ]
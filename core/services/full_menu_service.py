@@ -1,11 +1,20 @@
-from fastapi import Depends
+from collections.abc import AsyncIterator
 
+from fastapi import Depends, Response
+from fastapi.responses import StreamingResponse
+
+from core.configs.env_var import FULL_MENU_STREAMING, HTTP_CACHE_CONTROL
+from core.repositories.cache.compression import get_content_encoding
 from core.repositories.cache.full_menu_repository import FullMenuCacheRepository
 from core.repositories.crud.full_menu_repository import FullMenuRepository
-from core.schemas.full_menu_schema import Menu
+from core.services.conditional_response import get_conditional_response
+from core.services.single_flight import single_flight
 
 
 class FullMenuService:
+    streaming = FULL_MENU_STREAMING
+    stream_chunk_size = 64 * 1024
+
     def __init__(
         self,
         cache_repository: FullMenuCacheRepository = Depends(),
@@ -14,10 +23,68 @@ class FullMenuService:
         self.full_menu_repository = full_menu_repository
         self.cache_repository = cache_repository
 
-    async def get(self) -> list[Menu]:
+    async def get(self, if_none_match: str | None = None, accept_encoding: str | None = None) -> Response:
+        encoding = get_content_encoding(accept_encoding)
+        if encoding is not None:
+            cached_variant = await self.cache_repository.get_compressed_full_menu(encoding)
+            if cached_variant is not None:
+                if cached_variant.is_stale:
+                    single_flight.refresh_in_background(
+                        self.cache_repository, self.cache_repository.full_menu_tag, self._fill
+                    )
+                etag, body = cached_variant.value.split(b'\n', 1)
+                headers = {'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'}
+                return get_conditional_response(body, f'{etag.decode()}-{encoding}', if_none_match, headers=headers)
         cached_full_menu = await self.cache_repository.get_full_menu()
-        if cached_full_menu:
-            return cached_full_menu
-        db_full_menu = await self.full_menu_repository.get()
-        await self.cache_repository.set_full_menu(db_full_menu)
-        return db_full_menu
+        if cached_full_menu is None and self.streaming:
+            headers = {'Cache-Control': HTTP_CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+            return StreamingResponse(self._stream(), media_type='application/json', headers=headers)
+        full_menu = await single_flight.resolve(
+            self.cache_repository,
+            self.cache_repository.full_menu_tag,
+            cached_full_menu,
+            self.cache_repository.get_full_menu,
+            self._fill,
+        )
+        etag, body = full_menu.split('\n', 1)
+        return get_conditional_response(body, etag, if_none_match, headers={'Vary': 'Accept-Encoding'})
+
+    async def warm_up(self) -> None:
+        await single_flight.get(
+            self.cache_repository,
+            self.cache_repository.full_menu_tag,
+            self.cache_repository.get_full_menu,
+            self._fill,
+        )
+
+    async def _fill(self) -> str:
+        full_menu = self.cache_repository.serialize_full_menu(await self.full_menu_repository.get())
+        await self.cache_repository.set_full_menu(full_menu)
+        return full_menu
+
+    async def _stream(self) -> AsyncIterator[str]:
+        is_caching = await self.cache_repository.start_full_menu_stream()
+        is_finished = False
+        buffer, buffer_size = [], 0
+        try:
+            separator = '['
+            async for menu in self.full_menu_repository.stream():
+                chunk = separator + menu
+                separator = ','
+                yield chunk
+                if is_caching:
+                    buffer.append(chunk)
+                    buffer_size += len(chunk)
+                if buffer_size >= self.stream_chunk_size:
+                    is_caching = await self.cache_repository.append_full_menu_stream(''.join(buffer))
+                    buffer, buffer_size = [], 0
+            chunk = ']' if separator == ',' else '[]'
+            yield chunk
+            if is_caching:
+                buffer.append(chunk)
+                if await self.cache_repository.append_full_menu_stream(''.join(buffer)):
+                    await self.cache_repository.finish_full_menu_stream()
+            is_finished = True
+        finally:
+            if is_caching and not is_finished:
+                await self.cache_repository.discard_full_menu_stream()
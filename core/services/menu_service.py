@@ -1,11 +1,12 @@
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Response
 
-from core.models.models import Menu
 from core.repositories.cache.menu_repository import MenuCacheRepository
 from core.repositories.crud.menu_repository import MenuRepository
 from core.schemas.menu_schemas import MenuCreateSchema, MenuUpdateSchema
+from core.services.conditional_response import get_conditional_response
+from core.services.single_flight import single_flight
 
 
 class MenuService:
@@ -13,36 +14,73 @@ class MenuService:
         self.menu_repository = menu_repository
         self.cache_repository = cache_repository
 
-    async def get_all(self) -> list[Menu]:
-        cached_menus = await self.cache_repository.get_all_menus()
-        if cached_menus:
-            return cached_menus
+    async def get_all(self, if_none_match: str | None = None) -> Response:
+        menus = await single_flight.get(
+            self.cache_repository,
+            self.cache_repository.all_menus_tag,
+            self.cache_repository.get_all_menus,
+            self._fill_all,
+        )
+        etag, body = menus.split('\n', 1)
+        return get_conditional_response(body, etag, if_none_match)
+
+    async def _fill_all(self) -> str:
         db_menus = await self.menu_repository.get_all()
-        await self.cache_repository.set_all_menus(db_menus)
-        return db_menus
+        menus = self.cache_repository.serialize_menus(db_menus)
+        await self.cache_repository.set_all_menus(menus)
+        return menus
+
+    async def get_page(self, limit: int | None, after: str | None, if_none_match: str | None = None) -> Response:
+        page_size = limit or self.menu_repository.page_size
+        page = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.all_menus_tag}:{page_size}:{after or ""}',
+            lambda: self.cache_repository.get_menus_page(page_size, after),
+            lambda: self._fill_page(page_size, after),
+        )
+        etag, next_cursor, body = page.split('\n', 2)
+        headers = {'X-Next-Cursor': next_cursor} if next_cursor else None
+        return get_conditional_response(body, etag, if_none_match, headers=headers)
+
+    async def _fill_page(self, limit: int, after: str | None) -> str:
+        db_menus, next_cursor = await self.menu_repository.get_page(limit=limit, after=after)
+        page = self.cache_repository.serialize_menus_page(db_menus, next_cursor)
+        await self.cache_repository.set_menus_page(limit, after, page, db_menus)
+        return page
 
-    async def get(self, id: UUID) -> Menu:
-        cached_menu = await self.cache_repository.get_menu(id)
-        if cached_menu:
-            return cached_menu
+    @staticmethod
+    def _get_response(menu: str, status_code: int = 200, if_none_match: str | None = None) -> Response:
+        version, body = menu.split('\n', 1)
+        return get_conditional_response(body, version, if_none_match, status_code=status_code)
+
+    async def get(self, id: UUID, if_none_match: str | None = None) -> Response:
+        menu = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.menu_tag}:{id}',
+            lambda: self.cache_repository.get_menu(id),
+            lambda: self._fill(id),
+        )
+        return self._get_response(menu, if_none_match=if_none_match)
+
+    async def _fill(self, id: UUID) -> str:
         db_menu = await self.menu_repository.get(id=id)
-        await self.cache_repository.set_menu(db_menu.id, db_menu)
-        return db_menu
+        menu = self.cache_repository.serialize_menu(db_menu)
+        await self.cache_repository.set_menu(db_menu.id, menu)
+        return menu
 
-    async def create(self, menu_data: MenuCreateSchema) -> Menu:
+    async def create(self, menu_data: MenuCreateSchema) -> Response:
         db_menu = await self.menu_repository.create(menu_data=menu_data)
-        await self.cache_repository.create_menu(db_menu)
-        return db_menu
+        menu = self.cache_repository.serialize_menu(db_menu)
+        await self.cache_repository.create_menu(db_menu, menu)
+        return self._get_response(menu, status_code=201)
 
-    async def update(self, id: UUID, menu_data: MenuUpdateSchema) -> Menu:
-        db_menu = await self.menu_repository.update(id=id, menu_data=menu_data)
-        await self.cache_repository.update_menu(db_menu)
-        return db_menu
+    async def update(self, id: UUID, menu_data: MenuUpdateSchema, if_match: str | None = None) -> Response:
+        db_menu = await self.menu_repository.update(id=id, menu_data=menu_data, if_match=if_match)
+        menu = self.cache_repository.serialize_menu(db_menu)
+        await self.cache_repository.update_menu(db_menu, menu)
+        return self._get_response(menu)
 
     async def delete(self, id: UUID) -> dict:
         deleted = await self.menu_repository.delete(id=id)
         await self.cache_repository.delete_menu(menu_id=id)
         return deleted
-
-    async def get_all_ids(self) -> list[UUID]:
-        return await self.menu_repository.get_all_ids()
@@ -0,0 +1,117 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from core.repositories.cache.cache_repository import CacheEntry, CacheRepository
+
+
+class SingleFlight:
+    def __init__(self, poll_sec: float = 0.01):
+        self.poll_sec = poll_sec
+        self.flights: dict[str, asyncio.Future[str]] = {}
+        self.refreshes: set[str] = set()
+
+    async def get(
+        self,
+        cache_repository: CacheRepository,
+        key: str,
+        get_cached: Callable[[], Awaitable[CacheEntry | None]],
+        fill: Callable[[], Awaitable[str]],
+    ) -> str:
+        return await self.resolve(cache_repository, key, await get_cached(), get_cached, fill)
+
+    async def resolve(
+        self,
+        cache_repository: CacheRepository,
+        key: str,
+        cached_entry: CacheEntry | None,
+        get_cached: Callable[[], Awaitable[CacheEntry | None]],
+        fill: Callable[[], Awaitable[str]],
+    ) -> str:
+        if cached_entry is None:
+            return await self.do(cache_repository, key, get_cached, fill)
+        if cached_entry.is_stale:
+            self.refresh_in_background(cache_repository, key, fill)
+        return cached_entry.value
+
+    def refresh_in_background(
+        self, cache_repository: CacheRepository, key: str, fill: Callable[[], Awaitable[str]]
+    ) -> None:
+        if key not in self.refreshes and key not in self.flights:
+            self.refreshes.add(key)
+            cache_repository.background_tasks.add_task(self.refresh, cache_repository, key, fill)
+
+    async def do(
+        self,
+        cache_repository: CacheRepository,
+        key: str,
+        get_cached: Callable[[], Awaitable[CacheEntry | None]],
+        fill: Callable[[], Awaitable[str]],
+    ) -> str:
+        while (flight := self.flights.get(key)) is not None:
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self.flights[key] = flight
+        try:
+            result = await self._fill_once(cache_repository, key, get_cached, fill)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self.flights[key]
+
+    async def refresh(self, cache_repository: CacheRepository, key: str, fill: Callable[[], Awaitable[str]]) -> None:
+        try:
+            token = uuid4().hex
+            is_locked = await cache_repository.acquire_fill_lock(key, token)
+            if is_locked is False:
+                return
+            try:
+                cache_repository.start_fill()
+                await fill()
+            except HTTPException:
+                pass
+            finally:
+                if is_locked:
+                    await cache_repository.release_fill_lock(key, token)
+        finally:
+            self.refreshes.discard(key)
+
+    async def _fill_once(
+        self,
+        cache_repository: CacheRepository,
+        key: str,
+        get_cached: Callable[[], Awaitable[CacheEntry | None]],
+        fill: Callable[[], Awaitable[str]],
+    ) -> str:
+        token = uuid4().hex
+        is_locked = await cache_repository.acquire_fill_lock(key, token)
+        deadline = asyncio.get_running_loop().time() + cache_repository.fill_lock_ms / 1000
+        while is_locked is False and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(self.poll_sec)
+            cached_entry = await get_cached()
+            if cached_entry is not None:
+                return cached_entry.value
+            is_locked = await cache_repository.acquire_fill_lock(key, token)
+        try:
+            cache_repository.start_fill()
+            return await fill()
+        finally:
+            if is_locked:
+                await cache_repository.release_fill_lock(key, token)
+
+
+single_flight = SingleFlight()
@@ -1,11 +1,16 @@
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Response
 
-from core.models.models import Submenu
 from core.repositories.cache.submenu_repository import SubmenuCacheRepository
 from core.repositories.crud.submenu_repository import SubmenuRepository
-from core.schemas.submenu_schemas import SubmenuCreateSchema, SubmenuUpdateSchema
+from core.schemas.submenu_schemas import (
+    SubmenuBatchUpdateSchema,
+    SubmenuCreateSchema,
+    SubmenuUpdateSchema,
+)
+from core.services.conditional_response import get_conditional_response
+from core.services.single_flight import single_flight
 
 
 class SubmenuService:
@@ -15,38 +20,108 @@ class SubmenuService:
         self.submenu_repository = submenu_repository
         self.cache_repository = cache_repository
 
-    async def get_all(self, menu_id: UUID) -> list[Submenu]:
-        cached_submenus = await self.cache_repository.get_all_submenus(menu_id)
-        if cached_submenus:
-            return cached_submenus
+    async def get_all(self, menu_id: UUID, if_none_match: str | None = None) -> Response:
+        submenus = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.all_submenus_tag}:{menu_id}',
+            lambda: self.cache_repository.get_all_submenus(menu_id),
+            lambda: self._fill_all(menu_id),
+        )
+        etag, body = submenus.split('\n', 1)
+        return get_conditional_response(body, etag, if_none_match)
+
+    async def _fill_all(self, menu_id: UUID) -> str:
         db_submenus = await self.submenu_repository.get_all(menu_id=menu_id)
-        await self.cache_repository.set_all_submenus(menu_id, db_submenus)
-        return db_submenus
+        submenus = self.cache_repository.serialize_submenus(db_submenus)
+        await self.cache_repository.set_all_submenus(menu_id, submenus)
+        return submenus
+
+    async def get_page(
+        self, menu_id: UUID, limit: int | None, after: str | None, if_none_match: str | None = None
+    ) -> Response:
+        page_size = limit or self.submenu_repository.page_size
+        page = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.all_submenus_tag}:{menu_id}:{page_size}:{after or ""}',
+            lambda: self.cache_repository.get_submenus_page(menu_id, page_size, after),
+            lambda: self._fill_page(menu_id, page_size, after),
+        )
+        etag, next_cursor, body = page.split('\n', 2)
+        headers = {'X-Next-Cursor': next_cursor} if next_cursor else None
+        return get_conditional_response(body, etag, if_none_match, headers=headers)
+
+    async def _fill_page(self, menu_id: UUID, limit: int, after: str | None) -> str:
+        db_submenus, next_cursor = await self.submenu_repository.get_page(menu_id=menu_id, limit=limit, after=after)
+        page = self.cache_repository.serialize_submenus_page(db_submenus, next_cursor)
+        await self.cache_repository.set_submenus_page(menu_id, limit, after, page, db_submenus)
+        return page
 
-    async def get(self, menu_id: UUID, submenu_id: UUID) -> Submenu:
-        cached_submenu = await self.cache_repository.get_submenu(menu_id, submenu_id)
-        if cached_submenu:
-            return cached_submenu
+    @staticmethod
+    def _get_response(submenu: str, status_code: int = 200, if_none_match: str | None = None) -> Response:
+        version, body = submenu.split('\n', 1)
+        return get_conditional_response(body, version, if_none_match, status_code=status_code)
+
+    async def get(self, menu_id: UUID, submenu_id: UUID, if_none_match: str | None = None) -> Response:
+        submenu = await single_flight.get(
+            self.cache_repository,
+            f'{self.cache_repository.submenu_tag}:{menu_id}:{submenu_id}',
+            lambda: self.cache_repository.get_submenu(menu_id, submenu_id),
+            lambda: self._fill(menu_id, submenu_id),
+        )
+        return self._get_response(submenu, if_none_match=if_none_match)
+
+    async def _fill(self, menu_id: UUID, submenu_id: UUID) -> str:
         db_submenu = await self.submenu_repository.get(menu_id=menu_id, submenu_id=submenu_id)
-        await self.cache_repository.set_submenu(db_submenu.id, db_submenu)
-        return db_submenu
+        submenu = self.cache_repository.serialize_submenu(db_submenu)
+        await self.cache_repository.set_submenu(menu_id, db_submenu.id, submenu)
+        return submenu
 
-    async def create(self, menu_id: UUID, submenu_data: SubmenuCreateSchema) -> Submenu:
+    async def create(self, menu_id: UUID, submenu_data: SubmenuCreateSchema) -> Response:
         db_submenu = await self.submenu_repository.create(menu_id=menu_id, submenu_data=submenu_data)
-        await self.cache_repository.create_submenu(db_submenu=db_submenu)
-        return db_submenu
+        submenu = self.cache_repository.serialize_submenu(db_submenu)
+        await self.cache_repository.create_submenu(db_submenu=db_submenu, submenu=submenu)
+        return self._get_response(submenu, status_code=201)
 
-    async def update(self, menu_id: UUID, submenu_id: UUID, submenu_data: SubmenuUpdateSchema) -> Submenu:
+    async def update(
+        self, menu_id: UUID, submenu_id: UUID, submenu_data: SubmenuUpdateSchema, if_match: str | None = None
+    ) -> Response:
         db_submenu = await self.submenu_repository.update(
-            menu_id=menu_id, submenu_id=submenu_id, submenu_data=submenu_data
+            menu_id=menu_id, submenu_id=submenu_id, submenu_data=submenu_data, if_match=if_match
         )
-        await self.cache_repository.update_submenu(db_submenu)
-        return db_submenu
+        submenu = self.cache_repository.serialize_submenu(db_submenu)
+        await self.cache_repository.update_submenu(db_submenu, submenu)
+        return self._get_response(submenu)
 
     async def delete(self, menu_id: UUID, submenu_id: UUID) -> dict:
         deleted = await self.submenu_repository.delete(menu_id=menu_id, submenu_id=submenu_id)
         await self.cache_repository.delete_submenu(menu_id, submenu_id)
         return deleted
 
-    async def get_all_ids(self, menu_id: UUID) -> list[UUID]:
-        return await self.submenu_repository.get_all_ids(menu_id)
+    async def create_many(self, menu_id: UUID, submenus_data: list[SubmenuCreateSchema]) -> list[dict]:
+        db_submenus = await self.submenu_repository.create_many(menu_id, submenus_data)
+        if db_submenus:
+            await self.cache_repository.invalidate_submenus(menu_id, counts_changed=True)
+        return [{'id': db_submenu.id, 'status_code': 201, 'data': db_submenu} for db_submenu in db_submenus]
+
+    async def update_many(self, menu_id: UUID, submenus_data: list[SubmenuBatchUpdateSchema]) -> list[dict]:
+        db_submenus = await self.submenu_repository.update_many(menu_id, submenus_data)
+        if db_submenus:
+            await self.cache_repository.invalidate_submenus(menu_id, counts_changed=False)
+        db_submenus_by_id = {db_submenu.id: db_submenu for db_submenu in db_submenus}
+        return [
+            {'id': submenu_data.id, 'status_code': 200, 'data': db_submenus_by_id[submenu_data.id]}
+            if submenu_data.id in db_submenus_by_id
+            else {'id': submenu_data.id, 'status_code': 404, 'detail': self.submenu_repository.submenu_404_msg}
+            for submenu_data in submenus_data
+        ]
+
+    async def delete_many(self, menu_id: UUID, submenu_ids: list[UUID]) -> list[dict]:
+        deleted_ids = set(await self.submenu_repository.delete_many(menu_id, submenu_ids))
+        if deleted_ids:
+            await self.cache_repository.invalidate_submenus(menu_id, counts_changed=True)
+        return [
+            {'id': submenu_id, 'status_code': 200, 'detail': self.submenu_repository.submenu_200_deleted_msg}
+            if submenu_id in deleted_ids
+            else {'id': submenu_id, 'status_code': 404, 'detail': self.submenu_repository.submenu_404_msg}
+            for submenu_id in submenu_ids
+        ]
@@ -1,106 +1,182 @@
+import asyncio
 import os
+from collections.abc import Iterator
 from uuid import UUID
 
-import pandas as pd
 from fastapi import Depends, HTTPException
+from openpyxl import load_workbook
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from core.schemas.dish_schemas import DishCreateSchema, DishUpdateSchema
-from core.schemas.menu_schemas import MenuCreateSchema, MenuUpdateSchema
-from core.schemas.submenu_schemas import SubmenuCreateSchema, SubmenuUpdateSchema
-from core.services.dish_service import DishService
-from core.services.menu_service import MenuService
-from core.services.submenu_service import SubmenuService
+from core.configs.env_var import REDIS_HOST, REDIS_PORT
+from core.database.db import SQLALCHEMY_DATABASE_URL
+from core.models.models import get_fingerprint
+from core.repositories.cache.sync_repository import SyncCacheRepository
+from core.repositories.crud.sync_repository import SyncRepository
+from core.schemas.dish_schemas import DishCreateSchema
+from core.schemas.menu_schemas import MenuCreateSchema
+from core.schemas.submenu_schemas import SubmenuCreateSchema
+from core.tasks.warm_up import CacheWarmUp, get_cache_warm_up
 
 
 class TableSync:
     xlsx_path = os.path.join('core', 'admin', 'Menu.xlsx')
-    last_update_time = 0.0
+    columns_count = 6
 
     def __init__(
-        self, menu: MenuService = Depends(), submenu: SubmenuService = Depends(), dish: DishService = Depends()
+        self,
+        sync_repository: SyncRepository = Depends(),
+        cache_repository: SyncCacheRepository = Depends(),
+        cache_warm_up: CacheWarmUp = Depends(get_cache_warm_up),
     ):
-        self.data = pd.read_excel(self.xlsx_path, header=None, dtype=str)
-        self.menu = menu
-        self.submenu = submenu
-        self.dish = dish
-
-    async def _delete_dishes(self, menu_id: UUID, submenu_id: UUID, table_dishes_ids: set) -> None:
-        db_dishes_ids = await self.dish.get_all_ids(submenu_id)
-        dishes_ids_to_delete = set(db_dishes_ids) - table_dishes_ids
-        for dish_id_to_delete in dishes_ids_to_delete:
-            await self.dish.delete(menu_id, submenu_id, dish_id_to_delete)
-
-    async def _delete_submenus(self, menu_id: UUID, table_submenus_ids: set) -> None:
-        db_submenus_ids = await self.submenu.get_all_ids(menu_id)
-        submenus_ids_to_delete = set(db_submenus_ids) - table_submenus_ids
-        for submenu_id_to_delete in submenus_ids_to_delete:
-            await self.submenu.delete(menu_id, submenu_id_to_delete)
-
-    async def _delete_menus(self, table_menus_ids: set) -> None:
-        db_menus_ids = await self.menu.get_all_ids()
-        menus_ids_to_delete = set(db_menus_ids) - table_menus_ids
-        for menu_id_to_delete in menus_ids_to_delete:
-            await self.menu.delete(menu_id_to_delete)
+        self.sync_repository = sync_repository
+        self.cache_repository = cache_repository
+        self.cache_warm_up = cache_warm_up
 
-    async def sync_table(self) -> dict:
-        current_update_time = os.path.getmtime(self.xlsx_path)
-        if TableSync.last_update_time == current_update_time:
-            return {'status': False, 'message': 'no need to sync'}
-        table_menus_ids: set[UUID] = set()
-        table_submenus_ids: set[UUID] = set()
-        table_dishes_ids: set[UUID] = set()
-        zero_uuid = UUID('00000000-0000-0000-0000-000000000000')
-        menu_id = zero_uuid
-        submenu_id = zero_uuid
-        dish_id = zero_uuid
-
-        for _, row in self.data.iterrows():
-            if not pd.isna(row[0]):
-                await self._delete_submenus(menu_id, table_submenus_ids)
-                table_submenus_ids = set()
-                menu_id, menu_title, menu_description = UUID(row[0]), row[1], row[2]
-                table_menus_ids.add(menu_id)
-                menu_data = {'title': menu_title, 'description': menu_description}
-                try:
-                    await self.menu.update(menu_id, MenuUpdateSchema(**menu_data))
-                except HTTPException as exc:
-                    if exc.status_code == 404:
-                        await self.menu.create(MenuCreateSchema(id=menu_id, **menu_data))
-                    else:
-                        raise
-                continue
+    @staticmethod
+    def _add_row(rows: dict[UUID, dict], titles: set, row: dict, scope: UUID | None, id_msg: str, title_msg: str):
+        if row['id'] in rows:
+            raise HTTPException(status_code=409, detail=id_msg)
+        if (scope, row['title']) in titles:
+            raise HTTPException(status_code=409, detail=title_msg)
+        rows[row['id']] = row
+        titles.add((scope, row['title']))
+
+    def _get_table_version(self) -> str:
+        table_stat = os.stat(self.xlsx_path)
+        return f'{table_stat.st_mtime_ns}:{table_stat.st_size}'
+
+    def _iter_rows(self) -> Iterator[list[str | None]]:
+        workbook = load_workbook(self.xlsx_path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(max_col=self.columns_count, values_only=True):
+                values = [None if value is None else str(value) for value in row]
+                yield values + [None] * (self.columns_count - len(values))
+        finally:
+            workbook.close()
 
-            if not pd.isna(row[1]):
-                await self._delete_dishes(menu_id, submenu_id, table_dishes_ids)
-                table_dishes_ids = set()
-                submenu_id, submenu_title, submenu_description = UUID(row[1]), row[2], row[3]
-                table_submenus_ids.add(submenu_id)
-                submenu_data = {'title': submenu_title, 'description': submenu_description}
-                try:
-                    await self.submenu.update(menu_id, submenu_id, SubmenuUpdateSchema(**submenu_data))
-                except HTTPException as exc:
-                    if exc.status_code == 404:
-                        await self.submenu.create(menu_id, SubmenuCreateSchema(id=submenu_id, **submenu_data))
-                    else:
-                        raise
+    def _read_tree(self) -> tuple[dict[UUID, dict], dict[UUID, dict], dict[UUID, dict]]:
+        repo = self.sync_repository
+        menus: dict[UUID, dict] = {}
+        submenus: dict[UUID, dict] = {}
+        dishes: dict[UUID, dict] = {}
+        titles: set[tuple[UUID | None, str]] = set()
+        menu_id = None
+        submenu_id = None
+
+        for row in self._iter_rows():
+            if row[0] is not None:
+                menu = MenuCreateSchema(id=row[0], title=row[1], description=row[2]).model_dump()
+                self._add_row(menus, titles, menu, None, repo.menu_409_id_msg, repo.menu_409_title_msg)
+                menu_id = menu['id']
+                submenu_id = None
                 continue
 
-            if not pd.isna(row[2]):
-                dish_id, dish_title = UUID(row[2]), row[3]
-                dish_description, dish_price = row[4], row[5]
-                table_dishes_ids.add(dish_id)
-                dish_data = {'title': dish_title, 'description': dish_description, 'price': dish_price}
-                try:
-                    await self.dish.update(menu_id, submenu_id, dish_id, DishUpdateSchema(**dish_data))
-                except HTTPException as exc:
-                    if exc.status_code == 404:
-                        await self.dish.create(menu_id, submenu_id, DishCreateSchema(id=dish_id, **dish_data))
-                    else:
-                        raise
+            if row[1] is not None:
+                if menu_id is None:
+                    raise HTTPException(status_code=404, detail=repo.menu_404_msg)
+                submenu = SubmenuCreateSchema(id=row[1], title=row[2], description=row[3]).model_dump()
+                submenu['menu_id'] = menu_id
+                self._add_row(submenus, titles, submenu, menu_id, repo.submenu_409_id_msg, repo.submenu_409_title_msg)
+                submenu_id = submenu['id']
                 continue
 
-        await self._delete_menus(table_menus_ids)
-        await self._delete_submenus(menu_id, table_submenus_ids)
-        await self._delete_dishes(menu_id, submenu_id, table_dishes_ids)
-        TableSync.last_update_time = current_update_time
+            if row[2] is not None:
+                if submenu_id is None:
+                    raise HTTPException(status_code=404, detail=repo.submenu_404_msg)
+                dish = DishCreateSchema(id=row[2], title=row[3], description=row[4], price=row[5]).model_dump()
+                dish['submenu_id'] = submenu_id
+                self._add_row(dishes, titles, dish, submenu_id, repo.dish_409_id_msg, repo.dish_409_title_msg)
+
+        return menus, submenus, dishes
+
+    @staticmethod
+    def _is_changed(row: dict, db_row: dict) -> bool:
+        fingerprint = get_fingerprint(*[row[name] for name in ('title', 'description', 'price') if name in row])
+        if fingerprint != db_row['fingerprint']:
+            return True
+        return any(row[name] != value for name, value in db_row.items() if name != 'fingerprint')
+
+    def _get_diff(
+        self, table_rows: dict[UUID, dict], db_rows: dict[UUID, dict]
+    ) -> tuple[list[dict], list[dict], list[UUID]]:
+        to_insert = [row for id, row in table_rows.items() if id not in db_rows]
+        to_update = [row for id, row in table_rows.items() if id in db_rows and self._is_changed(row, db_rows[id])]
+        to_delete = [id for id in db_rows if id not in table_rows]
+        return to_insert, to_update, to_delete
+
+    @staticmethod
+    def _get_changed_ids(diff: tuple[list[dict], list[dict], list[UUID]]) -> set[UUID]:
+        to_insert, to_update, to_delete = diff
+        return {row['id'] for row in to_insert + to_update} | set(to_delete)
+
+    async def _sync_cache(self, table_tree: tuple, db_tree: tuple, diffs: tuple) -> None:
+        table_menus, table_submenus, table_dishes = table_tree
+        db_menus, db_submenus, db_dishes = db_tree
+        menus_diff, submenus_diff, dishes_diff = diffs
+
+        touched_menus = self._get_changed_ids(menus_diff)
+        touched_submenus: set[tuple[UUID, UUID]] = set()
+        touched_dishes: set[tuple[UUID, UUID, UUID]] = set()
+        for submenu_id in self._get_changed_ids(submenus_diff):
+            for submenus in (table_submenus, db_submenus):
+                if submenu_id in submenus:
+                    menu_id = submenus[submenu_id]['menu_id']
+                    touched_menus.add(menu_id)
+                    touched_submenus.add((menu_id, submenu_id))
+        for dish_id in self._get_changed_ids(dishes_diff):
+            for dishes, submenus in ((table_dishes, table_submenus), (db_dishes, db_submenus)):
+                if dish_id in dishes:
+                    submenu_id = dishes[dish_id]['submenu_id']
+                    menu_id = submenus[submenu_id]['menu_id']
+                    touched_menus.add(menu_id)
+                    touched_submenus.add((menu_id, submenu_id))
+                    touched_dishes.add((menu_id, submenu_id, dish_id))
+
+        await self.cache_repository.sync_tree(
+            menus=touched_menus,
+            submenus=touched_submenus,
+            dishes=touched_dishes,
+            deleted_menus=set(menus_diff[2]),
+            deleted_submenus=set(submenus_diff[2]),
+        )
+
+    async def sync_table(self) -> dict:
+        table_version = self._get_table_version()
+        if await self.cache_repository.get_table_version() == table_version:
+            return {'status': False, 'message': 'no need to sync'}
+        lock = await self.cache_repository.acquire_lock()
+        if lock is None:
+            return {'status': False, 'message': 'sync is already running'}
+        lock_keeper = asyncio.create_task(self.cache_repository.keep_lock(lock))
+        try:
+            if await self.cache_repository.get_table_version() == table_version:
+                return {'status': False, 'message': 'no need to sync'}
+            table_tree = await asyncio.to_thread(self._read_tree)
+            db_tree = await self.sync_repository.get_tree()
+            diffs = tuple(self._get_diff(table_rows, db_rows) for table_rows, db_rows in zip(table_tree, db_tree))
+            await self.sync_repository.apply(*diffs)
+            await self._sync_cache(table_tree, db_tree, diffs)
+            await self.cache_repository.set_table_version(table_version)
+        finally:
+            lock_keeper.cancel()
+            await self.cache_repository.release_lock(lock)
+        await self.cache_warm_up.warm_up()
         return {'status': True, 'message': 'success'}
+
+
+async def run_table_sync() -> dict:
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    redis = aioredis.Redis(host=REDIS_HOST, port=int(REDIS_PORT), decode_responses=True)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            table = TableSync(SyncRepository(session), SyncCacheRepository(redis), CacheWarmUp(session_factory, redis))
+            return await table.sync_table()
+    except HTTPException as exc:
+        return {'status': False, 'message': exc.detail}
+    finally:
+        await redis.close()
+        await engine.dispose()
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from uuid import UUID
+
+from fastapi import BackgroundTasks, Depends, HTTPException
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from core.configs.env_var import CACHE_WARM_UP_CONCURRENCY
+from core.database.db import ReadSession, SessionLocal
+from core.database.redis_db import get_redis
+from core.repositories.cache.dish_repository import DishCacheRepository
+from core.repositories.cache.full_menu_repository import FullMenuCacheRepository
+from core.repositories.cache.menu_repository import MenuCacheRepository
+from core.repositories.cache.submenu_repository import SubmenuCacheRepository
+from core.repositories.crud.dish_repository import DishRepository
+from core.repositories.crud.full_menu_repository import FullMenuRepository
+from core.repositories.crud.menu_repository import MenuRepository
+from core.repositories.crud.submenu_repository import SubmenuRepository
+from core.services.dish_service import DishService
+from core.services.full_menu_service import FullMenuService
+from core.services.menu_service import MenuService
+from core.services.submenu_service import SubmenuService
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmUp:
+    def __init__(
+        self, session_factory: sessionmaker, redis: aioredis.Redis, concurrency: int = CACHE_WARM_UP_CONCURRENCY
+    ):
+        self.session_factory = session_factory
+        self.redis = redis
+        self.concurrency = concurrency
+
+    async def _warm_up_full_menu(self, db: AsyncSession, background_tasks: BackgroundTasks) -> None:
+        cache_repository = FullMenuCacheRepository(background_tasks, self.redis)
+        await FullMenuService(cache_repository, FullMenuRepository(ReadSession(self.redis, db))).warm_up()
+
+    async def _warm_up_menus(self, db: AsyncSession, background_tasks: BackgroundTasks) -> None:
+        cache_repository = MenuCacheRepository(background_tasks, self.redis)
+        await MenuService(cache_repository, MenuRepository(db, ReadSession(self.redis, db))).get_all()
+
+    async def _warm_up_submenus(self, menu_id: UUID, db: AsyncSession, background_tasks: BackgroundTasks) -> None:
+        cache_repository = SubmenuCacheRepository(background_tasks, self.redis)
+        await SubmenuService(cache_repository, SubmenuRepository(db, ReadSession(self.redis, db))).get_all(menu_id)
+
+    async def _warm_up_dishes(
+        self, menu_id: UUID, submenu_id: UUID, db: AsyncSession, background_tasks: BackgroundTasks
+    ) -> None:
+        cache_repository = DishCacheRepository(background_tasks, self.redis)
+        dish_repository = DishRepository(db, ReadSession(self.redis, db))
+        await DishService(cache_repository, dish_repository).get_all(menu_id, submenu_id)
+
+    async def _run(
+        self,
+        semaphore: asyncio.Semaphore,
+        warm_up_entry: Callable[[AsyncSession, BackgroundTasks], Awaitable[None]],
+    ) -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            background_tasks = BackgroundTasks()
+            async with self.session_factory() as db:
+                try:
+                    await warm_up_entry(db, background_tasks)
+                    await background_tasks()
+                except HTTPException:
+                    pass
+            return time.perf_counter() - start
+
+    async def warm_up(self) -> dict:
+        start = time.perf_counter()
+        async with self.session_factory() as db:
+            read_db = ReadSession(self.redis, db)
+            menu_ids = await MenuRepository(db, read_db).get_all_ids()
+            submenu_ids = await SubmenuRepository(db, read_db).get_all_ids()
+        entries: list[Callable[[AsyncSession, BackgroundTasks], Awaitable[None]]] = [
+            self._warm_up_full_menu,
+            self._warm_up_menus,
+            *[partial(self._warm_up_submenus, menu_id) for menu_id in menu_ids],
+            *[partial(self._warm_up_dishes, menu_id, submenu_id) for menu_id, submenu_id in submenu_ids],
+        ]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timings = await asyncio.gather(*[self._run(semaphore, entry) for entry in entries])
+        stats = {
+            'entries': len(timings),
+            'elapsed_sec': round(time.perf_counter() - start, 6),
+            'max_entry_sec': round(max(timings), 6),
+        }
+        logger.info('Cache warm-up: %(entries)s entries in %(elapsed_sec)s s, slowest %(max_entry_sec)s s', stats)
+        return stats
+
+
+def get_cache_warm_up(redis: aioredis.Redis = Depends(get_redis)) -> CacheWarmUp:
+    return CacheWarmUp(SessionLocal, redis)
@@ -0,0 +1,32 @@
+"""content fingerprints
+
+Revision ID: 9c2f4e6a1b3d
+Revises: 4db770efe029
+Create Date: 2026-10-18 12:40:11.204518
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9c2f4e6a1b3d'
+down_revision = '4db770efe029'
+branch_labels = None
+depends_on = None
+
+
+def fingerprint(*columns: str) -> sa.Computed:
+    expression = " || E'\\x1f' || ".join(f"coalesce({column}::text, '')" for column in columns)
+    return sa.Computed(f'md5({expression})', persisted=True)
+
+
+def upgrade() -> None:
+    op.add_column('menus', sa.Column('fingerprint', sa.String(), fingerprint('title', 'description')))
+    op.add_column('submenus', sa.Column('fingerprint', sa.String(), fingerprint('title', 'description')))
+    op.add_column('dishes', sa.Column('fingerprint', sa.String(), fingerprint('title', 'description', 'price')))
+
+
+def downgrade() -> None:
+    op.drop_column('dishes', 'fingerprint')
+    op.drop_column('submenus', 'fingerprint')
+    op.drop_column('menus', 'fingerprint')
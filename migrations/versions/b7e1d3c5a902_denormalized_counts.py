@@ -0,0 +1,129 @@
+"""denormalized counts
+
+Revision ID: b7e1d3c5a902
+Revises: 9c2f4e6a1b3d
+Create Date: 2026-10-18 13:02:47.318260
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1d3c5a902'
+down_revision = '9c2f4e6a1b3d'
+branch_labels = None
+depends_on = None
+
+COUNT_DISHES_FUNCTION = """
+CREATE FUNCTION count_dishes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE submenus SET dishes_count = submenus.dishes_count + delta.dishes_count
+        FROM (SELECT submenu_id, count(*) AS dishes_count FROM new_table GROUP BY submenu_id) AS delta
+        WHERE submenus.id = delta.submenu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE submenus SET dishes_count = submenus.dishes_count - delta.dishes_count
+        FROM (SELECT submenu_id, count(*) AS dishes_count FROM old_table GROUP BY submenu_id) AS delta
+        WHERE submenus.id = delta.submenu_id;
+    ELSE
+        UPDATE submenus SET dishes_count = submenus.dishes_count + delta.dishes_count
+        FROM (
+            SELECT submenu_id, sum(dishes_count) AS dishes_count FROM (
+                SELECT submenu_id, 1 AS dishes_count FROM new_table
+                UNION ALL
+                SELECT submenu_id, -1 FROM old_table
+            ) AS moves GROUP BY submenu_id
+        ) AS delta
+        WHERE submenus.id = delta.submenu_id AND delta.dishes_count <> 0;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+COUNT_SUBMENUS_FUNCTION = """
+CREATE FUNCTION count_submenus() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE menus
+        SET submenus_count = menus.submenus_count + delta.submenus_count,
+            dishes_count = menus.dishes_count + delta.dishes_count
+        FROM (
+            SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count
+            FROM new_table GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE menus
+        SET submenus_count = menus.submenus_count - delta.submenus_count,
+            dishes_count = menus.dishes_count - delta.dishes_count
+        FROM (
+            SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count
+            FROM old_table GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id;
+    ELSE
+        UPDATE menus
+        SET submenus_count = menus.submenus_count + delta.submenus_count,
+            dishes_count = menus.dishes_count + delta.dishes_count
+        FROM (
+            SELECT menu_id, sum(submenus_count) AS submenus_count, sum(dishes_count) AS dishes_count FROM (
+                SELECT menu_id, 1 AS submenus_count, dishes_count FROM new_table
+                UNION ALL
+                SELECT menu_id, -1, -dishes_count FROM old_table
+            ) AS moves GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id AND (delta.submenus_count <> 0 OR delta.dishes_count <> 0);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = {
+    'dishes': 'count_dishes',
+    'submenus': 'count_submenus',
+}
+
+TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_table',
+    'DELETE': 'OLD TABLE AS old_table',
+    'UPDATE': 'NEW TABLE AS new_table OLD TABLE AS old_table',
+}
+
+
+def upgrade() -> None:
+    op.add_column('menus', sa.Column('submenus_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('menus', sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('submenus', sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        'UPDATE submenus SET dishes_count = counts.dishes_count '
+        'FROM (SELECT submenu_id, count(*) AS dishes_count FROM dishes GROUP BY submenu_id) AS counts '
+        'WHERE submenus.id = counts.submenu_id'
+    )
+    op.execute(
+        'UPDATE menus SET submenus_count = counts.submenus_count, dishes_count = counts.dishes_count '
+        'FROM (SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count '
+        'FROM submenus GROUP BY menu_id) AS counts '
+        'WHERE menus.id = counts.menu_id'
+    )
+
+    op.execute(COUNT_DISHES_FUNCTION)
+    op.execute(COUNT_SUBMENUS_FUNCTION)
+    for table, function in TRIGGERS.items():
+        for event, transition_tables in TRANSITION_TABLES.items():
+            op.execute(
+                f'CREATE TRIGGER {table}_{event.lower()}_count AFTER {event} ON {table} '
+                f'REFERENCING {transition_tables} FOR EACH STATEMENT EXECUTE FUNCTION {function}()'
+            )
+
+
+def downgrade() -> None:
+    for table, function in TRIGGERS.items():
+        for event in TRANSITION_TABLES:
+            op.execute(f'DROP TRIGGER {table}_{event.lower()}_count ON {table}')
+        op.execute(f'DROP FUNCTION {function}()')
+    op.drop_column('submenus', 'dishes_count')
+    op.drop_column('menus', 'dishes_count')
+    op.drop_column('menus', 'submenus_count')
@@ -0,0 +1,27 @@
+"""row versions
+
+Revision ID: e4a8c2f1d6b0
+Revises: b7e1d3c5a902
+Create Date: 2026-10-18 13:41:05.872913
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8c2f1d6b0'
+down_revision = 'b7e1d3c5a902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('menus', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('submenus', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('dishes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('dishes', 'version')
+    op.drop_column('submenus', 'version')
+    op.drop_column('menus', 'version')
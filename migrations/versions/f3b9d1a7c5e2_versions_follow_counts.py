@@ -0,0 +1,90 @@
+"""versions follow counts
+
+Revision ID: f3b9d1a7c5e2
+Revises: e4a8c2f1d6b0
+Create Date: 2026-10-18 14:20:11.604318
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d1a7c5e2'
+down_revision = 'e4a8c2f1d6b0'
+branch_labels = None
+depends_on = None
+
+COUNT_DISHES_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_dishes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE submenus SET dishes_count = submenus.dishes_count + delta.dishes_count<submenus_version>
+        FROM (SELECT submenu_id, count(*) AS dishes_count FROM new_table GROUP BY submenu_id) AS delta
+        WHERE submenus.id = delta.submenu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE submenus SET dishes_count = submenus.dishes_count - delta.dishes_count<submenus_version>
+        FROM (SELECT submenu_id, count(*) AS dishes_count FROM old_table GROUP BY submenu_id) AS delta
+        WHERE submenus.id = delta.submenu_id;
+    ELSE
+        UPDATE submenus SET dishes_count = submenus.dishes_count + delta.dishes_count<submenus_version>
+        FROM (
+            SELECT submenu_id, sum(dishes_count) AS dishes_count FROM (
+                SELECT submenu_id, 1 AS dishes_count FROM new_table
+                UNION ALL
+                SELECT submenu_id, -1 FROM old_table
+            ) AS moves GROUP BY submenu_id
+        ) AS delta
+        WHERE submenus.id = delta.submenu_id AND delta.dishes_count <> 0;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+COUNT_SUBMENUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_submenus() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE menus
+        SET submenus_count = menus.submenus_count + delta.submenus_count,
+            dishes_count = menus.dishes_count + delta.dishes_count<menus_version>
+        FROM (
+            SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count
+            FROM new_table GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE menus
+        SET submenus_count = menus.submenus_count - delta.submenus_count,
+            dishes_count = menus.dishes_count - delta.dishes_count<menus_version>
+        FROM (
+            SELECT menu_id, count(*) AS submenus_count, sum(dishes_count) AS dishes_count
+            FROM old_table GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id;
+    ELSE
+        UPDATE menus
+        SET submenus_count = menus.submenus_count + delta.submenus_count,
+            dishes_count = menus.dishes_count + delta.dishes_count<menus_version>
+        FROM (
+            SELECT menu_id, sum(submenus_count) AS submenus_count, sum(dishes_count) AS dishes_count FROM (
+                SELECT menu_id, 1 AS submenus_count, dishes_count FROM new_table
+                UNION ALL
+                SELECT menu_id, -1, -dishes_count FROM old_table
+            ) AS moves GROUP BY menu_id
+        ) AS delta
+        WHERE menus.id = delta.menu_id AND (delta.submenus_count <> 0 OR delta.dishes_count <> 0);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(COUNT_DISHES_FUNCTION.replace('<submenus_version>', ', version = submenus.version + 1'))
+    op.execute(COUNT_SUBMENUS_FUNCTION.replace('<menus_version>', ',\n            version = menus.version + 1'))
+
+
+def downgrade() -> None:
+    op.execute(COUNT_DISHES_FUNCTION.replace('<submenus_version>', ''))
+    op.execute(COUNT_SUBMENUS_FUNCTION.replace('<menus_version>', ''))
@@ -2,7 +2,10 @@ import asyncio
 
 import pytest_asyncio
 from httpx import AsyncClient
+from redis.asyncio.connection import Connection
+from sqlalchemy import event
 
+from core.database.db import engine, replica_engine
 from core.main import app
 
 
@@ -24,6 +27,8 @@ class MenuValueStorage:
     title: None | str = None
     description: None | str = None
 
+    id2: None | str = None
+
 
 class SubmenuValueStorage:
     id: None | str = None
@@ -46,3 +51,31 @@ class DishValueStorage:
     title2: None | str = None
     description2: None | str = None
     price2: float = 0
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+        self.redis_commands: list[str] = []
+        self.engines = {engine.sync_engine, replica_engine.sync_engine}
+        self.pack_command = Connection.pack_command
+
+    def __enter__(self) -> 'QueryCounter':
+        for sync_engine in self.engines:
+            event.listen(sync_engine, 'before_cursor_execute', self._count_statement)
+        counter = self
+
+        def pack_command(connection: Connection, *args):
+            counter.redis_commands.append(str(args[0]))
+            return counter.pack_command(connection, *args)
+
+        setattr(Connection, 'pack_command', pack_command)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        setattr(Connection, 'pack_command', self.pack_command)
+        for sync_engine in self.engines:
+            event.remove(sync_engine, 'before_cursor_execute', self._count_statement)
+
+    def _count_statement(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
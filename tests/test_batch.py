@@ -0,0 +1,152 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import DishValueStorage, MenuValueStorage, SubmenuValueStorage
+
+MISSING_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def submenus_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}/submenus'
+
+
+def dishes_url() -> str:
+    return f'{submenus_url()}/{SubmenuValueStorage.id}/dishes'
+
+
+class TestBatch:
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_create_submenus(self, client: AsyncClient):
+        response = await client.post(
+            f'{submenus_url()}:batch',
+            json=[{'title': 'Submenu title 1', 'description': ''}, {'title': 'Submenu title 2', 'description': ''}],
+        )
+        assert response.status_code == 201, response.text
+        assert [item['status_code'] for item in response.json()] == [201, 201]
+        assert [item['data']['title'] for item in response.json()] == ['Submenu title 1', 'Submenu title 2']
+        SubmenuValueStorage.id = response.json()[0]['id']
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.json()['submenus_count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_create_dishes(self, client: AsyncClient):
+        await client.get(dishes_url())
+        response = await client.post(
+            f'{dishes_url()}:batch',
+            json=[{'title': f'Dish title {i}', 'description': '', 'price': '1.5'} for i in range(3)],
+        )
+        assert response.status_code == 201, response.text
+        assert [item['data']['price'] for item in response.json()] == ['1.50'] * 3
+        DishValueStorage.id, DishValueStorage.id1, DishValueStorage.id2 = [item['id'] for item in response.json()]
+        response = await client.get(dishes_url())
+        assert len(response.json()) == 3
+        response = await client.get(f'{submenus_url()}/{SubmenuValueStorage.id}')
+        assert response.json()['dishes_count'] == 3
+
+    @pytest.mark.asyncio
+    async def test_create_dishes_with_duplicate_title(self, client: AsyncClient):
+        response = await client.post(
+            f'{dishes_url()}:batch',
+            json=[
+                {'title': 'Dish title 3', 'description': '', 'price': '1.5'},
+                {'title': 'Dish title 0', 'description': '', 'price': '1.5'},
+            ],
+        )
+        assert response.status_code == 409, response.text
+        assert response.json() == {'detail': 'Another dish with this title already exists in the submenu.'}
+        response = await client.get(dishes_url())
+        assert len(response.json()) == 3
+
+    @pytest.mark.asyncio
+    async def test_create_dishes_in_missing_submenu(self, client: AsyncClient):
+        response = await client.post(
+            f'{submenus_url()}/{MISSING_ID}/dishes:batch', json=[{'title': 'Dish', 'description': '', 'price': '1'}]
+        )
+        assert response.status_code == 404, response.text
+        assert response.json() == {'detail': 'submenu not found'}
+
+    @pytest.mark.asyncio
+    async def test_update_dishes(self, client: AsyncClient):
+        response = await client.patch(
+            f'{dishes_url()}:batch',
+            json=[
+                {'id': DishValueStorage.id1, 'title': 'Dish title 1', 'description': '', 'price': '2'},
+                {'id': MISSING_ID, 'title': 'Dish title 9', 'description': '', 'price': '2'},
+                {'id': DishValueStorage.id2, 'title': 'Dish title 2', 'description': '', 'price': '3'},
+            ],
+        )
+        assert response.status_code == 200, response.text
+        assert response.json() == [
+            {
+                'id': DishValueStorage.id1,
+                'status_code': 200,
+                'data': {
+                    'id': DishValueStorage.id1,
+                    'title': 'Dish title 1',
+                    'description': '',
+                    'price': '2.00',
+                    'submenu_id': SubmenuValueStorage.id,
+                },
+            },
+            {'id': MISSING_ID, 'status_code': 404, 'detail': 'dish not found'},
+            {
+                'id': DishValueStorage.id2,
+                'status_code': 200,
+                'data': {
+                    'id': DishValueStorage.id2,
+                    'title': 'Dish title 2',
+                    'description': '',
+                    'price': '3.00',
+                    'submenu_id': SubmenuValueStorage.id,
+                },
+            },
+        ]
+        response = await client.get(dishes_url())
+        assert sorted(dish['price'] for dish in response.json()) == ['1.50', '2.00', '3.00']
+
+    @pytest.mark.asyncio
+    async def test_delete_dishes(self, client: AsyncClient):
+        response = await client.request(
+            'DELETE', f'{dishes_url()}:batch', json=[DishValueStorage.id, DishValueStorage.id1, MISSING_ID]
+        )
+        assert response.status_code == 200, response.text
+        assert [item['status_code'] for item in response.json()] == [200, 200, 404]
+        response = await client.get(dishes_url())
+        assert [dish['id'] for dish in response.json()] == [DishValueStorage.id2]
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.json()['dishes_count'] == 1
+
+    @pytest.mark.asyncio
+    async def test_update_submenus(self, client: AsyncClient):
+        response = await client.patch(
+            f'{submenus_url()}:batch',
+            json=[{'id': SubmenuValueStorage.id, 'title': 'Updated submenu title 1', 'description': ''}],
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()[0]['data']['dishes_count'] == 1
+        response = await client.get(f'{submenus_url()}/{SubmenuValueStorage.id}')
+        assert response.json()['title'] == 'Updated submenu title 1'
+
+    @pytest.mark.asyncio
+    async def test_delete_submenus(self, client: AsyncClient):
+        response = await client.request('DELETE', f'{submenus_url()}:batch', json=[SubmenuValueStorage.id])
+        assert response.status_code == 200, response.text
+        assert response.json() == [
+            {'id': SubmenuValueStorage.id, 'status_code': 200, 'detail': 'The submenu has been deleted'}
+        ]
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.json()['submenus_count'] == 1
+        assert response.json()['dishes_count'] == 0
+        response = await client.get(dishes_url())
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+from redis import asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from core.configs.env_var import REDIS_HOST
+from core.database.circuit_breaker import CircuitBreaker
+from core.database.redis_db import (
+    InstrumentedConnectionPool,
+    circuit_breaker,
+    get_redis,
+)
+from core.main import app
+from core.repositories.cache.local_cache import local_cache
+from core.repositories.cache.menu_repository import MenuCacheRepository
+from tests.conftest import MenuValueStorage, SubmenuValueStorage
+
+down_pool = InstrumentedConnectionPool(host=REDIS_HOST, port=1, decode_responses=True)
+
+
+def get_down_redis() -> aioredis.Redis:
+    return aioredis.Redis(connection_pool=down_pool)
+
+
+def open_circuit_breaker(missed: str) -> None:
+    circuit_breaker.close()
+    for _ in range(circuit_breaker.failure_threshold):
+        circuit_breaker.record_failure()
+    circuit_breaker.record_missed([missed])
+    circuit_breaker.retry_at = 0
+
+
+def menu_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}'
+
+
+class TestCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_backoff(self):
+        breaker = CircuitBreaker(2, 0.01, 0.03)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == breaker.open
+        assert not breaker.allow_request()
+        await asyncio.sleep(0.01)
+        assert breaker.allow_request()
+        assert breaker.state == breaker.half_open
+        assert not breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.backoff_sec == 0.02
+        await asyncio.sleep(0.02)
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.backoff_sec == 0.03
+        breaker.close()
+        assert breaker.allow_request()
+        assert breaker.backoff_sec == 0.01
+
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(f'{menu_url()}/submenus', json={'title': 'Submenu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+        await client.get(menu_url())
+        await client.get(f'{menu_url()}/submenus')
+        await get_redis().set('circuit_breaker:untouched', 1)
+
+    @pytest.mark.asyncio
+    async def test_skip_cache_while_open(self, client: AsyncClient):
+        app.dependency_overrides[get_redis] = get_down_redis
+        local_cache.clear()
+        response = await client.get(menu_url())
+        assert response.status_code == 200, response.text
+        assert circuit_breaker.state == circuit_breaker.open
+        checkouts = down_pool.stats.checkouts
+        for _ in range(5):
+            response = await client.get(menu_url())
+            assert response.json()['title'] == 'Menu title 1'
+        assert down_pool.stats.checkouts == checkouts
+        response = await client.get('/api/v1/admin/pools')
+        assert response.json()['circuit_breaker']['state'] == 'open'
+
+    @pytest.mark.asyncio
+    async def test_write_while_open(self, client: AsyncClient):
+        response = await client.patch(menu_url(), json={'title': 'Menu title 2', 'description': ''})
+        assert response.status_code == 200, response.text
+        response = await client.patch(
+            f'{menu_url()}/submenus/{SubmenuValueStorage.id}', json={'title': 'Submenu title 2', 'description': ''}
+        )
+        assert response.status_code == 200, response.text
+        response = await client.get(menu_url())
+        assert response.json()['title'] == 'Menu title 2'
+        assert circuit_breaker.get_stats()['missed_invalidations'] >= 2
+
+    @pytest.mark.asyncio
+    async def test_recover(self, client: AsyncClient):
+        app.dependency_overrides.pop(get_redis)
+        circuit_breaker.retry_at = 0
+        response = await client.get(menu_url())
+        assert response.json()['title'] == 'Menu title 2'
+        response = await client.get(f'{menu_url()}/submenus')
+        assert [submenu['title'] for submenu in response.json()] == ['Submenu title 2']
+        assert circuit_breaker.get_stats()['state'] == 'closed'
+        assert circuit_breaker.get_stats()['missed_invalidations'] == 0
+        assert await get_redis().delete('circuit_breaker:untouched') == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self, monkeypatch):
+        cache = MenuCacheRepository(BackgroundTasks(), get_redis())
+        missed = f'menu_{MenuValueStorage.id}'
+
+        async def fail(*args):
+            raise ResponseError('READONLY You can\'t write against a read only replica.')
+
+        monkeypatch.setattr(cache, '_invalidate_redis', fail)
+        open_circuit_breaker(missed)
+        with pytest.raises(ResponseError):
+            await cache.get_menu(MenuValueStorage.id)
+        assert circuit_breaker.state == circuit_breaker.open
+        assert circuit_breaker.missed == {missed}
+
+        async def hang(*args):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(cache, '_invalidate_redis', hang)
+        circuit_breaker.retry_at = 0
+        probe = asyncio.create_task(cache.get_menu(MenuValueStorage.id))
+        await asyncio.sleep(0.01)
+        assert circuit_breaker.state == circuit_breaker.half_open
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert circuit_breaker.state == circuit_breaker.open
+        assert circuit_breaker.missed == {missed}
+
+        monkeypatch.undo()
+        circuit_breaker.retry_at = 0
+        await cache.get_menu(MenuValueStorage.id)
+        assert circuit_breaker.state == circuit_breaker.closed
+        assert circuit_breaker.missed == set()
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        app.dependency_overrides.pop(get_redis, None)
+        circuit_breaker.close()
+        response = await client.delete(menu_url())
+        assert response.status_code == 200, response.text
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import MenuValueStorage, SubmenuValueStorage
+
+
+def dishes_url(menu_id: str | None = None) -> str:
+    return f'/api/v1/menus/{menu_id or MenuValueStorage.id}/submenus/{SubmenuValueStorage.id}/dishes'
+
+
+class TestConcurrentCreate:
+    @pytest.mark.asyncio
+    async def test_create_menu_and_submenu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus', json={'title': 'Submenu title 1', 'description': ''}
+        )
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_create_same_title_concurrently(self, client: AsyncClient):
+        responses = await asyncio.gather(
+            *[
+                client.post(dishes_url(), json={'title': 'Dish title', 'description': '', 'price': '1.5'})
+                for _ in range(20)
+            ]
+        )
+        assert sorted(response.status_code for response in responses) == [201] + [409] * 19
+        assert {response.json().get('detail') for response in responses if response.status_code == 409} == {
+            'Another dish with this title already exists in the submenu.'
+        }
+        response = await client.get(dishes_url())
+        assert [dish['title'] for dish in response.json()] == ['Dish title']
+
+    @pytest.mark.asyncio
+    async def test_create_distinct_titles_concurrently(self, client: AsyncClient):
+        responses = await asyncio.gather(
+            *[
+                client.post(dishes_url(), json={'title': f'Dish title {i}', 'description': '', 'price': '1.5'})
+                for i in range(20)
+            ]
+        )
+        assert [response.status_code for response in responses] == [201] * 20
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.json()['submenus_count'] == 1
+        assert response.json()['dishes_count'] == 21
+
+    @pytest.mark.asyncio
+    async def test_create_with_existing_id(self, client: AsyncClient):
+        response = await client.post(
+            '/api/v1/menus', json={'id': MenuValueStorage.id, 'title': 'Menu title 2', 'description': ''}
+        )
+        assert response.status_code == 409, response.text
+        assert response.json() == {'detail': 'Another menu with this id already exists.'}
+
+    @pytest.mark.asyncio
+    async def test_create_in_missing_parent(self, client: AsyncClient):
+        menu_id = '00000000-0000-0000-0000-000000000000'
+        response = await client.post(f'/api/v1/menus/{menu_id}/submenus', json={'title': 'Submenu', 'description': ''})
+        assert response.status_code == 404, response.text
+        assert response.json() == {'detail': 'menu not found'}
+        response = await client.post(dishes_url(menu_id), json={'title': 'Dish', 'description': '', 'price': '1.5'})
+        assert response.status_code == 404, response.text
+        assert response.json() == {'detail': 'submenu not found'}
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/menus')
+        assert response.json() == []
@@ -0,0 +1,75 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import DishValueStorage, MenuValueStorage, SubmenuValueStorage
+
+
+def menu_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}'
+
+
+def dishes_url() -> str:
+    return f'{menu_url()}/submenus/{SubmenuValueStorage.id}/dishes'
+
+
+class TestConditionalGet:
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(f'{menu_url()}/submenus', json={'title': 'Submenu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+        response = await client.post(dishes_url(), json={'title': 'Dish title 1', 'description': '', 'price': '1.5'})
+        assert response.status_code == 201, response.text
+        DishValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'url',
+        [
+            lambda: '/api/v1/menus',
+            lambda: '/api/v1/menus?limit=1',
+            lambda: menu_url(),
+            lambda: f'{menu_url()}/submenus',
+            lambda: f'{menu_url()}/submenus/{SubmenuValueStorage.id}',
+            lambda: dishes_url(),
+            lambda: f'{dishes_url()}?limit=1',
+            lambda: f'{dishes_url()}/{DishValueStorage.id}',
+            lambda: '/api/v1/full_menu',
+        ],
+    )
+    async def test_not_modified(self, client: AsyncClient, url):
+        await client.get(url())
+        response = await client.get(url())
+        assert response.status_code == 200, response.text
+        assert response.headers['Cache-Control'] == 'no-cache'
+        etag = response.headers['ETag']
+        response = await client.get(url(), headers={'If-None-Match': etag})
+        assert response.status_code == 304, response.text
+        assert response.content == b''
+        assert response.headers['ETag'] == etag
+        response = await client.get(url(), headers={'If-None-Match': f'"other", W/{etag}'})
+        assert response.status_code == 304, response.text
+        response = await client.get(url(), headers={'If-None-Match': '"other"'})
+        assert response.status_code == 200, response.text
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_with_counts(self, client: AsyncClient):
+        menus = await client.get('/api/v1/menus')
+        menu = await client.get(menu_url())
+        full_menu = await client.get('/api/v1/full_menu')
+        response = await client.post(dishes_url(), json={'title': 'Dish title 2', 'description': '', 'price': '2.5'})
+        assert response.status_code == 201, response.text
+        for url, previous in [('/api/v1/menus', menus), (menu_url(), menu), ('/api/v1/full_menu', full_menu)]:
+            response = await client.get(url, headers={'If-None-Match': previous.headers['ETag']})
+            assert response.status_code == 200, response.text
+            assert response.headers.get('ETag') != previous.headers['ETag']
+        response = await client.get(menu_url())
+        assert response.json()['dishes_count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(menu_url())
+        assert response.status_code == 200, response.text
@@ -0,0 +1,75 @@
+import gzip
+
+import pytest
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.local_cache import local_cache
+from tests.conftest import MenuValueStorage
+
+
+async def get_cached_gzip_full_menu() -> bytes | None:
+    cached_full_menu = await get_redis().execute_command('GET', 'full_menu_gzip', NEVER_DECODE=True)
+    return cached_full_menu and cached_full_menu.split(b'\n', 2)[2]
+
+
+class TestFullMenuCompression:
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': 'x' * 1000})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_get_compressed_full_menu(self, client: AsyncClient):
+        await client.get('/api/v1/full_menu')
+        plain = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'identity'})
+        assert plain.status_code == 200, plain.text
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.headers['Vary'] == 'Accept-Encoding'
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'br;q=0, gzip;q=0.5'})
+        assert response.status_code == 200, response.text
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+        assert response.json() == plain.json()
+        assert response.num_bytes_downloaded < plain.num_bytes_downloaded
+        cached_full_menu = await get_cached_gzip_full_menu()
+        assert cached_full_menu is not None
+        assert gzip.decompress(cached_full_menu) == plain.content
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client: AsyncClient):
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'gzip'})
+        etag = response.headers['ETag']
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert response.status_code == 304, response.text
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+        assert response.status_code == 200, response.text
+
+    @pytest.mark.asyncio
+    async def test_refresh_stale_variant(self, client: AsyncClient):
+        local_cache.clear()
+        cached_full_menu = await get_redis().execute_command('GET', 'full_menu_gzip', NEVER_DECODE=True)
+        _, body = cached_full_menu.split(b'\n', 1)
+        await get_redis().set('full_menu_gzip', b'0 0 1\n' + body)
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200, response.text
+        assert response.headers['Content-Encoding'] == 'gzip'
+        cached_full_menu = await get_redis().execute_command('GET', 'full_menu_gzip', NEVER_DECODE=True)
+        assert int(cached_full_menu.split(b' ', 1)[0]) > 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_variants(self, client: AsyncClient):
+        response = await client.patch(
+            f'/api/v1/menus/{MenuValueStorage.id}', json={'title': 'Menu title 2', 'description': ''}
+        )
+        assert response.status_code == 200, response.text
+        assert await get_cached_gzip_full_menu() is None
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'gzip'})
+        assert response.json()[0]['title'] == 'Menu title 2'
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
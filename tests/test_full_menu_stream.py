@@ -0,0 +1,143 @@
+import hashlib
+
+import pytest
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.services.full_menu_service import FullMenuService
+from tests.conftest import DishValueStorage, MenuValueStorage, SubmenuValueStorage
+
+
+@pytest.fixture(scope='module', autouse=True)
+def streaming():
+    streaming, stream_chunk_size = FullMenuService.streaming, FullMenuService.stream_chunk_size
+    FullMenuService.streaming, FullMenuService.stream_chunk_size = True, 1
+    yield
+    FullMenuService.streaming, FullMenuService.stream_chunk_size = streaming, stream_chunk_size
+
+
+async def get_cached_full_menu() -> str | None:
+    cached_full_menu = await get_redis().get('full_menu')
+    return cached_full_menu and cached_full_menu.split('\n', 2)[2]
+
+
+class TestFullMenuStream:
+    @pytest.mark.asyncio
+    async def test_stream_full_menu_in_empty_db(self, client: AsyncClient):
+        response = await client.get('/api/v1/full_menu')
+        assert response.status_code == 200, response.text
+        assert response.json() == []
+        assert await get_cached_full_menu() == '[]'
+
+    @pytest.mark.asyncio
+    async def test_create_menus(self, client: AsyncClient):
+        MenuValueStorage.title = 'Menu title 1'
+        MenuValueStorage.description = 'Menu description 1'
+        response = await client.post(
+            '/api/v1/menus',
+            json={
+                'title': MenuValueStorage.title,
+                'description': MenuValueStorage.description,
+            },
+        )
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 2', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id2 = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_create_submenu(self, client: AsyncClient):
+        SubmenuValueStorage.title = 'Submenu title 1'
+        SubmenuValueStorage.description = 'Submenu description 1'
+        response = await client.post(
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus',
+            json={
+                'title': SubmenuValueStorage.title,
+                'description': SubmenuValueStorage.description,
+            },
+        )
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_create_dish(self, client: AsyncClient):
+        DishValueStorage.title = 'Dish title 1'
+        DishValueStorage.description = 'Dish description 1'
+        DishValueStorage.price = 12.5
+        response = await client.post(
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus/{SubmenuValueStorage.id}/dishes',
+            json={
+                'title': DishValueStorage.title,
+                'description': DishValueStorage.description,
+                'price': DishValueStorage.price,
+            },
+        )
+        assert response.status_code == 201, response.text
+        DishValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_stream_full_menu_after_create(self, client: AsyncClient):
+        response = await client.get('/api/v1/full_menu')
+        assert response.status_code == 200, response.text
+        data_out = sorted(response.json(), key=lambda menu: menu['title'])
+        assert data_out == [
+            {
+                'type': 'MENU',
+                'id': MenuValueStorage.id,
+                'title': MenuValueStorage.title,
+                'description': MenuValueStorage.description,
+                'submenus': [
+                    {
+                        'type': 'SUBMENU',
+                        'id': SubmenuValueStorage.id,
+                        'title': SubmenuValueStorage.title,
+                        'description': SubmenuValueStorage.description,
+                        'dishes': [
+                            {
+                                'type': 'DISH',
+                                'id': DishValueStorage.id,
+                                'title': DishValueStorage.title,
+                                'description': DishValueStorage.description,
+                                'price': '12.50',
+                            }
+                        ],
+                    },
+                ],
+            },
+            {
+                'type': 'MENU',
+                'id': MenuValueStorage.id2,
+                'title': 'Menu title 2',
+                'description': '',
+                'submenus': [],
+            },
+        ]
+        assert await get_cached_full_menu() == response.text
+        assert await get_redis().get('full_menu:stream') is None
+
+    @pytest.mark.asyncio
+    async def test_read_cached_full_menu(self, client: AsyncClient):
+        cached_full_menu = await get_cached_full_menu()
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'identity'})
+        assert response.status_code == 200, response.text
+        assert response.text == cached_full_menu
+        assert response.headers['ETag'] == f'"{hashlib.blake2b(response.content, digest_size=8).hexdigest()}"'
+        response = await client.get('/api/v1/full_menu', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.text == cached_full_menu
+
+    @pytest.mark.asyncio
+    async def test_invalidation_discards_stream(self, client: AsyncClient):
+        await get_redis().set('full_menu:stream', '[')
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id2}')
+        assert response.status_code == 200, response.text
+        assert await get_redis().get('full_menu:stream') is None
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/full_menu')
+        assert response.status_code == 200, response.text
+        assert response.json() == []
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.submenu_repository import SubmenuCacheRepository
+from tests.conftest import (
+    DishValueStorage,
+    MenuValueStorage,
+    QueryCounter,
+    SubmenuValueStorage,
+)
+
+
+def menu_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}'
+
+
+def submenu_url() -> str:
+    return f'{menu_url()}/submenus/{SubmenuValueStorage.id}'
+
+
+class TestGenerations:
+    @pytest.mark.asyncio
+    async def test_create(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(f'{menu_url()}/submenus', json={'title': 'Submenu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+        response = await client.post(
+            f'{submenu_url()}/dishes', json={'title': 'Dish title 1', 'description': '', 'price': '1'}
+        )
+        assert response.status_code == 201, response.text
+        DishValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_bump_invalidates_subtree(self, client: AsyncClient):
+        subtree = [f'{submenu_url()}/dishes', f'{submenu_url()}/dishes/{DishValueStorage.id}']
+        for url in [submenu_url(), *subtree]:
+            await client.get(url)
+        cached_keys = set(await get_redis().keys('*'))
+        cache = SubmenuCacheRepository(BackgroundTasks(), get_redis())
+        with QueryCounter() as counter:
+            await cache._invalidate([], [cache._get_generation_id(f'{cache.submenu_tag}_{SubmenuValueStorage.id}')])
+        assert counter.redis_commands == ['SET', 'PUBLISH']
+        assert cached_keys <= set(await get_redis().keys('*'))
+        for url in subtree:
+            with QueryCounter() as counter:
+                response = await client.get(url)
+            assert response.status_code == 200, response.text
+            assert len(counter.statements) == 1
+        with QueryCounter() as counter:
+            response = await client.get(submenu_url())
+        assert response.json()['title'] == 'Submenu title 1'
+        assert counter.statements == []
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(menu_url())
+        assert response.status_code == 200, response.text
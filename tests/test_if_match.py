@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import DishValueStorage, MenuValueStorage, SubmenuValueStorage
+
+
+def menu_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}'
+
+
+def dish_url() -> str:
+    return f'{menu_url()}/submenus/{SubmenuValueStorage.id}/dishes/{DishValueStorage.id}'
+
+
+class TestIfMatch:
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        assert response.headers['ETag'] == '"1"'
+        MenuValueStorage.id = response.json()['id']
+        response = await client.get(menu_url())
+        assert response.headers['ETag'] == '"1"'
+
+    @pytest.mark.asyncio
+    async def test_update_with_current_etag(self, client: AsyncClient):
+        response = await client.patch(
+            menu_url(), json={'title': 'Menu title 2', 'description': ''}, headers={'If-Match': '"1"'}
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers['ETag'] == '"2"'
+        response = await client.get(menu_url())
+        assert response.headers['ETag'] == '"2"'
+        assert response.json()['title'] == 'Menu title 2'
+
+    @pytest.mark.asyncio
+    async def test_update_with_stale_etag(self, client: AsyncClient):
+        response = await client.patch(
+            menu_url(), json={'title': 'Menu title 3', 'description': ''}, headers={'If-Match': '"1"'}
+        )
+        assert response.status_code == 412, response.text
+        assert response.json() == {'detail': 'The resource has been modified since it was read.'}
+        response = await client.get(menu_url())
+        assert response.json()['title'] == 'Menu title 2'
+
+    @pytest.mark.asyncio
+    async def test_update_without_etag(self, client: AsyncClient):
+        response = await client.patch(menu_url(), json={'title': 'Menu title 3', 'description': ''})
+        assert response.status_code == 200, response.text
+        assert response.headers['ETag'] == '"3"'
+        response = await client.patch(
+            menu_url(), json={'title': 'Menu title 3', 'description': ''}, headers={'If-Match': '*'}
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers['ETag'] == '"4"'
+
+    @pytest.mark.asyncio
+    async def test_update_missing_menu_with_etag(self, client: AsyncClient):
+        response = await client.patch(
+            '/api/v1/menus/00000000-0000-0000-0000-000000000000',
+            json={'title': 'Menu title 4', 'description': ''},
+            headers={'If-Match': '"1"'},
+        )
+        assert response.status_code == 404, response.text
+        assert response.json() == {'detail': 'menu not found'}
+
+    @pytest.mark.asyncio
+    async def test_update_dish_concurrently(self, client: AsyncClient):
+        response = await client.post(f'{menu_url()}/submenus', json={'title': 'Submenu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+        response = await client.post(
+            f'{menu_url()}/submenus/{SubmenuValueStorage.id}/dishes',
+            json={'title': 'Dish title 1', 'description': '', 'price': '1.5'},
+        )
+        assert response.status_code == 201, response.text
+        DishValueStorage.id = response.json()['id']
+        etag = response.headers['ETag']
+        responses = await asyncio.gather(
+            *[
+                client.patch(
+                    dish_url(),
+                    json={'title': 'Dish title 1', 'description': f'Editor {i}', 'price': '1.5'},
+                    headers={'If-Match': etag},
+                )
+                for i in range(10)
+            ]
+        )
+        assert sorted(response.status_code for response in responses) == [200] + [412] * 9
+        winner = next(response for response in responses if response.status_code == 200)
+        response = await client.get(dish_url())
+        assert response.headers['ETag'] == '"2"'
+        assert response.json()['description'] == winner.json()['description']
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(menu_url())
+        assert response.status_code == 200, response.text
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.local_cache import (
+    INVALIDATION_CHANNEL,
+    LocalCache,
+    listen_invalidations,
+    local_cache,
+)
+from tests.conftest import MenuValueStorage
+
+
+@pytest_asyncio.fixture(scope='module', autouse=True)
+async def listener():
+    max_size = local_cache.max_size
+    local_cache.max_size = 100
+    redis = get_redis()
+    listener = asyncio.create_task(listen_invalidations(redis))
+    while (await redis.pubsub_numsub(INVALIDATION_CHANNEL))[0][1] == 0:
+        await asyncio.sleep(0.01)
+    yield
+    listener.cancel()
+    local_cache.max_size = max_size
+    local_cache.clear()
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self):
+        cache = LocalCache(max_size=2, ttl_sec=60)
+        cache.set('menus', [])
+        cache.set('full_menu', [])
+        cache.get('menus')
+        cache.set('menu_1', {})
+        assert cache.get('menus') == []
+        assert cache.get('full_menu') is None
+
+    def test_expires_items(self):
+        cache = LocalCache(max_size=2, ttl_sec=0)
+        cache.set('menus', [])
+        assert cache.get('menus') is None
+
+    def test_invalidates_children(self):
+        cache = LocalCache(max_size=10, ttl_sec=60)
+        cache.set('menu_1', {})
+        cache.set('menu_1:submenus', [])
+        cache.set('menu_1:submenu_2:dishes', [])
+        cache.set('menu_3:submenus', [])
+        cache.invalidate([], ['submenu_2'])
+        assert cache.get('menu_1:submenu_2:dishes') is None
+        assert cache.get('menu_1:submenus') == []
+        cache.invalidate([], ['menu_1'])
+        assert cache.get('menu_1') == {}
+        assert cache.get('menu_1:submenus') is None
+        assert cache.get('menu_3:submenus') == []
+
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        MenuValueStorage.title = 'Menu title 1'
+        MenuValueStorage.description = 'Menu description 1'
+        response = await client.post(
+            '/api/v1/menus',
+            json={
+                'title': MenuValueStorage.title,
+                'description': MenuValueStorage.description,
+            },
+        )
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_read_menu_from_local_cache(self, client: AsyncClient):
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        await get_redis().delete(f'menu_{MenuValueStorage.id}')
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        assert response.json()['title'] == MenuValueStorage.title
+
+    @pytest.mark.asyncio
+    async def test_invalidation_message(self):
+        local_cache.set('menus', [])
+        await get_redis().publish(INVALIDATION_CHANNEL, '{"keys": ["menus"], "parents": []}')
+        for _ in range(100):
+            if local_cache.get('menus') is None:
+                break
+            await asyncio.sleep(0.01)
+        assert local_cache.get('menus') is None
+
+    @pytest.mark.asyncio
+    async def test_read_menu_after_update(self, client: AsyncClient):
+        MenuValueStorage.title = 'Updated menu title 1'
+        response = await client.patch(
+            f'/api/v1/menus/{MenuValueStorage.id}',
+            json={
+                'title': MenuValueStorage.title,
+                'description': MenuValueStorage.description,
+            },
+        )
+        assert response.status_code == 200, response.text
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        assert response.json()['title'] == MenuValueStorage.title
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 404, response.text
@@ -0,0 +1,70 @@
+import pytest
+from httpx import AsyncClient
+
+from core.metrics.registry import Registry
+from tests.conftest import MenuValueStorage
+
+
+def get_sample(metrics: str, sample: str) -> float:
+    for line in metrics.splitlines():
+        if line.startswith(f'{sample} '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def menu_route() -> str:
+    return 'method="GET",route="/api/v1/menus/{menu_id}",status="200"'
+
+
+class TestMetrics:
+    @pytest.mark.asyncio
+    async def test_render_histogram(self):
+        registry = Registry()
+        histogram = registry.histogram('duration_seconds', 'Duration', ('route',), (0.1, 1.0))
+        histogram.observe(0.05, route='/a"b')
+        histogram.observe(0.5, route='/a"b')
+        histogram.observe(5, route='/a"b')
+        assert registry.render().splitlines() == [
+            '# HELP duration_seconds Duration',
+            '# TYPE duration_seconds histogram',
+            'duration_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+            'duration_seconds_bucket{route="/a\\"b",le="1"} 2',
+            'duration_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+            'duration_seconds_sum{route="/a\\"b"} 5.55',
+            'duration_seconds_count{route="/a\\"b"} 3',
+        ]
+        with pytest.raises(ValueError):
+            registry.counter('duration_seconds', 'Duration')
+
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_get_metrics(self, client: AsyncClient):
+        response = await client.get('/api/v1/admin/metrics')
+        assert response.status_code == 200, response.text
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        before = response.text
+        await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        response = await client.get('/api/v1/admin/metrics')
+        after = response.text
+        assert '# TYPE http_request_duration_seconds histogram' in after
+        sample = f'http_request_duration_seconds_count{{{menu_route()}}}'
+        assert get_sample(after, sample) - get_sample(before, sample) == 2
+        sample = 'http_requests_in_flight{method="GET",route="/api/v1/admin/metrics"}'
+        assert get_sample(after, sample) == 1
+        hits = 'cache_requests_total{method="get_menu",result="hit"}'
+        misses = 'cache_requests_total{method="get_menu",result="miss"}'
+        cache_requests = get_sample(after, hits) + get_sample(after, misses)
+        assert cache_requests - get_sample(before, hits) - get_sample(before, misses) == 2
+        assert get_sample(after, hits) > get_sample(before, hits)
+        assert get_sample(after, 'db_query_duration_seconds_count{engine="primary",statement="INSERT"}') > 0
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
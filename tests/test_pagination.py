@@ -0,0 +1,97 @@
+import pytest
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from tests.conftest import DishValueStorage, MenuValueStorage, SubmenuValueStorage
+
+
+def dishes_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}/submenus/{SubmenuValueStorage.id}/dishes'
+
+
+async def read_titles(client: AsyncClient, limit: int) -> list[list[str]]:
+    pages: list[list[str]] = []
+    params: dict[str, int | str] = {'limit': limit}
+    while True:
+        response = await client.get(dishes_url(), params=params)
+        assert response.status_code == 200, response.text
+        pages.append([dish['title'] for dish in response.json()])
+        if 'X-Next-Cursor' not in response.headers:
+            return pages
+        params = {'limit': limit, 'after': response.headers['X-Next-Cursor']}
+
+
+class TestPagination:
+    @pytest.mark.asyncio
+    async def test_create_menu_and_submenu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus', json={'title': 'Submenu title 1', 'description': ''}
+        )
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_create_dishes(self, client: AsyncClient):
+        for title in ['Dish e', 'Dish c', 'Dish a', 'Dish d', 'Dish b']:
+            response = await client.post(dishes_url(), json={'title': title, 'description': '', 'price': '1.5'})
+            assert response.status_code == 201, response.text
+            if title == 'Dish a':
+                DishValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_read_pages(self, client: AsyncClient):
+        assert await read_titles(client, 2) == [['Dish a', 'Dish b'], ['Dish c', 'Dish d'], ['Dish e']]
+        assert await get_redis().keys('*:dishes:page_2_*') != []
+
+    @pytest.mark.asyncio
+    async def test_update_evicts_only_its_page(self, client: AsyncClient):
+        response = await client.patch(
+            f'{dishes_url()}/{DishValueStorage.id}', json={'title': 'Dish a', 'description': 'new', 'price': '1.5'}
+        )
+        assert response.status_code == 200, response.text
+        pages = await get_redis().keys('*:dishes:page_2_*')
+        assert len(pages) == 2 and not any(page.endswith('page_2_') for page in pages)
+        response = await client.get(dishes_url(), params={'limit': 2})
+        assert response.json()[0]['description'] == 'new'
+
+    @pytest.mark.asyncio
+    async def test_title_change_moves_dish(self, client: AsyncClient):
+        response = await client.patch(
+            f'{dishes_url()}/{DishValueStorage.id}', json={'title': 'Dish f', 'description': '', 'price': '1.5'}
+        )
+        assert response.status_code == 200, response.text
+        assert await read_titles(client, 2) == [['Dish b', 'Dish c'], ['Dish d', 'Dish e'], ['Dish f']]
+
+    @pytest.mark.asyncio
+    async def test_menus_page_counts(self, client: AsyncClient):
+        response = await client.get('/api/v1/menus', params={'limit': 1})
+        assert response.status_code == 200, response.text
+        assert response.json()[0]['dishes_count'] == 5
+        response = await client.delete(f'{dishes_url()}/{DishValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/menus', params={'limit': 1})
+        assert response.json()[0]['dishes_count'] == 4
+        assert 'X-Next-Cursor' not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_submenus_page(self, client: AsyncClient):
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}/submenus', params={'limit': 5})
+        assert response.status_code == 200, response.text
+        assert [submenu['id'] for submenu in response.json()] == [SubmenuValueStorage.id]
+        assert response.json()[0]['dishes_count'] == 4
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient):
+        response = await client.get(dishes_url(), params={'limit': 2, 'after': 'not a cursor'})
+        assert response.status_code == 422, response.text
+        assert response.json() == {'detail': 'invalid cursor'}
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/menus', params={'limit': 1})
+        assert response.json() == []
@@ -0,0 +1,22 @@
+import pytest
+from httpx import AsyncClient
+
+from core.configs.env_var import DB_MAX_OVERFLOW, DB_POOL_SIZE, REDIS_MAX_CONNECTIONS
+
+
+class TestPools:
+    @pytest.mark.asyncio
+    async def test_get_pools_stats(self, client: AsyncClient):
+        response = await client.get('/api/v1/menus')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/admin/pools')
+        assert response.status_code == 200, response.text
+        db, redis = response.json()['db'], response.json()['redis']
+        assert db['size'] == DB_POOL_SIZE
+        assert db['max_overflow'] == DB_MAX_OVERFLOW
+        assert db['checkouts'] >= 1
+        assert db['checked_out'] == 0
+        assert redis['max_connections'] == REDIS_MAX_CONNECTIONS
+        assert redis['checkouts'] >= 1
+        assert redis['in_use'] == 0
+        assert 0 <= db['wait_sec_avg'] <= db['wait_sec_max']
@@ -0,0 +1,199 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from openpyxl import Workbook
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.local_cache import local_cache
+from core.tasks.table import TableSync
+from tests.conftest import (
+    DishValueStorage,
+    MenuValueStorage,
+    QueryCounter,
+    SubmenuValueStorage,
+)
+
+BATCH_SIZE = 10
+
+
+def menu_url() -> str:
+    return f'/api/v1/menus/{MenuValueStorage.id}'
+
+
+def submenu_url() -> str:
+    return f'{menu_url()}/submenus/{SubmenuValueStorage.id}'
+
+
+def dish_url() -> str:
+    return f'{submenu_url()}/dishes/{DishValueStorage.id}'
+
+
+async def flush_cache() -> None:
+    await get_redis().flushdb()
+    local_cache.clear()
+
+
+def assert_budget(counter: QueryCounter, statements: int, redis_commands: int) -> None:
+    assert len(counter.statements) <= statements, counter.statements
+    assert len(counter.redis_commands) <= redis_commands, counter.redis_commands
+
+
+def warm_up_budget(entries: int) -> tuple[int, int]:
+    return 2 + entries, 3 + 4 * entries
+
+
+class TestQueryBudget:
+    @pytest.mark.asyncio
+    async def test_create(self, client: AsyncClient):
+        with QueryCounter() as counter:
+            response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        assert_budget(counter, 1, 5)
+        MenuValueStorage.id = response.json()['id']
+        for i in range(3):
+            with QueryCounter() as counter:
+                response = await client.post(
+                    f'{menu_url()}/submenus', json={'title': f'Submenu title {i}', 'description': ''}
+                )
+            assert response.status_code == 201, response.text
+            assert_budget(counter, 1, 7)
+            SubmenuValueStorage.id = response.json()['id']
+            for j in range(2):
+                with QueryCounter() as counter:
+                    response = await client.post(
+                        f'{submenu_url()}/dishes', json={'title': f'Dish title {j}', 'description': '', 'price': '1'}
+                    )
+                assert response.status_code == 201, response.text
+                assert_budget(counter, 1, 8)
+                DishValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'url, uncached_redis_commands',
+        [
+            (lambda: '/api/v1/menus', 5),
+            (lambda: '/api/v1/menus?limit=2', 5),
+            (lambda: menu_url(), 5),
+            (lambda: f'{menu_url()}/submenus', 5),
+            (lambda: f'{menu_url()}/submenus?limit=2', 6),
+            (lambda: submenu_url(), 5),
+            (lambda: f'{submenu_url()}/dishes', 5),
+            (lambda: f'{submenu_url()}/dishes?limit=1', 6),
+            (lambda: dish_url(), 5),
+            (lambda: '/api/v1/full_menu', 7),
+        ],
+    )
+    async def test_get(self, client: AsyncClient, url, uncached_redis_commands: int):
+        await flush_cache()
+        with QueryCounter() as counter:
+            response = await client.get(url())
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 1, uncached_redis_commands)
+        with QueryCounter() as counter:
+            response = await client.get(url())
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 0, 1)
+
+    @pytest.mark.asyncio
+    async def test_batch(self, client: AsyncClient):
+        submenus_url = f'{menu_url()}/submenus:batch'
+        dishes_url = f'{submenu_url()}/dishes:batch'
+        with QueryCounter() as counter:
+            response = await client.post(
+                submenus_url, json=[{'title': f'Batch submenu {i}', 'description': ''} for i in range(BATCH_SIZE)]
+            )
+        assert response.status_code == 201, response.text
+        assert_budget(counter, 1, 5)
+        submenu_ids = [item['id'] for item in response.json()]
+        with QueryCounter() as counter:
+            response = await client.post(
+                dishes_url,
+                json=[{'title': f'Batch dish {i}', 'description': '', 'price': '1'} for i in range(BATCH_SIZE)],
+            )
+        assert response.status_code == 201, response.text
+        assert_budget(counter, 1, 7)
+        dish_ids = [item['id'] for item in response.json()]
+        with QueryCounter() as counter:
+            response = await client.patch(
+                dishes_url,
+                json=[
+                    {'id': dish_id, 'title': f'Updated batch dish {i}', 'description': '', 'price': '2'}
+                    for i, dish_id in enumerate(dish_ids)
+                ],
+            )
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 1, 4)
+        with QueryCounter() as counter:
+            response = await client.request('DELETE', dishes_url, json=dish_ids)
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 1, 7)
+        with QueryCounter() as counter:
+            response = await client.patch(
+                submenus_url,
+                json=[
+                    {'id': submenu_id, 'title': f'Updated batch submenu {i}', 'description': ''}
+                    for i, submenu_id in enumerate(submenu_ids)
+                ],
+            )
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 1, 4)
+        with QueryCounter() as counter:
+            response = await client.request('DELETE', submenus_url, json=submenu_ids)
+        assert response.status_code == 200, response.text
+        assert_budget(counter, 2, 5)
+
+    @pytest.mark.asyncio
+    async def test_warm_up_cache(self, client: AsyncClient):
+        await flush_cache()
+        with QueryCounter() as counter:
+            response = await client.post('/api/v1/admin/warm_up_cache')
+        assert response.status_code == 200, response.text
+        entries = response.json()['entries']
+        assert entries == 6
+        assert_budget(counter, *warm_up_budget(entries))
+
+    @pytest.mark.asyncio
+    async def test_update(self, client: AsyncClient):
+        data = {'title': 'Updated title', 'description': ''}
+        for url, json, redis_commands in [
+            (dish_url, {**data, 'price': '2'}, 6),
+            (submenu_url, data, 6),
+            (menu_url, data, 5),
+        ]:
+            with QueryCounter() as counter:
+                response = await client.patch(url(), json=json)
+            assert response.status_code == 200, response.text
+            assert_budget(counter, 1, redis_commands)
+
+    @pytest.mark.asyncio
+    async def test_delete(self, client: AsyncClient):
+        for url, statements, redis_commands in [(dish_url, 1, 7), (submenu_url, 2, 7), (menu_url, 3, 5)]:
+            with QueryCounter() as counter:
+                response = await client.delete(url())
+            assert response.status_code == 200, response.text
+            assert_budget(counter, statements, redis_commands)
+
+    @pytest.mark.asyncio
+    async def test_sync_table(self, client: AsyncClient, tmp_path, monkeypatch):
+        table_path = tmp_path / 'Menu.xlsx'
+        monkeypatch.setattr(TableSync, 'xlsx_path', str(table_path))
+        menu_ids = [str(uuid4()) for _ in range(2)]
+        workbook = Workbook()
+        for i, menu_id in enumerate(menu_ids):
+            workbook.active.append([menu_id, f'Menu {i}', 'Description'])
+            for j in range(BATCH_SIZE // len(menu_ids)):
+                workbook.active.append([None, str(uuid4()), f'Submenu {j}', 'Description'])
+                for k in range(2):
+                    workbook.active.append([None, None, str(uuid4()), f'Dish {k}', 'Description', '1'])
+        workbook.save(table_path)
+        with QueryCounter() as counter:
+            response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': True, 'message': 'success'}
+        menus, submenus = len(menu_ids), BATCH_SIZE
+        statements, redis_commands = warm_up_budget(2 + menus + submenus)
+        assert_budget(counter, 6 + statements, 8 + menus + submenus + redis_commands)
+        for menu_id in menu_ids:
+            response = await client.delete(f'/api/v1/menus/{menu_id}')
+            assert response.status_code == 200, response.text
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from core.database.db import RECENT_WRITE_KEY
+from core.database.redis_db import get_redis
+from core.repositories.cache.menu_repository import MenuCacheRepository
+from tests.conftest import MenuValueStorage
+
+
+async def get_checkouts(client: AsyncClient) -> tuple[int, int | None]:
+    response = await client.get('/api/v1/admin/pools')
+    stats = response.json()
+    return stats['db']['checkouts'], stats.get('replica', {}).get('checkouts')
+
+
+class TestReplica:
+    @pytest.mark.asyncio
+    async def test_read_after_write_uses_primary(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        primary, replica = await get_checkouts(client)
+        response = await client.get('/api/v1/menus')
+        assert [menu['id'] for menu in response.json()] == [MenuValueStorage.id]
+        assert await get_checkouts(client) == (primary + 1, replica)
+
+    @pytest.mark.asyncio
+    async def test_read_without_recent_writes_uses_replica(self, client: AsyncClient):
+        await get_redis().delete(RECENT_WRITE_KEY)
+        primary, replica = await get_checkouts(client)
+        response = await client.get('/api/v1/full_menu')
+        assert [menu['id'] for menu in response.json()] == [MenuValueStorage.id]
+        if replica is None:
+            assert await get_checkouts(client) == (primary + 1, None)
+        else:
+            assert await get_checkouts(client) == (primary, replica + 1)
+
+    @pytest.mark.asyncio
+    async def test_write_marks_recent_write_before_response(self):
+        await get_redis().delete(RECENT_WRITE_KEY)
+        background_tasks = BackgroundTasks()
+        await MenuCacheRepository(background_tasks, get_redis()).delete_menu(MenuValueStorage.id)
+        assert background_tasks.tasks
+        assert await get_redis().exists(RECENT_WRITE_KEY)
+        await background_tasks()
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.local_cache import local_cache
+from core.repositories.cache.menu_repository import MenuCacheRepository
+from tests.conftest import MenuValueStorage
+
+
+async def get_db_checkouts(client: AsyncClient) -> int:
+    response = await client.get('/api/v1/admin/pools')
+    stats = response.json()
+    return stats['db']['checkouts'] + stats.get('replica', {}).get('checkouts', 0)
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_query_db_once(self, client: AsyncClient):
+        checkouts = await get_db_checkouts(client)
+        responses = await asyncio.gather(*[client.get('/api/v1/menus') for _ in range(20)])
+        assert [response.status_code for response in responses] == [200] * 20
+        assert {response.text for response in responses} == {responses[0].text}
+        assert [menu['id'] for menu in responses[0].json()] == [MenuValueStorage.id]
+        assert await get_db_checkouts(client) == checkouts + 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_not_found(self, client: AsyncClient):
+        checkouts = await get_db_checkouts(client)
+        url = '/api/v1/menus/00000000-0000-0000-0000-000000000000'
+        responses = await asyncio.gather(*[client.get(url) for _ in range(10)])
+        assert [response.status_code for response in responses] == [404] * 10
+        assert await get_db_checkouts(client) == checkouts + 1
+
+    @pytest.mark.asyncio
+    async def test_miss_waits_for_fill_in_another_process(self, client: AsyncClient):
+        redis = get_redis()
+        await redis.delete('menus')
+        local_cache.clear()
+        await redis.set('fill:menus', 'another process', px=2000)
+        checkouts = await get_db_checkouts(client)
+        request = asyncio.create_task(client.get('/api/v1/menus'))
+        await asyncio.sleep(0.05)
+        assert not request.done()
+        cache = MenuCacheRepository(BackgroundTasks(), redis)
+        await redis.set('menus', cache._wrap(cache.serialize_menus([]), 60))
+        response = await request
+        assert response.json() == []
+        assert await get_db_checkouts(client) == checkouts
+        await redis.delete('fill:menus')
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/menus')
+        assert response.json() == []
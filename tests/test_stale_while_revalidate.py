@@ -0,0 +1,65 @@
+import time
+
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.repositories.cache.local_cache import local_cache
+from core.repositories.cache.menu_repository import MenuCacheRepository
+from tests.conftest import MenuValueStorage
+
+
+def get_cache_repository() -> MenuCacheRepository:
+    return MenuCacheRepository(BackgroundTasks(), get_redis())
+
+
+class TestStaleWhileRevalidate:
+    def test_early_refresh_probability(self):
+        cache = get_cache_repository()
+        now_ms, format_version = int(time.time() * 1000), cache.format_version
+        assert not cache._unwrap(f'{now_ms + 60000} 0 {format_version}\n[]').is_stale
+        assert cache._unwrap(f'{now_ms - 1} 0 {format_version}\n[]').is_stale
+        early_refreshes = sum(
+            cache._unwrap(f'{now_ms + 1000} 1000 {format_version}\n[]').is_stale for _ in range(1000)
+        )
+        assert 200 < early_refreshes < 500
+
+    @pytest.mark.asyncio
+    async def test_create_menu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_ttl_per_entity_type(self, client: AsyncClient):
+        cache = get_cache_repository()
+        await client.get('/api/v1/menus')
+        await client.get('/api/v1/full_menu')
+        redis = get_redis()
+        assert await redis.ttl(f'menu_{MenuValueStorage.id}') == cache.item_ttl_sec + cache.stale_ttl_sec
+        assert await redis.ttl('menus') == cache.list_ttl_sec + cache.stale_ttl_sec
+        assert await redis.ttl('full_menu') == cache.full_menu_ttl_sec + cache.stale_ttl_sec
+
+    @pytest.mark.asyncio
+    async def test_serve_stale_and_refresh(self, client: AsyncClient):
+        redis = get_redis()
+        key = f'menu_{MenuValueStorage.id}'
+        cached_menu = await redis.get(key)
+        _, menu = cached_menu.split('\n', 1)
+        stale_menu = menu.replace('Menu title 1', 'Stale title')
+        format_version = get_cache_repository().format_version
+        await redis.set(key, f'{int(time.time() * 1000) - 1} 0 {format_version}\n{stale_menu}', 60)
+        local_cache.clear()
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
+        assert response.json()['title'] == 'Stale title'
+        response = await client.get(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.json()['title'] == 'Menu title 1'
+        soft_expiry_ms = int((await redis.get(key)).split(' ', 1)[0])
+        assert soft_expiry_ms > time.time() * 1000
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text
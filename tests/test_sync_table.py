@@ -0,0 +1,245 @@
+import asyncio
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+from openpyxl import Workbook
+
+from core.database.redis_db import get_redis
+from core.repositories.cache import sync_repository
+from core.repositories.cache.sync_repository import SyncCacheRepository
+from core.tasks.table import TableSync
+from tests.conftest import QueryCounter
+
+MENU_ID = '10000000-0000-0000-0000-000000000000'
+MENU_ID2 = '20000000-0000-0000-0000-000000000000'
+SUBMENU_ID = '10000000-1000-0000-0000-000000000000'
+SUBMENU_ID2 = '10000000-2000-0000-0000-000000000000'
+DISH_ID = '10000000-1000-1000-0000-000000000000'
+DISH_ID2 = '10000000-1000-2000-0000-000000000000'
+DISH_ID3 = '10000000-2000-1000-0000-000000000000'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def table_path(tmp_path_factory):
+    xlsx_path = TableSync.xlsx_path
+    TableSync.xlsx_path = str(tmp_path_factory.mktemp('admin') / 'Menu.xlsx')
+    yield TableSync.xlsx_path
+    TableSync.xlsx_path = xlsx_path
+
+
+def write_table(path: str, rows: list[list]) -> None:
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    mtime = time.time() + len(rows)
+    os.utime(path, (mtime, mtime))
+
+
+class TestSyncTable:
+    @pytest.mark.asyncio
+    async def test_sync_new_table(self, client: AsyncClient, table_path: str):
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [None, None, DISH_ID, 'Dish 1', 'Dish description 1', '10.50'],
+                [None, None, DISH_ID2, 'Dish 2', 'Dish description 2', '20.25'],
+            ],
+        )
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': True, 'message': 'success'}
+        response = await client.get('/api/v1/menus')
+        assert response.json() == [
+            {
+                'id': MENU_ID,
+                'title': 'Menu',
+                'description': 'Menu description',
+                'submenus_count': 1,
+                'dishes_count': 2,
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sync_unchanged_table(self, client: AsyncClient):
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': False, 'message': 'no need to sync'}
+
+    @pytest.mark.asyncio
+    async def test_sync_parses_only_changed_table(self, client: AsyncClient, table_path: str, monkeypatch):
+        parsed = []
+        iter_rows = TableSync._iter_rows
+
+        def count_iter_rows(table: TableSync):
+            parsed.append(table.xlsx_path)
+            return iter_rows(table)
+
+        monkeypatch.setattr(TableSync, '_iter_rows', count_iter_rows)
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.json() == {'status': False, 'message': 'no need to sync'}
+        assert parsed == []
+        mtime = os.stat(table_path).st_mtime + 1
+        os.utime(table_path, (mtime, mtime))
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.json() == {'status': True, 'message': 'success'}
+        assert parsed == [table_path]
+
+    @pytest.mark.asyncio
+    async def test_sync_changed_table(self, client: AsyncClient, table_path: str):
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [None, None, DISH_ID, 'Updated dish 1', 'Dish description 1', '11.50'],
+                [None, SUBMENU_ID2, 'Submenu 2', 'Submenu description 2'],
+                [None, None, DISH_ID3, 'Dish 3', 'Dish description 3', '30'],
+            ],
+        )
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': True, 'message': 'success'}
+        response = await client.get(f'/api/v1/menus/{MENU_ID}')
+        assert response.json()['submenus_count'] == 2
+        assert response.json()['dishes_count'] == 2
+        response = await client.get(f'/api/v1/menus/{MENU_ID}/submenus/{SUBMENU_ID}/dishes')
+        assert response.json() == [
+            {
+                'id': DISH_ID,
+                'title': 'Updated dish 1',
+                'description': 'Dish description 1',
+                'submenu_id': SUBMENU_ID,
+                'price': '11.50',
+            }
+        ]
+        response = await client.get(f'/api/v1/menus/{MENU_ID}/submenus/{SUBMENU_ID2}/dishes/{DISH_ID3}')
+        assert response.status_code == 200, response.text
+        assert response.json()['price'] == '30.00'
+
+    @pytest.mark.asyncio
+    async def test_sync_unchanged_rows(self, client: AsyncClient, table_path: str):
+        response = await client.get('/api/v1/full_menu')
+        assert response.status_code == 200, response.text
+        full_menu = response.json()
+        cached_full_menu = await get_redis().get('full_menu')
+        assert cached_full_menu is not None
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [None, None, DISH_ID, 'Updated dish 1', 'Dish description 1', '11.50'],
+                [None, SUBMENU_ID2, 'Submenu 2', 'Submenu description 2'],
+                [None, None, DISH_ID3, 'Dish 3', 'Dish description 3', '30'],
+            ],
+        )
+        with QueryCounter() as counter:
+            response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': True, 'message': 'success'}
+        writes = [statement for statement in counter.statements if statement.startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        assert writes == []
+        assert await get_redis().get('full_menu') == cached_full_menu
+        with QueryCounter() as counter:
+            response = await client.get('/api/v1/full_menu')
+        assert response.json() == full_menu
+        assert counter.statements == []
+
+    @pytest.mark.asyncio
+    async def test_sync_table_with_duplicate_titles(self, client: AsyncClient, table_path: str):
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [None, SUBMENU_ID2, 'Submenu', 'Submenu description 2'],
+            ],
+        )
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 409, response.text
+        assert response.json()['detail'] == 'Another submenu with this title already exists in the menu.'
+        response = await client.get(f'/api/v1/menus/{MENU_ID}')
+        assert response.json()['submenus_count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_releases_lock_on_error(self, client: AsyncClient, table_path: str):
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [None, None, DISH_ID, 'Dish 1', 'Dish description 1', '10'],
+                [None, None, DISH_ID, 'Dish 2', 'Dish description 2', '20'],
+            ],
+        )
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 409, response.text
+        assert not await get_redis().exists(SyncCacheRepository(get_redis()).sync_lock_tag)
+
+    @pytest.mark.asyncio
+    async def test_sync_already_running(self, client: AsyncClient, table_path: str):
+        write_table(table_path, [[MENU_ID, 'Menu', 'Menu description']])
+        repository = SyncCacheRepository(get_redis())
+        lock = await repository.acquire_lock()
+        assert lock is not None
+        try:
+            response = await client.post('/api/v1/admin/sync_table')
+        finally:
+            await repository.release_lock(lock)
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': False, 'message': 'sync is already running'}
+        response = await client.get(f'/api/v1/menus/{MENU_ID}')
+        assert response.json()['submenus_count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_lock_is_renewed(self, monkeypatch):
+        monkeypatch.setattr(sync_repository, 'SYNC_LOCK_TIMEOUT', 0.3)
+        repository = SyncCacheRepository(get_redis())
+        repository.lock_renew_sec = 0.1
+        lock = await repository.acquire_lock()
+        assert lock is not None
+        lock_keeper = asyncio.create_task(repository.keep_lock(lock))
+        await asyncio.sleep(0.6)
+        assert await lock.owned()
+        lock_keeper.cancel()
+        await repository.release_lock(lock)
+        assert not await lock.locked()
+
+    @pytest.mark.asyncio
+    async def test_sync_moved_submenu_and_dish(self, client: AsyncClient, table_path: str):
+        write_table(
+            table_path,
+            [
+                [MENU_ID, 'Menu', 'Menu description'],
+                [None, SUBMENU_ID, 'Submenu', 'Submenu description'],
+                [MENU_ID2, 'Menu 2', 'Menu description 2'],
+                [None, SUBMENU_ID2, 'Submenu 2', 'Submenu description 2'],
+                [None, None, DISH_ID, 'Updated dish 1', 'Dish description 1', '11.50'],
+                [None, None, DISH_ID3, 'Dish 3', 'Dish description 3', '30'],
+            ],
+        )
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        response = await client.get('/api/v1/menus')
+        assert sorted((menu['id'], menu['submenus_count'], menu['dishes_count']) for menu in response.json()) == [
+            (MENU_ID, 1, 0),
+            (MENU_ID2, 1, 2),
+        ]
+        response = await client.get(f'/api/v1/menus/{MENU_ID2}/submenus/{SUBMENU_ID2}')
+        assert response.json()['dishes_count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_empty_table(self, client: AsyncClient, table_path: str):
+        write_table(table_path, [])
+        response = await client.post('/api/v1/admin/sync_table')
+        assert response.status_code == 200, response.text
+        assert response.json() == {'status': True, 'message': 'success'}
+        response = await client.get('/api/v1/menus')
+        assert response.json() == []
+        response = await client.get(f'/api/v1/menus/{MENU_ID}/submenus/{SUBMENU_ID2}/dishes/{DISH_ID3}')
+        assert response.status_code == 404, response.text
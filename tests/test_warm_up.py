@@ -0,0 +1,61 @@
+import pytest
+from httpx import AsyncClient
+
+from core.database.redis_db import get_redis
+from core.main import app, lifespan
+from core.repositories.cache.local_cache import local_cache
+from tests.conftest import MenuValueStorage, SubmenuValueStorage
+
+
+async def get_db_checkouts(client: AsyncClient) -> int:
+    response = await client.get('/api/v1/admin/pools')
+    stats = response.json()
+    return stats['db']['checkouts'] + stats.get('replica', {}).get('checkouts', 0)
+
+
+async def flush_cache() -> None:
+    await get_redis().flushdb()
+    local_cache.clear()
+
+
+class TestWarmUp:
+    @pytest.mark.asyncio
+    async def test_create_menu_and_submenu(self, client: AsyncClient):
+        response = await client.post('/api/v1/menus', json={'title': 'Menu title 1', 'description': ''})
+        assert response.status_code == 201, response.text
+        MenuValueStorage.id = response.json()['id']
+        response = await client.post(
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus', json={'title': 'Submenu title 1', 'description': ''}
+        )
+        assert response.status_code == 201, response.text
+        SubmenuValueStorage.id = response.json()['id']
+
+    @pytest.mark.asyncio
+    async def test_warm_up_cache(self, client: AsyncClient):
+        await flush_cache()
+        response = await client.post('/api/v1/admin/warm_up_cache')
+        assert response.status_code == 200, response.text
+        assert response.json()['entries'] == 4
+        assert 0 < response.json()['max_entry_sec'] <= response.json()['elapsed_sec']
+        checkouts = await get_db_checkouts(client)
+        for url in [
+            '/api/v1/full_menu',
+            '/api/v1/menus',
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus',
+            f'/api/v1/menus/{MenuValueStorage.id}/submenus/{SubmenuValueStorage.id}/dishes',
+        ]:
+            response = await client.get(url)
+            assert response.status_code == 200, response.text
+        assert await get_db_checkouts(client) == checkouts
+
+    @pytest.mark.asyncio
+    async def test_warm_up_on_startup(self, client: AsyncClient):
+        await flush_cache()
+        async with lifespan(app):
+            pass
+        assert await get_redis().exists('menus', 'full_menu') == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_menu(self, client: AsyncClient):
+        response = await client.delete(f'/api/v1/menus/{MenuValueStorage.id}')
+        assert response.status_code == 200, response.text